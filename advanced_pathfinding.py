@@ -7,6 +7,8 @@ Algoritmalar:
 1. Dijkstra's Algorithm - Klasik en kısa yol (Garantili optimal)
 2. A* Algorithm - Heuristic ile optimize edilmiş (Daha hızlı, yine optimal)
 3. Bidirectional Dijkstra - İki yönden arama (2x performans)
+3b. Bidirectional A* - İki yönden, hedefe yönelimli arama (Haversine veya landmark)
+3c. Nearest K stations - Olay yerinden ters yönlü, erken duran tek Dijkstra
 4. Contraction Hierarchies - Ön işlemli hızlı arama (100x performans)
 5. Dynamic Re-routing - Gerçek zamanlı rota güncelleme
 
@@ -17,13 +19,17 @@ Matematiksel Garantiler:
 """
 
 import heapq
-import math
 import time
 from typing import Dict, List, Tuple, Optional, Set, Callable
 from dataclasses import dataclass, field
 from collections import defaultdict, deque
 from enum import Enum
 
+from geodesy import haversine, haversine_precomputed, to_radians
+from priority_queues import INTEGER_QUEUES, make_queue
+from tracing import traced
+from metrics import metered
+
 class RoadType(Enum):
     """Yol tipleri - Dijkstra ağırlıkları için"""
     MOTORWAY = ("motorway", 1.0, 120)      # Otoyol
@@ -106,6 +112,10 @@ class RoadNetwork:
         self.edges: Dict[int, List[Edge]] = defaultdict(list)
         self.fire_stations: List[int] = []
         self.node_counter = 0
+        self._radian_cache: Dict[int, Tuple[float, float, float]] = {}
+        self._reverse_edges: Optional[Dict[int, List[Tuple[int, float]]]] = None
+        self._incoming_edges: Optional[Dict[int, List[Edge]]] = None
+        self._edge_index: Optional[Dict[Tuple[int, int], Edge]] = None
         
     def add_node(self, lat: float, lon: float, name: str = "", 
                  is_fire_station: bool = False) -> int:
@@ -121,6 +131,22 @@ class RoadNetwork:
         
         return node_id
     
+    def add_nodes_bulk(self, lats: List[float], lons: List[float]) -> range:
+        """
+        Çok sayıda isimsiz node'u tek seferde ekle (ara nodelar, OSM nodeları)
+        
+        Returns:
+            Eklenen node id'lerinin ardışık aralığı
+        """
+        start_id = self.node_counter
+        nodes = self.nodes
+        for offset, (lat, lon) in enumerate(zip(lats, lons)):
+            node_id = start_id + offset
+            nodes[node_id] = Node(node_id, lat, lon)
+        
+        self.node_counter = start_id + len(lats)
+        return range(start_id, self.node_counter)
+    
     def add_edge(self, from_id: int, to_id: int, road_type: RoadType, 
                  bidirectional: bool = True, dynamic_factors: Optional[Dict] = None):
         """Yeni edge ekle"""
@@ -164,46 +190,165 @@ class RoadNetwork:
                 bidirectional=False  # Tersini tekrar ekleme
             )
             self.edges[to_id].append(reverse_edge)
+        
+        self._reverse_edges = None
+        self._incoming_edges = None
+        self._edge_index = None
     
     def _haversine_distance(self, lat1: float, lon1: float, 
                            lat2: float, lon2: float) -> float:
         """
-        Haversine formülü ile iki nokta arası mesafe
+        Haversine formülü ile iki nokta arası mesafe (geodesy.haversine)
         
         Formül:
         a = sin²(Δφ/2) + cos φ1 × cos φ2 × sin²(Δλ/2)
         c = 2 × atan2(√a, √(1−a))
         d = R × c
         """
-        R = 6371  # Dünya yarıçapı (km)
-        
-        lat1_rad, lon1_rad = math.radians(lat1), math.radians(lon1)
-        lat2_rad, lon2_rad = math.radians(lat2), math.radians(lon2)
-        
-        dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+        return haversine(lat1, lon1, lat2, lon2)
+    
+    def radian_coords(self, node_id: int) -> Tuple[float, float, float]:
+        """Node'un (lat_rad, lon_rad, cos(lat)) değerleri - ilk kullanımda hesaplanıp saklanır"""
+        coords = self._radian_cache.get(node_id)
+        if coords is None:
+            node = self.nodes[node_id]
+            coords = to_radians(node.lat, node.lon)
+            self._radian_cache[node_id] = coords
+        return coords
     
     def get_neighbors(self, node_id: int) -> List[Tuple[int, float]]:
         """Komşu nodeları ve ağırlıkları getir"""
         return [(edge.to_node, edge.weight) for edge in self.edges[node_id]]
     
+    def get_neighbor_edges(self, node_id: int) -> List[Tuple[int, float, object]]:
+        """
+        Komşular, ağırlıklar ve edge referansları: [(komşu, ağırlık, ref)]
+        
+        Arama sırasında öncül edge'in ref'i saklanır; yol sonunda
+        resolve_edge(ref) ile aramanın gerçekten kullandığı edge'e O(1) ulaşılır.
+        """
+        return [(edge.to_node, edge.weight, edge) for edge in self.edges[node_id]]
+    
+    def resolve_edge(self, ref) -> Edge:
+        """get_neighbor_edges / get_incoming_refs ref'inden Edge"""
+        return ref
+    
+    def path_metrics(self, edge_refs) -> Tuple[float, float]:
+        """Yolun edge ref'lerinden toplam (mesafe km, süre dk) - O(yol uzunluğu)"""
+        total_distance = 0.0
+        total_time = 0.0
+        for ref in edge_refs:
+            edge = self.resolve_edge(ref)
+            total_distance += edge.distance
+            total_time += edge.estimated_time
+        return total_distance, total_time
+    
+    def get_incoming(self, node_id: int) -> List[Tuple[int, float]]:
+        """
+        Node'a gelen edge'lerin kaynakları ve ağırlıkları (ters yönlü arama için)
+        
+        Ters komşuluk ilk çağrıda O(E) ile bir kez kurulur; add_edge veya
+        invalidate_caches() ile geçersizleşir.
+        """
+        if self._reverse_edges is None:
+            reverse = defaultdict(list)
+            for from_id, edges in self.edges.items():
+                for edge in edges:
+                    reverse[edge.to_node].append((from_id, edge.weight))
+            self._reverse_edges = reverse
+        
+        return self._reverse_edges.get(node_id, [])
+    
+    def get_incoming_edges(self, node_id: int) -> List[Edge]:
+        """Node'a gelen Edge nesneleri (mesafe/süre gibi ağırlık dışı metrikler için)"""
+        if self._incoming_edges is None:
+            incoming = defaultdict(list)
+            for edges in self.edges.values():
+                for edge in edges:
+                    incoming[edge.to_node].append(edge)
+            self._incoming_edges = incoming
+        
+        return self._incoming_edges.get(node_id, [])
+    
+    def get_incoming_refs(self, node_id: int) -> List[Tuple[int, float, object]]:
+        """Gelen edge'ler: [(kaynak, ağırlık, ref)] - ters aramalarda öncül edge kaydı için"""
+        return [(edge.from_node, edge.weight, edge) for edge in self.get_incoming_edges(node_id)]
+    
+    def invalidate_caches(self) -> None:
+        """edges doğrudan değiştirildiğinde (ör. toplu yeniden kurulum) türetilmiş yapıları sıfırla"""
+        self._reverse_edges = None
+        self._incoming_edges = None
+        self._edge_index = None
+    
     def get_edge(self, from_id: int, to_id: int) -> Optional[Edge]:
-        """İki node arası edge'i bul"""
-        for edge in self.edges[from_id]:
-            if edge.to_node == to_id:
-                return edge
-        return None
+        """
+        İki node arası edge'i bul - O(1)
+        
+        (u, v) -> edge indeksi ilk çağrıda kurulur. Paralel edge'ler varsa en
+        düşük ağırlıklı olan döner (en kısa yol aramalarının seçeceği edge).
+        """
+        if self._edge_index is None:
+            index = {}
+            for edges in self.edges.values():
+                for edge in edges:
+                    key = (edge.from_node, edge.to_node)
+                    current = index.get(key)
+                    if current is None or edge.weight < current.weight:
+                        index[key] = edge
+            self._edge_index = index
+        
+        return self._edge_index.get((from_id, to_id))
     
     def node_count(self) -> int:
         return len(self.nodes)
     
     def edge_count(self) -> int:
         return sum(len(edges) for edges in self.edges.values())
+    
+    def induced_subgraph(self, node_ids) -> 'RoadNetwork':
+        """
+        Verilen nodelar ve aralarındaki edge'lerden oluşan alt ağ
+        
+        Node id'leri korunur; böylece alt ağdaki yollar ana ağla aynı id'leri kullanır.
+        """
+        node_set = set(node_ids)
+        sub = RoadNetwork()
+        
+        for node_id in sorted(node_set):
+            node = self.nodes[node_id]
+            sub.nodes[node_id] = node
+            if node.is_fire_station:
+                sub.fire_stations.append(node_id)
+            
+            internal = [edge for edge in self.edges.get(node_id, ()) if edge.to_node in node_set]
+            if internal:
+                sub.edges[node_id] = internal
+        
+        sub.node_counter = max(node_set) + 1 if node_set else 0
+        return sub
+
+
+# İstatistik seviyeleri:
+# - 'off': relaxation döngüsünde hiç sayaç yok (üretim / dispatch)
+# - 'counters': nodes_explored, edges_relaxed, heuristic_calls (benchmark)
+# - 'full': sayaçlar + kesinleşen node sırası (result['trace'], görselleştirme için)
+STATS_LEVELS = ('off', 'counters', 'full')
+
+
+def _query_attrs(pathfinder, start_id: int, end_id: int) -> Dict:
+    """find_shortest_path span öznitelikleri"""
+    return {'start': start_id, 'end': end_id}
+
+
+def _nearest_attrs(search, incident_id: int, count: int = 3, candidates=None) -> Dict:
+    """find_nearest_stations span öznitelikleri"""
+    return {'incident': incident_id, 'count': count}
+
+
+def _check_stats_level(stats_level: str) -> str:
+    if stats_level not in STATS_LEVELS:
+        raise ValueError(f"Bilinmeyen istatistik seviyesi: {stats_level} (seçenekler: {', '.join(STATS_LEVELS)})")
+    return stats_level
 
 
 class DijkstraPathfinder:
@@ -220,16 +365,35 @@ class DijkstraPathfinder:
     3. Her adımda en küçük mesafeli node'u al
     4. Komşularını güncelle (relaxation)
     5. Hedefe ulaşana kadar devam et
+    
+    Kuyruk seçimi (queue):
+    - 'heap': heapq + lazy deletion (varsayılan)
+    - 'indexed': decrease-key destekli indeksli binary heap
+    - 'radix' / 'bucket': Ağırlıklar weight_scale ile tamsayıya yuvarlanır
+      (varsayılan 1/1000 ağırlık birimi); yol bu quantize edilmiş metrikte
+      optimaldir, dönen 'weight' seçilen yolun gerçek (float) ağırlığıdır.
+    
+    stats_level (STATS_LEVELS), tüm kuyruklarda geçerlidir: 'off' ayrı, sayaçsız
+    bir döngü çalıştırır ve result['stats'] yalnızca 'execution_time' içerir
+    ('nodes_explored' / 'edges_relaxed' yoktur - .get() ile okuyun); 'full'
+    kesinleşen node sırasını result['trace']'e ekler.
     """
     
-    def __init__(self, network: RoadNetwork):
+    def __init__(self, network: RoadNetwork, queue: str = 'heap', weight_scale: int = 1000,
+                 stats_level: str = 'counters'):
         self.network = network
+        make_queue(queue)  # geçersiz kuyruk adı için erken hata
+        self.queue = queue
+        self.weight_scale = weight_scale
+        self.stats_level = _check_stats_level(stats_level)
         self.stats = {
             'nodes_explored': 0,
             'edges_relaxed': 0,
             'execution_time': 0.0
         }
     
+    @metered('dijkstra')
+    @traced('dijkstra.find_shortest_path', attrs=_query_attrs)
     def find_shortest_path(self, start_id: int, end_id: int) -> Optional[Dict]:
         """
         En kısa yolu bul - Dijkstra algoritması
@@ -249,10 +413,77 @@ class DijkstraPathfinder:
         if start_id not in self.network.nodes or end_id not in self.network.nodes:
             return None
         
-        # Mesafeler ve önceki nodelar
+        if self.queue != 'heap':
+            return self._find_with_queue(start_id, end_id, start_time)
+        
+        trace = None
+        if self.stats_level == 'off':
+            self.stats = {'execution_time': 0.0}
+            distances, previous_edge = self._search_plain(start_id, end_id)
+        else:
+            trace = [] if self.stats_level == 'full' else None
+            distances, previous_edge = self._search_counted(start_id, end_id, trace)
+        
+        # Yolu reconstruct et
+        if distances.get(end_id, float('inf')) == float('inf'):
+            return None  # Yol bulunamadı
+        
+        path, path_edges = self._reconstruct_path(previous_edge, start_id, end_id)
+        
+        # Detaylı bilgileri hesapla - aramanın kullandığı edge'lerden
+        total_distance, total_time = self.network.path_metrics(path_edges)
+        
+        self.stats['execution_time'] = time.time() - start_time
+        
+        result = {
+            'path': path,
+            'distance': total_distance,
+            'weight': distances[end_id],
+            'estimated_time': total_time,
+            'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
+            'stats': self.stats.copy()
+        }
+        if trace is not None:
+            result['trace'] = {'settled_order': trace}
+        return result
+    
+    def _search_plain(self, start_id: int, end_id: int) -> Tuple[Dict, Dict]:
+        """stats_level='off' döngüsü - sayaç ve iz yok"""
+        neighbor_edges = self.network.get_neighbor_edges
+        heappop, heappush = heapq.heappop, heapq.heappush
+        inf = float('inf')
+        
+        distances = {start_id: 0.0}
+        previous_edge = {}  # node -> ona ulaşan edge'in ref'i
+        pq = [(0.0, start_id)]
+        visited = set()
+        
+        while pq:
+            current_dist, current_id = heappop(pq)
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+            
+            if current_id == end_id:
+                break
+            
+            for neighbor_id, edge_weight, edge_ref in neighbor_edges(current_id):
+                if neighbor_id in visited:
+                    continue
+                new_dist = current_dist + edge_weight
+                if new_dist < distances.get(neighbor_id, inf):
+                    distances[neighbor_id] = new_dist
+                    previous_edge[neighbor_id] = edge_ref
+                    heappush(pq, (new_dist, neighbor_id))
+        
+        return distances, previous_edge
+    
+    def _search_counted(self, start_id: int, end_id: int, trace: Optional[List[int]]) -> Tuple[Dict, Dict]:
+        """'counters' / 'full' döngüsü"""
+        # Mesafeler ve önceki edge'ler
         distances = {node_id: float('inf') for node_id in self.network.nodes}
         distances[start_id] = 0.0
-        previous = {node_id: None for node_id in self.network.nodes}
+        previous_edge = {}  # node -> ona ulaşan edge'in ref'i
         
         # Priority queue - (mesafe, node_id)
         pq = [(0.0, start_id)]
@@ -266,13 +497,15 @@ class DijkstraPathfinder:
             
             visited.add(current_id)
             self.stats['nodes_explored'] += 1
+            if trace is not None:
+                trace.append(current_id)
             
             # Hedefe ulaştık
             if current_id == end_id:
                 break
             
             # Komşuları işle (Relaxation)
-            for neighbor_id, edge_weight in self.network.get_neighbors(current_id):
+            for neighbor_id, edge_weight, edge_ref in self.network.get_neighbor_edges(current_id):
                 if neighbor_id in visited:
                     continue
                 
@@ -281,47 +514,139 @@ class DijkstraPathfinder:
                 
                 if new_dist < distances[neighbor_id]:
                     distances[neighbor_id] = new_dist
-                    previous[neighbor_id] = current_id
+                    previous_edge[neighbor_id] = edge_ref
                     heapq.heappush(pq, (new_dist, neighbor_id))
         
-        # Yolu reconstruct et
-        if distances[end_id] == float('inf'):
+        return distances, previous_edge
+    
+    def _find_with_queue(self, start_id: int, end_id: int, start_time: float) -> Optional[Dict]:
+        """Seçilen kuyruk ile Dijkstra (decrease-key / tamsayı öncelik)"""
+        trace = None
+        if self.stats_level == 'off':
+            self.stats = {'execution_time': 0.0}
+            weights, previous_edge, visited = self._queue_search_plain(start_id, end_id)
+        else:
+            trace = [] if self.stats_level == 'full' else None
+            weights, previous_edge, visited = self._queue_search_counted(start_id, end_id, trace)
+        
+        if end_id not in visited:
             return None  # Yol bulunamadı
         
-        path = self._reconstruct_path(previous, start_id, end_id)
-        
-        # Detaylı bilgileri hesapla
-        total_distance = 0.0
-        total_time = 0.0
-        
-        for i in range(len(path) - 1):
-            edge = self.network.get_edge(path[i], path[i+1])
-            if edge:
-                total_distance += edge.distance
-                total_time += edge.estimated_time
+        path, path_edges = self._reconstruct_path(previous_edge, start_id, end_id)
+        total_distance, total_time = self.network.path_metrics(path_edges)
         
         self.stats['execution_time'] = time.time() - start_time
         
-        return {
+        result = {
             'path': path,
             'distance': total_distance,
-            'weight': distances[end_id],
+            'weight': weights[end_id],
             'estimated_time': total_time,
             'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
-            'stats': self.stats.copy()
+            'stats': self.stats.copy(),
+            'queue': self.queue
         }
+        if trace is not None:
+            result['trace'] = {'settled_order': trace}
+        return result
     
-    def _reconstruct_path(self, previous: Dict, start_id: int, end_id: int) -> List[int]:
-        """Yolu geriye doğru reconstruct et"""
-        path = []
+    def _queue_search_plain(self, start_id: int, end_id: int) -> Tuple[Dict, Dict, set]:
+        """Kuyruk tabanlı stats_level='off' döngüsü - sayaç ve iz yok"""
+        integer_keys = self.queue in INTEGER_QUEUES
+        scale = self.weight_scale
+        neighbor_edges = self.network.get_neighbor_edges
+        inf = float('inf')
+        
+        # keys: kuyruk önceliği (tamsayı kuyruklarda quantize), weights: gerçek ağırlık
+        keys = {start_id: 0}
+        weights = {start_id: 0.0}
+        previous_edge = {}  # node -> ona ulaşan edge'in ref'i
+        
+        pq = make_queue(self.queue)
+        pq.push(start_id, 0)
+        visited = set()
+        
+        while pq:
+            current_key, current_id = pq.pop()
+            visited.add(current_id)
+            if current_id == end_id:
+                break
+            
+            current_weight = weights[current_id]
+            for neighbor_id, edge_weight, edge_ref in neighbor_edges(current_id):
+                if neighbor_id in visited:
+                    continue
+                if integer_keys:
+                    new_key = current_key + int(edge_weight * scale + 0.5)
+                else:
+                    new_key = current_key + edge_weight
+                if new_key < keys.get(neighbor_id, inf):
+                    keys[neighbor_id] = new_key
+                    weights[neighbor_id] = current_weight + edge_weight
+                    previous_edge[neighbor_id] = edge_ref
+                    pq.push(neighbor_id, new_key)
+        
+        return weights, previous_edge, visited
+    
+    def _queue_search_counted(self, start_id: int, end_id: int,
+                              trace: Optional[List[int]]) -> Tuple[Dict, Dict, set]:
+        """Kuyruk tabanlı 'counters' / 'full' döngüsü"""
+        integer_keys = self.queue in INTEGER_QUEUES
+        scale = self.weight_scale
+        
+        keys = {start_id: 0}
+        weights = {start_id: 0.0}
+        previous_edge = {}
+        
+        pq = make_queue(self.queue)
+        pq.push(start_id, 0)
+        visited = set()
+        
+        while pq:
+            current_key, current_id = pq.pop()
+            visited.add(current_id)
+            self.stats['nodes_explored'] += 1
+            if trace is not None:
+                trace.append(current_id)
+            
+            # Hedefe ulaştık
+            if current_id == end_id:
+                break
+            
+            current_weight = weights[current_id]
+            for neighbor_id, edge_weight, edge_ref in self.network.get_neighbor_edges(current_id):
+                if neighbor_id in visited:
+                    continue
+                
+                if integer_keys:
+                    new_key = current_key + int(edge_weight * scale + 0.5)
+                else:
+                    new_key = current_key + edge_weight
+                self.stats['edges_relaxed'] += 1
+                
+                if new_key < keys.get(neighbor_id, float('inf')):
+                    keys[neighbor_id] = new_key
+                    weights[neighbor_id] = current_weight + edge_weight
+                    previous_edge[neighbor_id] = edge_ref
+                    pq.push(neighbor_id, new_key)
+        
+        return weights, previous_edge, visited
+    
+    def _reconstruct_path(self, previous_edge: Dict, start_id: int, end_id: int) -> Tuple[List[int], List]:
+        """Yolu öncül edge'lerden geriye doğru reconstruct et: (node yolu, edge ref'leri)"""
+        path = [end_id]
+        path_edges = []
         current = end_id
         
-        while current is not None:
+        while current != start_id:
+            edge_ref = previous_edge[current]
+            path_edges.append(edge_ref)
+            current = self.network.resolve_edge(edge_ref).from_node
             path.append(current)
-            current = previous[current]
         
         path.reverse()
-        return path
+        path_edges.reverse()
+        return path, path_edges
 
 
 class AStarPathfinder:
@@ -337,11 +662,20 @@ class AStarPathfinder:
     f(n) = g(n) + h(n)
     - g(n): Başlangıçtan n'e kadar olan gerçek maliyet
     - h(n): n'den hedefe tahmini maliyet
+    
+    stats_level: DijkstraPathfinder ile aynı ('off' döngüsünde heuristic
+    çağrıları da sayılmaz, Haversine satır içi hesaplanır)
     """
     
-    def __init__(self, network: RoadNetwork, heuristic_weight: float = 1.0):
+    def __init__(self, network: RoadNetwork, heuristic_weight: float = 1.0, queue: str = 'heap',
+                 stats_level: str = 'counters'):
         self.network = network
         self.heuristic_weight = heuristic_weight  # ε-admissible için
+        if queue in INTEGER_QUEUES:
+            raise ValueError(f"A* için '{queue}' kuyruğu desteklenmiyor (f değerleri tamsayı değil)")
+        make_queue(queue)
+        self.queue = queue
+        self.stats_level = _check_stats_level(stats_level)
         self.stats = {
             'nodes_explored': 0,
             'edges_relaxed': 0,
@@ -358,14 +692,14 @@ class AStarPathfinder:
         """
         self.stats['heuristic_calls'] += 1
         
-        node = self.network.nodes[node_id]
-        goal = self.network.nodes[goal_id]
-        
         # Haversine mesafesi - asla gerçek yol mesafesinden fazla olamaz
-        return self.network._haversine_distance(
-            node.lat, node.lon, goal.lat, goal.lon
+        # Node başına radyan/cos(lat) değerleri önhesaplanmış olarak kullanılır
+        return haversine_precomputed(
+            self.network.radian_coords(node_id), self.network.radian_coords(goal_id)
         ) * self.heuristic_weight
     
+    @metered('astar')
+    @traced('astar.find_shortest_path', attrs=_query_attrs)
     def find_shortest_path(self, start_id: int, end_id: int) -> Optional[Dict]:
         """
         A* ile en kısa yol bul
@@ -381,6 +715,86 @@ class AStarPathfinder:
         if start_id not in self.network.nodes or end_id not in self.network.nodes:
             return None
         
+        trace = None
+        if self.stats_level == 'off':
+            self.stats = {'execution_time': 0.0}
+            g_score, previous_edge = self._search_plain(start_id, end_id)
+        else:
+            trace = [] if self.stats_level == 'full' else None
+            g_score, previous_edge = self._search_counted(start_id, end_id, trace)
+        
+        # Yol bulunamadı
+        if g_score.get(end_id, float('inf')) == float('inf'):
+            return None
+        
+        # Yolu reconstruct et
+        path, path_edges = self._reconstruct_path(previous_edge, start_id, end_id)
+        
+        # Detaylı bilgileri hesapla - aramanın kullandığı edge'lerden
+        total_distance, total_time = self.network.path_metrics(path_edges)
+        
+        self.stats['execution_time'] = time.time() - start_time
+        
+        result = {
+            'path': path,
+            'distance': total_distance,
+            'weight': g_score[end_id],
+            'estimated_time': total_time,
+            'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
+            'stats': self.stats.copy(),
+            'algorithm': 'A*',
+            'heuristic_weight': self.heuristic_weight
+        }
+        if trace is not None:
+            result['trace'] = {'settled_order': trace}
+        return result
+    
+    def _frontier(self, start_id: int, start_key: float):
+        """Öncelik kuyruğu ve pop/push fonksiyonları - (f_score, node_id)"""
+        if self.queue == 'heap':
+            return [(start_key, start_id)], heapq.heappop, heapq.heappush
+        
+        pq = make_queue(self.queue)
+        pq.push(start_id, start_key)
+        return pq, type(pq).pop, lambda queue, item: queue.push(item[1], item[0])
+    
+    def _search_plain(self, start_id: int, end_id: int) -> Tuple[Dict, Dict]:
+        """stats_level='off' döngüsü - sayaç ve iz yok"""
+        neighbor_edges = self.network.get_neighbor_edges
+        radian_coords = self.network.radian_coords
+        goal = radian_coords(end_id)
+        weight = self.heuristic_weight
+        inf = float('inf')
+        
+        g_score = {start_id: 0.0}
+        previous_edge = {}  # node -> ona ulaşan edge'in ref'i
+        pq, pop, push = self._frontier(start_id, haversine_precomputed(radian_coords(start_id), goal) * weight)
+        visited = set()
+        
+        while pq:
+            _, current_id = pop(pq)
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+            
+            if current_id == end_id:
+                break
+            
+            current_g = g_score[current_id]
+            for neighbor_id, edge_weight, edge_ref in neighbor_edges(current_id):
+                if neighbor_id in visited:
+                    continue
+                tentative_g = current_g + edge_weight
+                if tentative_g < g_score.get(neighbor_id, inf):
+                    g_score[neighbor_id] = tentative_g
+                    previous_edge[neighbor_id] = edge_ref
+                    h = haversine_precomputed(radian_coords(neighbor_id), goal) * weight
+                    push(pq, (tentative_g + h, neighbor_id))
+        
+        return g_score, previous_edge
+    
+    def _search_counted(self, start_id: int, end_id: int, trace: Optional[List[int]]) -> Tuple[Dict, Dict]:
+        """'counters' / 'full' döngüsü"""
         # g(n): Başlangıçtan n'e gerçek maliyet
         g_score = {node_id: float('inf') for node_id in self.network.nodes}
         g_score[start_id] = 0.0
@@ -389,27 +803,29 @@ class AStarPathfinder:
         f_score = {node_id: float('inf') for node_id in self.network.nodes}
         f_score[start_id] = self._heuristic(start_id, end_id)
         
-        previous = {node_id: None for node_id in self.network.nodes}
+        previous_edge = {}  # node -> ona ulaşan edge'in ref'i
         
         # Priority queue - (f_score, node_id)
-        pq = [(f_score[start_id], start_id)]
+        pq, pop, push = self._frontier(start_id, f_score[start_id])
         visited = set()
         
         while pq:
-            current_f, current_id = heapq.heappop(pq)
+            current_f, current_id = pop(pq)
             
             if current_id in visited:
                 continue
             
             visited.add(current_id)
             self.stats['nodes_explored'] += 1
+            if trace is not None:
+                trace.append(current_id)
             
             # Hedefe ulaştık
             if current_id == end_id:
                 break
             
             # Komşuları işle
-            for neighbor_id, edge_weight in self.network.get_neighbors(current_id):
+            for neighbor_id, edge_weight, edge_ref in self.network.get_neighbor_edges(current_id):
                 if neighbor_id in visited:
                     continue
                 
@@ -419,50 +835,14 @@ class AStarPathfinder:
                 if tentative_g < g_score[neighbor_id]:
                     g_score[neighbor_id] = tentative_g
                     f_score[neighbor_id] = tentative_g + self._heuristic(neighbor_id, end_id)
-                    previous[neighbor_id] = current_id
-                    heapq.heappush(pq, (f_score[neighbor_id], neighbor_id))
-        
-        # Yol bulunamadı
-        if g_score[end_id] == float('inf'):
-            return None
-        
-        # Yolu reconstruct et
-        path = self._reconstruct_path(previous, start_id, end_id)
-        
-        # Detaylı bilgileri hesapla
-        total_distance = 0.0
-        total_time = 0.0
-        
-        for i in range(len(path) - 1):
-            edge = self.network.get_edge(path[i], path[i+1])
-            if edge:
-                total_distance += edge.distance
-                total_time += edge.estimated_time
-        
-        self.stats['execution_time'] = time.time() - start_time
+                    previous_edge[neighbor_id] = edge_ref
+                    push(pq, (f_score[neighbor_id], neighbor_id))
         
-        return {
-            'path': path,
-            'distance': total_distance,
-            'weight': g_score[end_id],
-            'estimated_time': total_time,
-            'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
-            'stats': self.stats.copy(),
-            'algorithm': 'A*',
-            'heuristic_weight': self.heuristic_weight
-        }
+        return g_score, previous_edge
     
-    def _reconstruct_path(self, previous: Dict, start_id: int, end_id: int) -> List[int]:
-        """Yolu reconstruct et"""
-        path = []
-        current = end_id
-        
-        while current is not None:
-            path.append(current)
-            current = previous[current]
-        
-        path.reverse()
-        return path
+    def _reconstruct_path(self, previous_edge: Dict, start_id: int, end_id: int) -> Tuple[List[int], List]:
+        """Yolu öncül edge'lerden reconstruct et: (node yolu, edge ref'leri)"""
+        return DijkstraPathfinder._reconstruct_path(self, previous_edge, start_id, end_id)
 
 
 class BidirectionalDijkstra:
@@ -489,6 +869,8 @@ class BidirectionalDijkstra:
             'backward_explored': 0
         }
     
+    @metered('bidirectional_dijkstra')
+    @traced('bidirectional_dijkstra.find_shortest_path', attrs=_query_attrs)
     def find_shortest_path(self, start_id: int, end_id: int) -> Optional[Dict]:
         """Çift yönlü arama ile en kısa yol"""
         start_time = time.time()
@@ -512,6 +894,9 @@ class BidirectionalDijkstra:
         
         prev_forward = {node_id: None for node_id in self.network.nodes}
         prev_backward = {node_id: None for node_id in self.network.nodes}
+        # Kullanılan edge ref'leri: ileri u'ya gelen edge, geri u'dan çıkan edge
+        edge_forward = {}
+        edge_backward = {}
         
         pq_forward = [(0.0, start_id)]
         pq_backward = [(0.0, end_id)]
@@ -539,7 +924,7 @@ class BidirectionalDijkstra:
                             best_meeting_node = node_f
                     
                     # Komşuları işle
-                    for neighbor_id, weight in self.network.get_neighbors(node_f):
+                    for neighbor_id, weight, edge_ref in self.network.get_neighbor_edges(node_f):
                         if neighbor_id not in visited_forward:
                             new_dist = dist_forward[node_f] + weight
                             self.stats['edges_relaxed'] += 1
@@ -547,6 +932,7 @@ class BidirectionalDijkstra:
                             if new_dist < dist_forward[neighbor_id]:
                                 dist_forward[neighbor_id] = new_dist
                                 prev_forward[neighbor_id] = node_f
+                                edge_forward[neighbor_id] = edge_ref
                                 heapq.heappush(pq_forward, (new_dist, neighbor_id))
             
             # Geri arama adımı
@@ -564,18 +950,17 @@ class BidirectionalDijkstra:
                             best_distance = total_dist
                             best_meeting_node = node_b
                     
-                    # Komşuları işle (ters yönde)
-                    for edge in self.network.edges.values():
-                        for e in edge:
-                            if e.to_node == node_b and e.from_node not in visited_backward:
-                                neighbor_id = e.from_node
-                                new_dist = dist_backward[node_b] + e.weight
-                                self.stats['edges_relaxed'] += 1
-                                
-                                if new_dist < dist_backward[neighbor_id]:
-                                    dist_backward[neighbor_id] = new_dist
-                                    prev_backward[neighbor_id] = node_b
-                                    heapq.heappush(pq_backward, (new_dist, neighbor_id))
+                    # Komşuları işle (ters yönde, gelen edge'ler üzerinden)
+                    for neighbor_id, weight, edge_ref in self.network.get_incoming_refs(node_b):
+                        if neighbor_id not in visited_backward:
+                            new_dist = dist_backward[node_b] + weight
+                            self.stats['edges_relaxed'] += 1
+                            
+                            if new_dist < dist_backward[neighbor_id]:
+                                dist_backward[neighbor_id] = new_dist
+                                prev_backward[neighbor_id] = node_b
+                                edge_backward[neighbor_id] = edge_ref
+                                heapq.heappush(pq_backward, (new_dist, neighbor_id))
             
             # Erken çıkış - her iki yönde de arama bitti
             if best_meeting_node and (not pq_forward or not pq_backward):
@@ -600,15 +985,12 @@ class BidirectionalDijkstra:
         
         path = path_forward + path_backward
         
-        # Detaylı bilgileri hesapla
-        total_distance = 0.0
-        total_time = 0.0
-        
-        for i in range(len(path) - 1):
-            edge = self.network.get_edge(path[i], path[i+1])
-            if edge:
-                total_distance += edge.distance
-                total_time += edge.estimated_time
+        # Detaylı bilgileri hesapla - aramanın kullandığı edge'lerden
+        meeting_index = len(path_forward) - 1
+        total_distance, total_time = self.network.path_metrics(
+            [edge_forward[node_id] for node_id in path[1:meeting_index + 1]] +
+            [edge_backward[node_id] for node_id in path[meeting_index:-1]]
+        )
         
         self.stats['nodes_explored'] = self.stats['forward_explored'] + self.stats['backward_explored']
         self.stats['execution_time'] = time.time() - start_time
@@ -625,6 +1007,402 @@ class BidirectionalDijkstra:
         }
 
 
+class HaversineHeuristic:
+    """
+    Kuş uçuşu alt sınır: h(u, v) = Haversine(u, v) × çarpan
+    
+    Tüm yol tiplerinde ağırlık ≥ mesafe olduğundan (RoadType.weight ≥ 1)
+    çarpan 1.0 iken hem admissible hem consistent'tır.
+    """
+    
+    def __init__(self, network: RoadNetwork, weight: float = 1.0):
+        self.network = network
+        self.weight = weight
+    
+    def estimate(self, from_id: int, to_id: int) -> float:
+        """from_id'den to_id'ye maliyetin alt sınırı"""
+        return haversine_precomputed(
+            self.network.radian_coords(from_id), self.network.radian_coords(to_id)
+        ) * self.weight
+
+
+class LandmarkHeuristic:
+    """
+    ALT (A*, Landmarks, Triangle inequality) heuristic'i
+    
+    Birkaç landmark L için d(L, ·) ve d(·, L) önceden hesaplanır. Üçgen
+    eşitsizliğinden:
+        d(u, v) ≥ d(L, v) − d(L, u)
+        d(u, v) ≥ d(u, L) − d(v, L)
+    Bu sınırların maksimumu consistent bir heuristic verir ve yol ağlarında
+    Haversine'den çok daha sıkıdır.
+    
+    Landmark seçimi: farthest selection - her yeni landmark, seçilmişlere
+    en uzak (erişilebilir) node olur.
+    """
+    
+    def __init__(self, network: RoadNetwork, landmark_count: int = 8,
+                 landmarks: Optional[List[int]] = None):
+        self.network = network
+        self.landmarks: List[int] = []
+        self.from_landmark: List[Dict[int, float]] = []  # d(L, v)
+        self.to_landmark: List[Dict[int, float]] = []    # d(v, L)
+        
+        if landmarks is None:
+            landmarks = self._select_landmarks(landmark_count)
+        for landmark in landmarks:
+            self.add_landmark(landmark)
+    
+    def add_landmark(self, landmark: int) -> None:
+        self.landmarks.append(landmark)
+        self.from_landmark.append(self._one_to_all(landmark, self.network.get_neighbors))
+        self.to_landmark.append(self._one_to_all(landmark, self.network.get_incoming))
+    
+    def _select_landmarks(self, count: int) -> List[int]:
+        if not self.network.nodes or count <= 0:
+            return []
+        
+        selected: List[int] = []
+        nearest: Dict[int, float] = {}
+        current = min(self.network.nodes)
+        
+        for _ in range(min(count, self.network.node_count())):
+            distances = self._one_to_all(current, self.network.get_neighbors)
+            if selected:
+                for node_id, dist in distances.items():
+                    if dist < nearest.get(node_id, float('inf')):
+                        nearest[node_id] = dist
+            else:
+                nearest = dict(distances)
+            
+            if current not in selected:
+                selected.append(current)
+            
+            candidates = [(dist, node_id) for node_id, dist in nearest.items() if node_id not in selected]
+            if not candidates:
+                break
+            current = max(candidates)[1]
+        
+        return selected
+    
+    @staticmethod
+    def _one_to_all(source: int, neighbors: Callable[[int], List[Tuple[int, float]]]) -> Dict[int, float]:
+        distances = {source: 0.0}
+        pq = [(0.0, source)]
+        visited = set()
+        
+        while pq:
+            current_dist, current_id = heapq.heappop(pq)
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+            
+            for neighbor_id, weight in neighbors(current_id):
+                new_dist = current_dist + weight
+                if new_dist < distances.get(neighbor_id, float('inf')):
+                    distances[neighbor_id] = new_dist
+                    heapq.heappush(pq, (new_dist, neighbor_id))
+        
+        return distances
+    
+    def estimate(self, from_id: int, to_id: int) -> float:
+        """from_id'den to_id'ye maliyetin alt sınırı"""
+        best = 0.0
+        inf = float('inf')
+        
+        for from_l, to_l in zip(self.from_landmark, self.to_landmark):
+            d_lu = from_l.get(from_id, inf)
+            d_lv = from_l.get(to_id, inf)
+            if d_lu < inf and d_lv < inf and d_lv - d_lu > best:
+                best = d_lv - d_lu
+            
+            d_ul = to_l.get(from_id, inf)
+            d_vl = to_l.get(to_id, inf)
+            if d_ul < inf and d_vl < inf and d_ul - d_vl > best:
+                best = d_ul - d_vl
+        
+        return best
+
+
+class BidirectionalAStar:
+    """
+    Çift Yönlü A* - Ortalama potansiyel (average potential) formülasyonu
+    
+    Potansiyeller:
+        p_f(v) = (h(v, t) − h(s, v)) / 2
+        p_r(v) = −p_f(v)
+    
+    h consistent ise (Haversine veya landmark) indirgenmiş ağırlıklar
+    w'(u, v) = w(u, v) − p_f(u) + p_f(v) negatif olmaz; iki yönlü arama
+    indirgenmiş graph'ta çift yönlü Dijkstra'ya denktir.
+    
+    Durma koşulu: min_key_f + min_key_b ≥ μ (μ: bulunan en iyi yol ağırlığı)
+    
+    Uzun rotalarda hem hedefe yönelir hem de arama alanını iki yöne böler;
+    A* ve Bidirectional Dijkstra'dan daha az node inceler.
+    """
+    
+    def __init__(self, network: RoadNetwork, heuristic=None):
+        self.network = network
+        self.heuristic = heuristic if heuristic is not None else HaversineHeuristic(network)
+        self.stats = {
+            'nodes_explored': 0,
+            'edges_relaxed': 0,
+            'execution_time': 0.0,
+            'forward_explored': 0,
+            'backward_explored': 0,
+            'heuristic_calls': 0
+        }
+    
+    @metered('bidirectional_astar')
+    @traced('bidirectional_astar.find_shortest_path', attrs=_query_attrs)
+    def find_shortest_path(self, start_id: int, end_id: int) -> Optional[Dict]:
+        """Çift yönlü A* ile en kısa yol"""
+        start_time = time.time()
+        self.stats = {
+            'nodes_explored': 0,
+            'edges_relaxed': 0,
+            'execution_time': 0.0,
+            'forward_explored': 0,
+            'backward_explored': 0,
+            'heuristic_calls': 0
+        }
+        
+        if start_id not in self.network.nodes or end_id not in self.network.nodes:
+            return None
+        
+        estimate = self.heuristic.estimate
+        potentials: Dict[int, float] = {}
+        
+        def potential(node_id: int) -> float:
+            value = potentials.get(node_id)
+            if value is None:
+                self.stats['heuristic_calls'] += 2
+                value = (estimate(node_id, end_id) - estimate(start_id, node_id)) / 2
+                potentials[node_id] = value
+            return value
+        
+        inf = float('inf')
+        dist_forward = {start_id: 0.0}
+        dist_backward = {end_id: 0.0}
+        prev_forward: Dict[int, Optional[int]] = {start_id: None}
+        next_backward: Dict[int, Optional[int]] = {end_id: None}
+        edge_forward = {}
+        edge_backward = {}
+        
+        # Anahtarlar: ileri g_f + p_f, geri g_b − p_f
+        pq_forward = [(potential(start_id), start_id)]
+        pq_backward = [(-potential(end_id), end_id)]
+        visited_forward = set()
+        visited_backward = set()
+        
+        best_distance = 0.0 if start_id == end_id else inf
+        best_meeting_node = start_id if start_id == end_id else None
+        
+        while pq_forward and pq_backward:
+            if pq_forward[0][0] + pq_backward[0][0] >= best_distance:
+                break
+            
+            if pq_forward[0][0] <= pq_backward[0][0]:
+                _, node_f = heapq.heappop(pq_forward)
+                if node_f in visited_forward:
+                    continue
+                visited_forward.add(node_f)
+                self.stats['forward_explored'] += 1
+                
+                base = dist_forward[node_f]
+                for neighbor_id, weight, edge_ref in self.network.get_neighbor_edges(node_f):
+                    new_dist = base + weight
+                    self.stats['edges_relaxed'] += 1
+                    
+                    if new_dist < dist_forward.get(neighbor_id, inf):
+                        dist_forward[neighbor_id] = new_dist
+                        prev_forward[neighbor_id] = node_f
+                        edge_forward[neighbor_id] = edge_ref
+                        heapq.heappush(pq_forward, (new_dist + potential(neighbor_id), neighbor_id))
+                        
+                        total = new_dist + dist_backward.get(neighbor_id, inf)
+                        if total < best_distance:
+                            best_distance = total
+                            best_meeting_node = neighbor_id
+            else:
+                _, node_b = heapq.heappop(pq_backward)
+                if node_b in visited_backward:
+                    continue
+                visited_backward.add(node_b)
+                self.stats['backward_explored'] += 1
+                
+                base = dist_backward[node_b]
+                for neighbor_id, weight, edge_ref in self.network.get_incoming_refs(node_b):
+                    new_dist = base + weight
+                    self.stats['edges_relaxed'] += 1
+                    
+                    if new_dist < dist_backward.get(neighbor_id, inf):
+                        dist_backward[neighbor_id] = new_dist
+                        next_backward[neighbor_id] = node_b
+                        edge_backward[neighbor_id] = edge_ref
+                        heapq.heappush(pq_backward, (new_dist - potential(neighbor_id), neighbor_id))
+                        
+                        total = new_dist + dist_forward.get(neighbor_id, inf)
+                        if total < best_distance:
+                            best_distance = total
+                            best_meeting_node = neighbor_id
+        
+        if best_meeting_node is None:
+            return None
+        
+        # Yolu reconstruct et: start -> meeting (ileri), meeting -> end (geri)
+        path = []
+        current = best_meeting_node
+        while current is not None:
+            path.append(current)
+            current = prev_forward[current]
+        path.reverse()
+        meeting_index = len(path) - 1
+        
+        current = next_backward.get(best_meeting_node)
+        while current is not None:
+            path.append(current)
+            current = next_backward[current]
+        
+        # Detaylı bilgileri hesapla - aramanın kullandığı edge'lerden
+        total_distance, total_time = self.network.path_metrics(
+            [edge_forward[node_id] for node_id in path[1:meeting_index + 1]] +
+            [edge_backward[node_id] for node_id in path[meeting_index:-1]]
+        )
+        
+        self.stats['nodes_explored'] = self.stats['forward_explored'] + self.stats['backward_explored']
+        self.stats['execution_time'] = time.time() - start_time
+        
+        return {
+            'path': path,
+            'distance': total_distance,
+            'weight': best_distance,
+            'estimated_time': total_time,
+            'meeting_node': best_meeting_node,
+            'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
+            'stats': self.stats.copy(),
+            'algorithm': 'Bidirectional A*'
+        }
+
+
+class NearestStationSearch:
+    """
+    En yakın K itfaiye - olay noktasından tek ters yönlü Dijkstra
+    
+    K ayrı noktadan-noktaya arama yerine olay node'undan gelen edge'ler
+    üzerinde (ters yönde) tek bir Dijkstra çalıştırılır; dist[u], u'dan olay
+    yerine sürüş maliyetidir. Kesinleşen (settled) her itfaiye node'u sıraya
+    eklenir ve K tanesi kesinleştiği anda arama durur. Dijkstra nodeları
+    artan maliyetle kesinleştirdiği için sıralama optimaldir.
+    
+    metric: 'time' (dakika, varsayılan), 'weight' (ağırlıklı maliyet) veya 'distance' (km)
+    """
+    
+    METRICS = ('time', 'weight', 'distance')
+    
+    def __init__(self, network: RoadNetwork, metric: str = 'time'):
+        if metric not in self.METRICS:
+            raise ValueError(f"Bilinmeyen metrik: {metric} (seçenekler: {', '.join(self.METRICS)})")
+        self.network = network
+        self.metric = metric
+        self.stats = {'nodes_explored': 0, 'edges_relaxed': 0, 'execution_time': 0.0}
+    
+    def _cost(self, edge: Edge) -> float:
+        if self.metric == 'time':
+            return edge.estimated_time
+        if self.metric == 'distance':
+            return edge.distance
+        return edge.weight
+    
+    @metered('nearest_stations')
+    @traced('nearest_stations.search', attrs=_nearest_attrs)
+    def find_nearest_stations(self, incident_id: int, count: int = 3,
+                              candidates: Optional[Set[int]] = None) -> List[Dict]:
+        """
+        Olay node'una en düşük maliyetle ulaşan 'count' itfaiye
+        
+        Args:
+            incident_id: Olay yerine en yakın node
+            count: İstenen itfaiye sayısı (K)
+            candidates: İtfaiye sayılacak node kümesi (varsayılan: network.fire_stations)
+        
+        Returns:
+            Maliyete göre sıralı liste; her eleman mevcut sonuç yapısında
+            ('path' itfaiyeden olay yerine, 'distance', 'weight', 'estimated_time')
+            ve ek olarak 'station_id', 'name', 'rank', 'cost'
+        """
+        start_time = time.time()
+        self.stats = {'nodes_explored': 0, 'edges_relaxed': 0, 'execution_time': 0.0}
+        
+        if incident_id not in self.network.nodes or count <= 0:
+            return []
+        
+        targets = candidates if candidates is not None else set(self.network.fire_stations)
+        
+        costs = {incident_id: 0.0}
+        # next_edge[u]: u'dan olay yerine giden yoldaki ilk edge
+        next_edge: Dict[int, Optional[Edge]] = {incident_id: None}
+        pq = [(0.0, incident_id)]
+        visited = set()
+        found = []
+        
+        while pq and len(found) < count:
+            current_cost, current_id = heapq.heappop(pq)
+            
+            if current_id in visited:
+                continue
+            
+            visited.add(current_id)
+            self.stats['nodes_explored'] += 1
+            
+            if current_id in targets:
+                found.append((current_id, current_cost))
+            
+            for edge in self.network.get_incoming_edges(current_id):
+                neighbor_id = edge.from_node
+                if neighbor_id in visited:
+                    continue
+                
+                new_cost = current_cost + self._cost(edge)
+                self.stats['edges_relaxed'] += 1
+                
+                if new_cost < costs.get(neighbor_id, float('inf')):
+                    costs[neighbor_id] = new_cost
+                    next_edge[neighbor_id] = edge
+                    heapq.heappush(pq, (new_cost, neighbor_id))
+        
+        self.stats['execution_time'] = time.time() - start_time
+        
+        results = []
+        for rank, (station_id, cost) in enumerate(found, 1):
+            path = [station_id]
+            total_distance = total_weight = total_time = 0.0
+            edge = next_edge[station_id]
+            while edge is not None:
+                path.append(edge.to_node)
+                total_distance += edge.distance
+                total_weight += edge.weight
+                total_time += edge.estimated_time
+                edge = next_edge[edge.to_node]
+            
+            results.append({
+                'station_id': station_id,
+                'name': self.network.nodes[station_id].name,
+                'rank': rank,
+                'cost': cost,
+                'path': path,
+                'distance': total_distance,
+                'weight': total_weight,
+                'estimated_time': total_time,
+                'node_sequence': [self.network.nodes[nid].name for nid in path if self.network.nodes[nid].name],
+                'stats': self.stats.copy(),
+                'algorithm': 'Reverse multi-target Dijkstra'
+            })
+        
+        return results
+
+
 def compare_algorithms(network: RoadNetwork, start_id: int, end_id: int) -> Dict:
     """
     Tüm algoritmaları karşılaştır
@@ -654,6 +1432,11 @@ def compare_algorithms(network: RoadNetwork, start_id: int, end_id: int) -> Dict
     bidirectional = BidirectionalDijkstra(network)
     results['bidirectional'] = bidirectional.find_shortest_path(start_id, end_id)
     
+    # Bidirectional A*
+    print("🔍 Bidirectional A* çalıştırılıyor...")
+    bidirectional_astar = BidirectionalAStar(network)
+    results['bidirectional_astar'] = bidirectional_astar.find_shortest_path(start_id, end_id)
+    
     # Karşılaştırma
     comparison = {
         'dijkstra': {
@@ -672,6 +1455,12 @@ def compare_algorithms(network: RoadNetwork, start_id: int, end_id: int) -> Dict
             'nodes': results['bidirectional']['stats']['nodes_explored'] if results['bidirectional'] else None,
             'distance': results['bidirectional']['distance'] if results['bidirectional'] else None,
             'speedup': None
+        },
+        'bidirectional_astar': {
+            'time': results['bidirectional_astar']['stats']['execution_time'] if results['bidirectional_astar'] else None,
+            'nodes': results['bidirectional_astar']['stats']['nodes_explored'] if results['bidirectional_astar'] else None,
+            'distance': results['bidirectional_astar']['distance'] if results['bidirectional_astar'] else None,
+            'speedup': None
         }
     }
     
@@ -686,6 +1475,11 @@ def compare_algorithms(network: RoadNetwork, start_id: int, end_id: int) -> Dict
         if base_time > 0:
             comparison['bidirectional']['speedup'] = base_time / results['bidirectional']['stats']['execution_time']
     
+    if results['dijkstra'] and results['bidirectional_astar']:
+        base_time = results['dijkstra']['stats']['execution_time']
+        if base_time > 0:
+            comparison['bidirectional_astar']['speedup'] = base_time / results['bidirectional_astar']['stats']['execution_time']
+    
     return {
         'results': results,
         'comparison': comparison
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+🔀 ALTERNATİF ROTA ÜRETİMİ 🔀
+Yangın cephesi belirsizliğinde birbirinden gerçekten farklı 2-3 rota
+
+Yöntemler:
+1. Yen's K-Shortest Loopless Paths - En kısa döngüsüz yollar (kesin sıralama)
+   Her yeni yol, önceki yolun her node'undan "spur" araması ile üretilir;
+   K × |yol| arama gerektirir. Sıralı yollar çoğunlukla birbirine çok
+   benzediğinden yalnızca aşağıdaki share/stretch sınırlarını sağlayanlar
+   kabul edilir.
+2. Penalty (ceza) yöntemi - Hızlı ve çeşitli alternatifler
+   Bulunan her rotanın edge ağırlıkları penalty katsayısıyla çarpılır ve
+   arama tekrarlanır; aday rota ancak
+       paylaşım (share)  = ortak km / aday km        ≤ max_share
+       esneme (stretch)  = aday ağırlık / en iyi ağırlık ≤ max_stretch
+   koşullarını sağlarsa kabul edilir.
+
+Aramalar Haversine A* ile yapılır (edge kaldırma ve cezalar heuristic'i
+bozmaz: ağırlıklar sadece artar). Sonuçlar pathfinder'ların sonuç yapısındadır.
+"""
+
+import heapq
+import time
+from collections import defaultdict
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from advanced_pathfinding import RoadNetwork, Edge, HaversineHeuristic
+
+# (node dizisi, kullanılan edge dizisi)
+Route = Tuple[Tuple[int, ...], Tuple[Edge, ...]]
+
+
+class AlternativeRouteGenerator:
+    """K-en kısa yol ve ceza tabanlı alternatif rota üretici"""
+
+    def __init__(self, network: RoadNetwork, max_share: float = 0.7,
+                 max_stretch: float = 1.4, penalty: float = 1.5):
+        self.network = network
+        self.max_share = max_share
+        self.max_stretch = max_stretch
+        self.penalty = penalty
+        self.heuristic = HaversineHeuristic(network)
+        self._segment_index: Optional[Dict[Tuple, List[Edge]]] = None
+        self.stats = {'searches': 0, 'nodes_explored': 0, 'execution_time': 0.0}
+
+    def _search(self, start_id: int, end_id: int,
+                banned_nodes: FrozenSet[int] = frozenset(),
+                banned_edges: Set[Tuple[int, int]] = frozenset(),
+                penalties: Optional[Dict[Tuple[int, int], float]] = None) -> Optional[Route]:
+        """
+        Kısıtlı A*: banned_nodes/banned_edges kullanılmaz, penalties[(u, v)]
+        çarpanı ağırlığa uygulanır (anahtar node çifti: edge nesneleri
+        CompactRoadNetwork'te her erişimde yeniden oluşturulan görünümlerdir)
+        """
+        self.stats['searches'] += 1
+        estimate = self.heuristic.estimate
+        edges_of = self.network.edges
+
+        g_score = {start_id: 0.0}
+        previous: Dict[int, Optional[Edge]] = {start_id: None}
+        pq = [(estimate(start_id, end_id), start_id)]
+        visited = set()
+
+        while pq:
+            _, current_id = heapq.heappop(pq)
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+            self.stats['nodes_explored'] += 1
+
+            if current_id == end_id:
+                break
+
+            current_g = g_score[current_id]
+            for edge in edges_of.get(current_id, ()):
+                neighbor_id = edge.to_node
+                if neighbor_id in visited or neighbor_id in banned_nodes:
+                    continue
+                if banned_edges and (current_id, neighbor_id) in banned_edges:
+                    continue
+
+                weight = edge.weight
+                if penalties:
+                    weight *= penalties.get((current_id, neighbor_id), 1.0)
+
+                tentative = current_g + weight
+                if tentative < g_score.get(neighbor_id, float('inf')):
+                    g_score[neighbor_id] = tentative
+                    previous[neighbor_id] = edge
+                    heapq.heappush(pq, (tentative + estimate(neighbor_id, end_id), neighbor_id))
+
+        if end_id not in visited:
+            return None
+
+        edges = []
+        edge = previous[end_id]
+        while edge is not None:
+            edges.append(edge)
+            edge = previous[edge.from_node]
+        edges.reverse()
+        return (start_id,) + tuple(edge.to_node for edge in edges), tuple(edges)
+
+    @staticmethod
+    def _weight(route: Route) -> float:
+        return sum(edge.weight for edge in route[1])
+
+    @staticmethod
+    def _distance(route: Route) -> float:
+        return sum(edge.distance for edge in route[1])
+
+    def _segment_key(self, edge: Edge) -> Tuple:
+        """
+        Edge'in yönsüz geometrik anahtarı (uç koordinatları)
+
+        Aynı iki nokta arasındaki paralel yollar (ör. yoğunlaştırılmış ağdaki
+        çift zincirler) farklı node id'lerine sahip olsa da aynı fiziksel yoldur.
+        """
+        nodes = self.network.nodes
+        a, b = nodes[edge.from_node], nodes[edge.to_node]
+        return min((a.lat, a.lon), (b.lat, b.lon)), max((a.lat, a.lon), (b.lat, b.lon))
+
+    def _segments(self) -> Dict[Tuple, List[Edge]]:
+        """Geometrik anahtar -> o segmenti kullanan tüm edge'ler (ilk kullanımda kurulur)"""
+        if self._segment_index is None:
+            index = defaultdict(list)
+            for edges in self.network.edges.values():
+                for edge in edges:
+                    index[self._segment_key(edge)].append(edge)
+            self._segment_index = index
+        return self._segment_index
+
+    def _share(self, route: Route, accepted: List[Route]) -> float:
+        """Rotanın kabul edilmiş rotalarla en yüksek ortak km oranı (geometrik)"""
+        length = self._distance(route)
+        if length <= 0:
+            return 1.0
+
+        best = 0.0
+        for other in accepted:
+            other_segments = {self._segment_key(edge) for edge in other[1]}
+            common = sum(edge.distance for edge in route[1]
+                         if self._segment_key(edge) in other_segments)
+            best = max(best, common / length)
+        return best
+
+    def _to_result(self, route: Route, rank: int, best_weight: float, share: float) -> Dict:
+        """Pathfinder sonuç yapısı + rank/share/stretch"""
+        nodes, edges = route
+        weight = self._weight(route)
+        return {
+            'path': list(nodes),
+            'distance': self._distance(route),
+            'weight': weight,
+            'estimated_time': sum(edge.estimated_time for edge in edges),
+            'node_sequence': [self.network.nodes[nid].name for nid in nodes if self.network.nodes[nid].name],
+            'rank': rank,
+            'share': share,
+            'stretch': weight / best_weight if best_weight > 0 else 1.0,
+            'stats': self.stats.copy()
+        }
+
+    def _geometry(self, edges: Tuple[Edge, ...]) -> Tuple:
+        """Rotanın geometrik imzası - paralel ikiz zincirler aynı imzayı verir"""
+        return tuple(self._segment_key(edge) for edge in edges)
+
+    def k_shortest_paths(self, start_id: int, end_id: int, k: int = 3,
+                         max_iterations: Optional[int] = None) -> List[Dict]:
+        """
+        Yen's algoritması - ağırlığa göre sıralı, birbirinden farklı k döngüsüz yol
+
+        Yen'in sırayla ürettiği her yol share/stretch sınırlarından geçirilir;
+        sağlamayanlar kabul edilmez ama sonraki spur aramalarının kaynağı
+        olmaya devam eder. Geometrik olarak aynı yollar tek aday sayılır ve
+        spur'de yasaklanan edge'in paralel ikizleri de yasaklanır.
+
+        Args:
+            max_iterations: En fazla incelenecek aday yol (varsayılan 10 * k)
+
+        Returns:
+            Ağırlığa göre sıralı sonuç listesi (en fazla k)
+        """
+        start_time = time.time()
+        self.stats = {'searches': 0, 'nodes_explored': 0, 'execution_time': 0.0}
+
+        if start_id not in self.network.nodes or end_id not in self.network.nodes:
+            return []
+
+        first = self._search(start_id, end_id)
+        if first is None:
+            return []
+
+        best_weight = self._weight(first)
+        segments = self._segments()
+        paths = [first]  # Yen'in sıraladığı tüm yollar (spur kaynağı)
+        accepted = [first]
+        shares = [0.0]
+        candidates: List[Tuple[float, Tuple[int, ...], Tuple[Edge, ...]]] = []
+        seen = {self._geometry(first[1])}
+        limit = max_iterations if max_iterations is not None else 10 * k
+
+        for _ in range(limit):
+            if len(accepted) >= k:
+                break
+            last_nodes, last_edges = paths[-1]
+            root_weight = 0.0
+
+            for i in range(len(last_nodes) - 1):
+                spur_id = last_nodes[i]
+                root_nodes = last_nodes[:i + 1]
+
+                # Aynı kökü paylaşan yolların bir sonraki edge'i (ve paralel ikizleri) yasak
+                banned_edges = set()
+                for nodes, edges in paths:
+                    if len(nodes) > i + 1 and nodes[:i + 1] == root_nodes:
+                        for twin in segments[self._segment_key(edges[i])]:
+                            if twin.from_node == spur_id:
+                                banned_edges.add((spur_id, twin.to_node))
+                spur = self._search(spur_id, end_id, frozenset(root_nodes[:-1]), banned_edges)
+
+                if spur is not None:
+                    edges = last_edges[:i] + spur[1]
+                    geometry = self._geometry(edges)
+                    if geometry not in seen:
+                        seen.add(geometry)
+                        nodes = root_nodes[:-1] + spur[0]
+                        heapq.heappush(candidates, (root_weight + self._weight(spur), nodes, edges))
+
+                root_weight += last_edges[i].weight
+
+            if not candidates:
+                break
+            weight, nodes, edges = heapq.heappop(candidates)
+            if weight > best_weight * self.max_stretch:
+                break  # Adaylar ağırlık sırasında: sonrakiler de sınırı aşar
+
+            route = (nodes, edges)
+            paths.append(route)
+            share = self._share(route, accepted)
+            if share <= self.max_share:
+                accepted.append(route)
+                shares.append(share)
+
+        self.stats['execution_time'] = time.time() - start_time
+        return [self._to_result(route, rank, best_weight, share)
+                for rank, (route, share) in enumerate(zip(accepted, shares), 1)]
+
+    def alternatives(self, start_id: int, end_id: int, count: int = 3,
+                     max_iterations: int = 10) -> List[Dict]:
+        """
+        Ceza yöntemiyle birbirinden farklı alternatif rotalar
+
+        Returns:
+            İlk eleman en kısa yol; diğerleri share/stretch sınırlarını sağlayan
+            alternatifler (en fazla count, bulunamazsa daha az)
+        """
+        start_time = time.time()
+        self.stats = {'searches': 0, 'nodes_explored': 0, 'execution_time': 0.0}
+
+        if start_id not in self.network.nodes or end_id not in self.network.nodes:
+            return []
+
+        best = self._search(start_id, end_id)
+        if best is None:
+            return []
+
+        best_weight = self._weight(best)
+        accepted = [best]
+        shares = [0.0]
+        penalties: Dict[Tuple[int, int], float] = {}
+        last = best
+
+        for _ in range(max_iterations):
+            if len(accepted) >= count:
+                break
+
+            # Son bulunan rotanın segmentlerini (her iki yön ve paralel kopyalarıyla) cezalandır
+            segments = self._segments()
+            for key in {self._segment_key(edge) for edge in last[1]}:
+                for pair in {(twin.from_node, twin.to_node) for twin in segments[key]}:
+                    penalties[pair] = penalties.get(pair, 1.0) * self.penalty
+
+            candidate = self._search(start_id, end_id, penalties=penalties)
+            if candidate is None:
+                break
+
+            if self._weight(candidate) > best_weight * self.max_stretch:
+                break  # Cezalar rotayı kabul edilemez uzattı, daha fazla deneme anlamsız
+
+            share = self._share(candidate, accepted)
+            if share <= self.max_share:
+                accepted.append(candidate)
+                shares.append(share)
+            last = candidate
+
+        self.stats['execution_time'] = time.time() - start_time
+        return [self._to_result(route, rank, best_weight, share)
+                for rank, (route, share) in enumerate(zip(accepted, shares), 1)]
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import contextlib
+    import io
+
+    from network_builder import build_izmir_manisa_network
+
+    print("🔀 Alternatif Rota Testi\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        network = build_izmir_manisa_network(density=10)
+
+    by_name = {network.nodes[nid].name: nid for nid in network.fire_stations}
+    names = sorted(by_name)
+    start_id, end_id = by_name[names[0]], by_name[names[-1]]
+    print(f"📍 {names[0]} → {names[-1]}\n")
+
+    generator = AlternativeRouteGenerator(network)
+
+    routes = generator.k_shortest_paths(start_id, end_id, k=3)
+    print(f"Yen K-shortest ({generator.stats['execution_time'] * 1000:.1f} ms, "
+          f"{generator.stats['searches']} arama):")
+    for route in routes:
+        print(f"   {route['rank']}. {route['distance']:.1f} km, {route['estimated_time']:.1f} dk, "
+              f"esneme {route['stretch']:.2f}, paylaşım {route['share']:.0%}")
+
+    routes = generator.alternatives(start_id, end_id, count=3)
+    print(f"\nCeza yöntemi ({generator.stats['execution_time'] * 1000:.1f} ms, "
+          f"{generator.stats['searches']} arama):")
+    for route in routes:
+        print(f"   {route['rank']}. {route['distance']:.1f} km, {route['estimated_time']:.1f} dk, "
+              f"esneme {route['stretch']:.2f}, paylaşım {route['share']:.0%}")
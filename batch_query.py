@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+📦 TOPLU ROTA SORGU MOTORU 📦
+Çok sayıda (kaynak, hedef) sorgusunu süreç havuzunda paralel çalıştırır
+
+Akış:
+1. Koordinatlı sorgular ana süreçte tek seferde en yakın node'a bağlanır (NumPy)
+2. Graph worker'lara bir kez verilir:
+   - 'fork' ile modül seviyesindeki referans üzerinden miras alınır
+     (copy-on-write, kopyalama yok)
+   - 'forkserver' / 'spawn' ile geçici bir pickle dosyasına yazılır ve her
+     worker initializer'da bir kez yükler
+   'fork' yalnızca süreçte başka thread yokken seçilir: metrik sunucusu,
+   örnekleyici profiler veya aiohttp çözümleyici thread'i fork anında bir
+   kilidi tutuyorsa kilit çocukta sonsuza dek kilitli kalır
+3. Sorgular chunk'lar halinde dağıtılır (imap, sıra korunur)
+4. Worker'lar sadece kompakt sonuç döndürür (yol isteğe bağlı)
+5. Worker'lardaki @metered sayaçları ana sürece ulaşmaz; sorgu sayıları ve
+   gecikmeler dönen kompakt sonuçlardan ana süreç metriklerine işlenir
+
+workers=1 ile havuz kurulmadan aynı süreçte çalışır.
+"""
+
+import multiprocessing
+import os
+import pickle
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from advanced_pathfinding import (
+    RoadNetwork, DijkstraPathfinder, AStarPathfinder, BidirectionalAStar
+)
+from geodesy import nearest_indices
+from metrics import ROUTING_LATENCY, ROUTING_QUERIES
+
+# Batch motorunda kullanılabilen algoritmalar
+ENGINES = {
+    'dijkstra': DijkstraPathfinder,
+    'astar': AStarPathfinder,
+    'bidirectional_astar': BidirectionalAStar,
+}
+
+# stats_level parametresini destekleyen algoritmalar
+STATS_ENGINES = ('dijkstra', 'astar')
+
+START_METHODS = ('fork', 'forkserver', 'spawn')
+
+Coordinate = Tuple[float, float]
+Query = Union[Tuple[int, int], Tuple[Coordinate, Coordinate]]
+
+# Worker süreç durumu (fork ile miras alınır veya initializer'da doldurulur)
+_worker_network: Optional[RoadNetwork] = None
+_worker_state: Dict = {}
+
+
+def _init_worker(engine: str, include_paths: bool, network_path: Optional[str],
+                 stats_level: str = 'off') -> None:
+    global _worker_network
+    if network_path is not None:
+        with open(network_path, "rb") as f:
+            _worker_network = pickle.load(f)
+    options = {'stats_level': stats_level} if engine in STATS_ENGINES else {}
+    _worker_state['pathfinder'] = ENGINES[engine](_worker_network, **options)
+    _worker_state['include_paths'] = include_paths
+
+
+def default_start_method() -> str:
+    """Tek thread'li süreçte 'fork', aksi halde 'forkserver' (yoksa 'spawn')"""
+    available = multiprocessing.get_all_start_methods()
+    if 'fork' in available and threading.active_count() == 1:
+        return 'fork'
+    return 'forkserver' if 'forkserver' in available else 'spawn'
+
+
+def _record_worker_metrics(engine: str, results: List[Dict]) -> None:
+    """Worker süreçlerinde kaybolan @metered kayıtlarını ana süreçte işle"""
+    found = ROUTING_QUERIES.labels(engine, 'found')
+    not_found = ROUTING_QUERIES.labels(engine, 'not_found')
+    latency = ROUTING_LATENCY.labels(engine)
+    for result in results:
+        (found if result['found'] else not_found).inc()
+        latency.observe(result['latency_ms'] / 1000)
+
+
+def _run_query(task: Tuple[int, int, int]) -> Dict:
+    index, source, target = task
+    pathfinder = _worker_state['pathfinder']
+
+    start = time.perf_counter()
+    result = pathfinder.find_shortest_path(source, target)
+    latency_ms = (time.perf_counter() - start) * 1000
+
+    compact = {'index': index, 'source': source, 'target': target, 'latency_ms': latency_ms}
+    if result is None:
+        compact['found'] = False
+        return compact
+
+    compact.update(
+        found=True,
+        weight=result['weight'],
+        distance=result['distance'],
+        estimated_time=result['estimated_time'],
+        path_length=len(result['path']),
+        nodes_explored=result['stats'].get('nodes_explored'),  # stats_level='off' ise None
+    )
+    if _worker_state['include_paths']:
+        compact['path'] = result['path']
+    return compact
+
+
+class BatchQueryEngine:
+    """
+    Toplu sorgu motoru
+
+    Kullanım:
+        engine = BatchQueryEngine(network, engine='astar', workers=4)
+        batch = engine.run([(s1, t1), (s2, t2), ...])
+        batch = engine.run([((lat1, lon1), (lat2, lon2)), ...])
+
+    Üretimde sayaçlar kapalıdır (stats_level='off'); benchmark için 'counters'.
+    start_method verilmezse her run() çağrısında default_start_method() ile seçilir.
+    """
+
+    def __init__(self, network: RoadNetwork, engine: str = 'astar',
+                 workers: Optional[int] = None, chunksize: Optional[int] = None,
+                 include_paths: bool = False, stats_level: str = 'off',
+                 start_method: Optional[str] = None):
+        if engine not in ENGINES:
+            raise ValueError(f"Bilinmeyen algoritma: {engine} (seçenekler: {', '.join(ENGINES)})")
+        if start_method is not None and start_method not in multiprocessing.get_all_start_methods():
+            raise ValueError(f"Desteklenmeyen başlatma yöntemi: {start_method} "
+                             f"(seçenekler: {', '.join(multiprocessing.get_all_start_methods())})")
+
+        self.network = network
+        self.engine = engine
+        self.workers = workers or os.cpu_count() or 1
+        self.chunksize = chunksize
+        self.include_paths = include_paths
+        self.stats_level = stats_level
+        self.start_method = start_method
+
+        self._node_ids: Optional[np.ndarray] = None
+        self._lats: Optional[np.ndarray] = None
+        self._lons: Optional[np.ndarray] = None
+
+    def snap(self, lat: float, lon: float) -> int:
+        """Koordinata en yakın node id'si"""
+        if self._node_ids is None:
+            nodes = self.network.nodes
+            self._node_ids = np.fromiter(nodes.keys(), dtype=np.int64, count=len(nodes))
+            self._lats = np.array([node.lat for node in nodes.values()])
+            self._lons = np.array([node.lon for node in nodes.values()])
+
+        indices, _ = nearest_indices(lat, lon, self._lats, self._lons, k=1)
+        return int(self._node_ids[indices[0]])
+
+    def _resolve(self, queries: Sequence[Query]) -> List[Tuple[int, int, int]]:
+        """Sorguları (sıra, kaynak node, hedef node) görevlerine çevir"""
+        tasks = []
+        for index, (source, target) in enumerate(queries):
+            if not isinstance(source, (int, np.integer)):
+                source = self.snap(*source)
+            if not isinstance(target, (int, np.integer)):
+                target = self.snap(*target)
+            tasks.append((index, int(source), int(target)))
+        return tasks
+
+    def run(self, queries: Sequence[Query]) -> Dict:
+        """
+        Sorguları çalıştır
+
+        Returns:
+            {
+                'results': [sorgu sırasıyla kompakt sonuçlar],
+                'stats': {'queries', 'found', 'workers', 'start_method', 'total_time',
+                          'queries_per_second', 'mean_latency_ms'}
+            }
+        """
+        start = time.perf_counter()
+        tasks = self._resolve(queries)
+
+        if self.workers <= 1 or len(tasks) <= 1:
+            results = self._run_inline(tasks)
+            workers, start_method = 1, None
+        else:
+            start_method = self.start_method or default_start_method()
+            results = self._run_pool(tasks, start_method)
+            workers = self.workers
+
+        total_time = time.perf_counter() - start
+        found = sum(1 for result in results if result['found'])
+        latencies = [result['latency_ms'] for result in results]
+
+        return {
+            'results': results,
+            'stats': {
+                'queries': len(results),
+                'found': found,
+                'workers': workers,
+                'start_method': start_method,
+                'engine': self.engine,
+                'total_time': total_time,
+                'queries_per_second': len(results) / total_time if total_time > 0 else 0.0,
+                'mean_latency_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+            }
+        }
+
+    def _run_inline(self, tasks: List[Tuple[int, int, int]]) -> List[Dict]:
+        global _worker_network
+        _worker_network = self.network
+        try:
+            _init_worker(self.engine, self.include_paths, None, self.stats_level)
+            return [_run_query(task) for task in tasks]
+        finally:
+            _worker_network = None
+            _worker_state.clear()
+
+    def _run_pool(self, tasks: List[Tuple[int, int, int]], start_method: str) -> List[Dict]:
+        global _worker_network
+        chunksize = self.chunksize or max(1, len(tasks) // (self.workers * 8))
+
+        network_path = None
+        context = multiprocessing.get_context(start_method)
+        if start_method == 'fork':
+            _worker_network = self.network
+        else:
+            fd, network_path = tempfile.mkstemp(suffix=".pkl")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(self.network, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        try:
+            with context.Pool(self.workers, initializer=_init_worker,
+                              initargs=(self.engine, self.include_paths, network_path,
+                                        self.stats_level)) as pool:
+                results = list(pool.imap(_run_query, tasks, chunksize=chunksize))
+            _record_worker_metrics(self.engine, results)
+            return results
+        finally:
+            _worker_network = None
+            if network_path is not None:
+                os.remove(network_path)
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    from network_builder import build_izmir_manisa_network
+
+    print("📦 Batch Query Engine Test\n")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        network = build_izmir_manisa_network(density=20)
+    print(f"📊 Network: {network.node_count()} node")
+
+    rng = random.Random(42)
+    stations = network.fire_stations
+    queries = [tuple(rng.sample(stations, 2)) for _ in range(400)]
+
+    baseline = None
+    for workers in sorted({1, 2, os.cpu_count() or 1}):
+        batch = BatchQueryEngine(network, engine='astar', workers=workers).run(queries)
+        stats = batch['stats']
+        if baseline is None:
+            baseline = stats['queries_per_second']
+        print(f"   {workers} worker: {stats['queries_per_second']:8.1f} sorgu/sn "
+              f"({stats['queries_per_second'] / baseline:.2f}x), "
+              f"ort. {stats['mean_latency_ms']:.2f} ms [{stats['start_method'] or 'inline'}]")
+
+    # Arka planda thread varken (ör. metrik sunucusu) fork kullanılmaz
+    from metrics import serve_metrics
+    server = serve_metrics(0)
+    batch = BatchQueryEngine(network, engine='astar', workers=2).run(queries[:50])
+    server.shutdown()
+    print(f"   Thread varken: {batch['stats']['start_method']}")
+
+    # Koordinatlı sorgu
+    fire = (38.4237, 27.1428)  # İzmir Konak
+    station = network.nodes[stations[0]]
+    batch = BatchQueryEngine(network, workers=1, include_paths=True).run(
+        [((station.lat, station.lon), fire)])
+    result = batch['results'][0]
+    print(f"\n📍 Koordinat sorgusu: {result['distance']:.2f} km, {result['path_length']} node")
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+⏱️ LATENCY BENCHMARK HARNESS ⏱️
+Tekrarlanabilir gecikme ölçümü ve performans regresyon kontrolü
+
+Ölçüm kuralları:
+1. Zamanlama time.perf_counter_ns ile (monoton, ns çözünürlük)
+2. Ölçümden önce warm-up çalıştırmaları (önbellekler, lazy indeksler
+   ve CPU frekansı ısınır; sonuçlara katılmaz)
+3. Sorgu çiftleri sabit seed ile seçilir - her çalıştırma aynı iş yükü
+4. Sorgu kümesi repeat tur ölçülür; her sorgunun turlar arası minimumu
+   (veya medyanı) tek örnek olarak alınır - zamanlayıcı kesintisi, GC gibi
+   tek seferlik gürültü tek turluk ölçümde %20-30 p50 sıçramasına yol açar
+5. Rapor: p50 / p90 / p99 / max gecikme (ms) ve sorgu/sn
+
+Baseline:
+    Sonuçlar bir JSON dosyasına kaydedilir; sonraki çalıştırmalarda her
+    benchmark'ın seçili metrikleri baseline'a göre threshold oranından
+    (ve min_delta_ms'den) fazla kötüleşirse regresyon sayılır ve çalıştırma
+    başarısız olur. Baseline, iş yükü tanımıyla (ağ, sorgu sayısı, seed)
+    birlikte saklanır; farklı iş yükünün baseline'ı ile karşılaştırma
+    başarısız sayılır (allow_workload_mismatch ile açıkça atlanabilir).
+"""
+
+import json
+import os
+import platform
+import random
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Baseline karşılaştırmasında varsayılan metrikler (p99 küçük örneklemde gürültülü)
+DEFAULT_METRICS = ('p50_ms', 'p90_ms')
+DEFAULT_BASELINE = "benchmark_baseline.json"
+DEFAULT_REPEAT = 3
+AGGREGATES = ('min', 'median')
+
+
+def sample_pairs(node_ids: Sequence[int], count: int, seed: int = 42) -> List[Tuple[int, int]]:
+    """Sabit seed ile farklı (kaynak, hedef) çiftleri - tekrarsız, sıralı"""
+    node_ids = sorted(node_ids)
+    total = len(node_ids) * (len(node_ids) - 1) // 2
+    if total == 0:
+        return []
+
+    rng = random.Random(seed)
+    if total <= count * 4:
+        pairs = [(node_ids[i], node_ids[j])
+                 for i in range(len(node_ids)) for j in range(i + 1, len(node_ids))]
+        return rng.sample(pairs, min(count, total))
+
+    pairs = set()
+    while len(pairs) < count:
+        pairs.add(tuple(rng.sample(node_ids, 2)))
+    return sorted(pairs)
+
+
+def summarize_latencies(samples_ns: Sequence[int]) -> Dict:
+    """Nanosaniye örneklerinden gecikme özeti"""
+    if not samples_ns:
+        return {'count': 0}
+
+    samples_ms = np.asarray(samples_ns, dtype=np.float64) / 1e6
+    p50, p90, p99 = np.percentile(samples_ms, (50, 90, 99))
+    total_s = samples_ms.sum() / 1000
+    return {
+        'count': int(samples_ms.size),
+        'mean_ms': float(samples_ms.mean()),
+        'min_ms': float(samples_ms.min()),
+        'p50_ms': float(p50),
+        'p90_ms': float(p90),
+        'p99_ms': float(p99),
+        'max_ms': float(samples_ms.max()),
+        'qps': float(samples_ms.size / total_s) if total_s > 0 else 0.0,
+    }
+
+
+class BenchmarkHarness:
+    """
+    Gecikme benchmark'ı
+
+    Kullanım:
+        harness = BenchmarkHarness(warmup=5, repeat=3)
+        result = harness.measure('astar', astar.find_shortest_path, pairs)
+        report = harness.compare(load_baseline(path), threshold=0.15)
+    """
+
+    def __init__(self, warmup: int = 5, repeat: int = DEFAULT_REPEAT, workload: Optional[Dict] = None,
+                 aggregate: str = 'min'):
+        if aggregate not in AGGREGATES:
+            raise ValueError(f"Bilinmeyen birleştirme: {aggregate} (seçenekler: {', '.join(AGGREGATES)})")
+        self.warmup = warmup
+        self.repeat = max(1, repeat)
+        self.workload = workload or {}
+        self.aggregate = aggregate
+        self.results: Dict[str, Dict] = {}
+
+    def measure(self, name: str, func: Callable, queries: Sequence[Tuple],
+                keep_outputs: bool = False) -> Dict:
+        """
+        Her sorguyu func(*sorgu) olarak ölç
+
+        Args:
+            queries: Argüman tuple'ları (ör. (start_id, end_id))
+            keep_outputs: Son turun dönüş değerlerini 'outputs' olarak sakla
+                          (doğruluk karşılaştırması için)
+        """
+        for args in queries[:self.warmup]:
+            func(*args)
+
+        rounds = np.empty((self.repeat, len(queries)), dtype=np.int64)
+        outputs = []
+        clock = time.perf_counter_ns
+        for round_index in range(self.repeat):
+            last_round = round_index == self.repeat - 1
+            for query_index, args in enumerate(queries):
+                start = clock()
+                output = func(*args)
+                rounds[round_index, query_index] = clock() - start
+                if keep_outputs and last_round:
+                    outputs.append(output)
+
+        # Sorgu başına turlar arası tek örnek
+        if self.aggregate == 'min':
+            samples = rounds.min(axis=0)
+        else:
+            samples = np.median(rounds, axis=0)
+        result = {'name': name, 'warmup': min(self.warmup, len(queries)), 'rounds': self.repeat,
+                  'aggregate': self.aggregate, **summarize_latencies(samples.tolist())}
+        self.results[name] = result
+        if keep_outputs:
+            return {**result, 'outputs': outputs}
+        return result
+
+    def compare(self, baseline: Optional[Dict], threshold: float = 0.15,
+                metrics: Sequence[str] = DEFAULT_METRICS, min_delta_ms: float = 0.05,
+                allow_workload_mismatch: bool = False) -> Dict:
+        """
+        Sonuçları baseline ile karşılaştır
+
+        Bir metrik, (güncel - baseline) / baseline > threshold VE fark
+        min_delta_ms'den büyükse regresyondur (mikrosaniye gürültüsü elenir).
+        İş yükü (ağ, sorgu sayısı, seed, tur/birleştirme) baseline'dan farklıysa
+        karşılaştırma yapılamaz ve sonuç başarısızdır; allow_workload_mismatch
+        ile kontrol bilerek atlanabilir.
+
+        Returns:
+            {'passed', 'regressions': [...], 'improvements': [...], 'missing': [...],
+             'workload_mismatch'}
+        """
+        report = {'passed': True, 'regressions': [], 'improvements': [], 'missing': [],
+                  'workload_mismatch': False}
+        if not baseline:
+            return report
+        if baseline.get('meta', {}).get('workload', {}) != self.workload:
+            report['workload_mismatch'] = True
+            report['passed'] = allow_workload_mismatch
+            return report
+
+        recorded = baseline.get('benchmarks', {})
+        for name, result in self.results.items():
+            if name not in recorded:
+                report['missing'].append(name)
+                continue
+
+            for metric in metrics:
+                old, new = recorded[name].get(metric), result.get(metric)
+                if not old or new is None:
+                    continue
+                change = (new - old) / old
+                entry = {'name': name, 'metric': metric, 'baseline': old, 'current': new, 'change': change}
+                if change > threshold and new - old > min_delta_ms:
+                    report['regressions'].append(entry)
+                elif change < -threshold:
+                    report['improvements'].append(entry)
+
+        report['passed'] = not report['regressions']
+        return report
+
+    def to_baseline(self) -> Dict:
+        """Baseline dosyası içeriği (ölçüm ortamı bilgisiyle)"""
+        return {
+            'meta': {
+                'created': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'python': platform.python_version(),
+                'machine': platform.machine(),
+                'processor': platform.processor(),
+                'cpu_count': os.cpu_count(),
+                'workload': self.workload,
+            },
+            'benchmarks': {name: {key: value for key, value in result.items() if key != 'name'}
+                           for name, result in self.results.items()}
+        }
+
+    def print_table(self) -> None:
+        print(f"{'Benchmark':<28} {'p50 (ms)':>10} {'p90 (ms)':>10} {'p99 (ms)':>10} "
+              f"{'max (ms)':>10} {'sorgu/sn':>10}")
+        print("-" * 82)
+        for name, result in self.results.items():
+            if not result.get('count'):
+                continue
+            print(f"{name:<28} {result['p50_ms']:>10.3f} {result['p90_ms']:>10.3f} "
+                  f"{result['p99_ms']:>10.3f} {result['max_ms']:>10.3f} {result['qps']:>10.1f}")
+
+
+def load_baseline(path: str) -> Optional[Dict]:
+    """Baseline dosyasını oku (yoksa None)"""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, harness: BenchmarkHarness) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(harness.to_baseline(), f, ensure_ascii=False, indent=2)
+
+
+def print_comparison(report: Dict, threshold: float) -> None:
+    """Baseline karşılaştırma sonucunu yazdır"""
+    if report['workload_mismatch']:
+        if report['passed']:
+            print("   ⚠️  Baseline farklı bir iş yükü ile kaydedilmiş - karşılaştırma atlandı")
+        else:
+            print("   ❌ Baseline farklı bir iş yükü ile kaydedilmiş - karşılaştırılamaz "
+                  "(--allow-workload-mismatch ile atlanabilir)")
+        return
+
+    for entry in report['improvements']:
+        print(f"   🚀 {entry['name']} {entry['metric']}: {entry['baseline']:.3f} → "
+              f"{entry['current']:.3f} ms ({entry['change']:+.0%})")
+    for entry in report['regressions']:
+        print(f"   ❌ {entry['name']} {entry['metric']}: {entry['baseline']:.3f} → "
+              f"{entry['current']:.3f} ms ({entry['change']:+.0%})")
+    for name in report['missing']:
+        print(f"   ⚠️  {name}: baseline'da yok")
+
+    if report['passed']:
+        print(f"   ✅ Regresyon yok (eşik %{threshold * 100:.0f})")
+    else:
+        print(f"   ❌ {len(report['regressions'])} regresyon (eşik %{threshold * 100:.0f})")
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    from advanced_pathfinding import DijkstraPathfinder, AStarPathfinder
+    from synthetic_network import generate_synthetic_network
+
+    print("⏱️ Benchmark Harness Testi\n")
+
+    network = generate_synthetic_network(20_000, seed=1)
+    pairs = sample_pairs(list(network.nodes), 50, seed=1)
+    assert pairs == sample_pairs(list(network.nodes), 50, seed=1)
+    print(f"📊 {network.node_count()} node, {len(pairs)} sabit seed'li sorgu\n")
+
+    harness = BenchmarkHarness(warmup=3, repeat=3)
+    harness.measure('dijkstra', DijkstraPathfinder(network).find_shortest_path, pairs)
+    harness.measure('astar', AStarPathfinder(network).find_shortest_path, pairs)
+    harness.print_table()
+
+    # Yapay olarak yarı hızda bir baseline ile karşılaştır -> regresyon beklenir
+    baseline = harness.to_baseline()
+    for result in baseline['benchmarks'].values():
+        result['p50_ms'] /= 2
+    report = harness.compare(baseline, threshold=0.15)
+    print()
+    print_comparison(report, 0.15)
+    assert not report['passed']
+    print("\n✅ Yapay regresyon yakalandı")
@@ -0,0 +1,541 @@
+#!/usr/bin/env python3
+"""
+🗜️ KOMPAKT YOL AĞI 🗜️
+RoadNetwork'ün dizi tabanlı (struct-of-arrays) bellek dostu sürümü
+
+RoadNetwork her node için bir Node, her çift yönlü yol için iki tam Edge
+nesnesi (her biri __dict__'li) tutar; milyon edge'lik bir graph gigabaytlar
+eder. CompactRoadNetwork aynı bilgiyi paralel tipli dizilerde saklar:
+
+    Node'lar : lat, lon (float64)              -> 16 byte/node
+               isimler sadece isimli node'lar için (sözlük)
+    Yollar   : from, to (int32), distance, weight (float64),
+               road_type (uint8, ROAD_TYPES indeksi), bidirectional (uint8)
+                                               -> 26 byte/yol (çift yönlü yol BİR kez)
+    Komşuluk : half-edge CSR (ilk kullanımda kurulur)
+               indptr (int64/node), hedef + yol indeksi (int32/half-edge;
+               ters yön ~yol olarak kodlanır)
+
+estimated_time ve max_speed saklanmaz; RoadType'tan hesaplanır.
+
+Mevcut kodla uyumluluk: network.nodes[id] ve network.edges[id] hafif,
+__slots__'lu NodeView / EdgeView nesneleri döndürür; get_neighbors,
+get_incoming, get_edge vb. RoadNetwork ile aynı sonucu verir. Node id'leri
+korunur (boşluklu id'ler NaN koordinatla işaretlenir).
+"""
+
+from array import array
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from advanced_pathfinding import RoadNetwork, RoadType, Node, Edge
+from geodesy import haversine, to_radians
+
+# uint8 road_type kodu -> RoadType
+ROAD_TYPES: List[RoadType] = list(RoadType)
+ROAD_TYPE_INDEX: Dict[RoadType, int] = {road_type: index for index, road_type in enumerate(ROAD_TYPES)}
+
+
+class NodeView:
+    """Node ile aynı alanlara sahip salt okunur görünüm"""
+
+    __slots__ = ('id', 'lat', 'lon', 'name', 'is_fire_station')
+
+    def __init__(self, node_id: int, lat: float, lon: float, name: str, is_fire_station: bool):
+        self.id = node_id
+        self.lat = lat
+        self.lon = lon
+        self.name = name
+        self.is_fire_station = is_fire_station
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __eq__(self, other):
+        return self.id == other.id
+
+    def __repr__(self):
+        return f"NodeView(id={self.id}, lat={self.lat}, lon={self.lon}, name={self.name!r})"
+
+
+class EdgeView:
+    """Edge ile aynı alanlara sahip salt okunur görünüm"""
+
+    __slots__ = ('from_node', 'to_node', 'distance', 'road_type', 'weight',
+                 'max_speed', 'estimated_time', 'bidirectional', 'road_index')
+
+    def __init__(self, from_node: int, to_node: int, distance: float, road_type: RoadType,
+                 weight: float, bidirectional: bool, road_index: int):
+        self.from_node = from_node
+        self.to_node = to_node
+        self.distance = distance
+        self.road_type = road_type
+        self.weight = weight
+        self.max_speed = road_type.max_speed
+        self.estimated_time = (distance / road_type.max_speed) * 60  # dakika
+        self.bidirectional = bidirectional
+        self.road_index = road_index
+
+    def __repr__(self):
+        return (f"EdgeView({self.from_node}->{self.to_node}, {self.distance:.3f} km, "
+                f"{self.road_type.code}, w={self.weight:.3f})")
+
+
+class _NodeMap:
+    """network.nodes uyumluluk katmanı: id -> NodeView"""
+
+    __slots__ = ('_network',)
+
+    def __init__(self, network: 'CompactRoadNetwork'):
+        self._network = network
+
+    def __getitem__(self, node_id: int) -> NodeView:
+        network = self._network
+        if not network._has_node(node_id):
+            raise KeyError(node_id)
+        return NodeView(node_id, network._lat[node_id], network._lon[node_id],
+                        network._names.get(node_id, ""), node_id in network._station_set)
+
+    def get(self, node_id: int, default=None):
+        return self[node_id] if self._network._has_node(node_id) else default
+
+    def __contains__(self, node_id) -> bool:
+        return self._network._has_node(node_id)
+
+    def __len__(self) -> int:
+        return self._network._node_total
+
+    def __iter__(self) -> Iterator[int]:
+        lat = self._network._lat
+        return (node_id for node_id in range(len(lat)) if lat[node_id] == lat[node_id])
+
+    def keys(self) -> Iterator[int]:
+        return iter(self)
+
+    def values(self) -> Iterator[NodeView]:
+        return (self[node_id] for node_id in self)
+
+    def items(self) -> Iterator[Tuple[int, NodeView]]:
+        return ((node_id, self[node_id]) for node_id in self)
+
+
+class _EdgeMap:
+    """network.edges uyumluluk katmanı: node id -> [EdgeView] (RoadNetwork ile aynı sıra)"""
+
+    __slots__ = ('_network',)
+
+    def __init__(self, network: 'CompactRoadNetwork'):
+        self._network = network
+
+    def __getitem__(self, node_id: int) -> List[EdgeView]:
+        return self._network._outgoing_views(node_id)
+
+    def get(self, node_id: int, default=None):
+        views = self._network._outgoing_views(node_id)
+        return views if views else default
+
+    def __contains__(self, node_id) -> bool:
+        return bool(self._network._outgoing_views(node_id))
+
+    def __len__(self) -> int:
+        indptr = self._network._adjacency()[0]
+        return int(np.count_nonzero(np.diff(indptr)))
+
+    def __iter__(self) -> Iterator[int]:
+        indptr = self._network._adjacency()[0]
+        return iter(np.flatnonzero(np.diff(indptr)).tolist())
+
+    def keys(self) -> Iterator[int]:
+        return iter(self)
+
+    def values(self) -> Iterator[List[EdgeView]]:
+        return (self[node_id] for node_id in self)
+
+    def items(self) -> Iterator[Tuple[int, List[EdgeView]]]:
+        return ((node_id, self[node_id]) for node_id in self)
+
+
+class CompactRoadNetwork(RoadNetwork):
+    """
+    Dizi tabanlı RoadNetwork
+
+    RoadNetwork.__init__ çağrılmaz (sözlük tabanlı depolama oluşturmamak için);
+    tüm RoadNetwork API'si dizilere göre yeniden tanımlanır.
+    """
+
+    def __init__(self):
+        self._lat = array('d')
+        self._lon = array('d')
+        self._names: Dict[int, str] = {}
+        self._node_total = 0
+        self.fire_stations: List[int] = []
+        self._station_set = set()
+
+        self._road_from = array('i')
+        self._road_to = array('i')
+        self._road_distance = array('d')
+        self._road_weight = array('d')
+        self._road_type = array('B')
+        self._road_bidirectional = array('B')
+
+        self._csr = None
+        self._reverse_csr = None
+
+    # Serileştirme: türetilmiş CSR yapıları saklanmaz
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state['_csr'] = None
+        state['_reverse_csr'] = None
+        return state
+
+    # RoadNetwork uyumlu öznitelikler
+
+    @property
+    def nodes(self) -> _NodeMap:
+        return _NodeMap(self)
+
+    @property
+    def edges(self) -> _EdgeMap:
+        return _EdgeMap(self)
+
+    @property
+    def node_counter(self) -> int:
+        return len(self._lat)
+
+    def _has_node(self, node_id) -> bool:
+        lat = self._lat
+        return 0 <= node_id < len(lat) and lat[node_id] == lat[node_id]  # NaN: boşluk
+
+    # Oluşturma
+
+    def add_node(self, lat: float, lon: float, name: str = "",
+                 is_fire_station: bool = False) -> int:
+        """Yeni node ekle"""
+        node_id = len(self._lat)
+        self._lat.append(lat)
+        self._lon.append(lon)
+        self._node_total += 1
+        if name:
+            self._names[node_id] = name
+        if is_fire_station:
+            self.fire_stations.append(node_id)
+            self._station_set.add(node_id)
+        return node_id
+
+    def add_nodes_bulk(self, lats: List[float], lons: List[float]) -> range:
+        """Çok sayıda isimsiz node'u tek seferde ekle"""
+        start_id = len(self._lat)
+        self._lat.extend(lats)
+        self._lon.extend(lons)
+        self._node_total += len(self._lat) - start_id
+        return range(start_id, len(self._lat))
+
+    def _add_road(self, from_id: int, to_id: int, distance: float, road_type: RoadType,
+                  weight: float, bidirectional: bool) -> None:
+        self._road_from.append(from_id)
+        self._road_to.append(to_id)
+        self._road_distance.append(distance)
+        self._road_weight.append(weight)
+        self._road_type.append(ROAD_TYPE_INDEX[road_type])
+        self._road_bidirectional.append(1 if bidirectional else 0)
+        self._csr = None
+        self._reverse_csr = None
+
+    def add_edge(self, from_id: int, to_id: int, road_type: RoadType,
+                 bidirectional: bool = True, dynamic_factors: Optional[Dict] = None):
+        """Yeni yol ekle (çift yönlü yol tek kayıt olarak saklanır)"""
+        if not self._has_node(from_id) or not self._has_node(to_id):
+            raise ValueError("Node bulunamadı!")
+
+        distance = haversine(self._lat[from_id], self._lon[from_id], self._lat[to_id], self._lon[to_id])
+        weight = Edge.calculate_weight(None, distance, road_type, dynamic_factors)
+        self._add_road(from_id, to_id, distance, road_type, weight, bidirectional)
+
+    # Dönüşüm
+
+    @classmethod
+    def from_network(cls, network: RoadNetwork) -> 'CompactRoadNetwork':
+        """
+        Sözlük tabanlı RoadNetwork'ten kompakt ağ
+
+        Çift yönlü yolların ters kopyaları (bidirectional=False, eşleşen ileri
+        edge'i olan) tek yol kaydında birleştirilir.
+        """
+        compact = cls()
+        size = max(network.nodes) + 1 if network.nodes else 0
+        compact._lat = array('d', [float('nan')]) * size
+        compact._lon = array('d', [float('nan')]) * size
+        for node_id, node in network.nodes.items():
+            compact._lat[node_id] = node.lat
+            compact._lon[node_id] = node.lon
+            if node.name:
+                compact._names[node_id] = node.name
+        compact._node_total = len(network.nodes)
+        compact.fire_stations = list(network.fire_stations)
+        compact._station_set = set(network.fire_stations)
+
+        twins = Counter()
+        for edges in network.edges.values():
+            for edge in edges:
+                if edge.bidirectional:
+                    twins[(edge.to_node, edge.from_node, edge.road_type, edge.weight)] += 1
+
+        for edges in network.edges.values():
+            for edge in edges:
+                key = (edge.from_node, edge.to_node, edge.road_type, edge.weight)
+                if not edge.bidirectional and twins[key] > 0:
+                    twins[key] -= 1
+                    continue
+                compact._add_road(edge.from_node, edge.to_node, edge.distance,
+                                  edge.road_type, edge.weight, edge.bidirectional)
+
+        return compact
+
+    @classmethod
+    def from_arrays(cls, lats, lons, road_from, road_to, distances, weights, road_types,
+                    bidirectional, names: Optional[Dict[int, str]] = None,
+                    fire_stations: Optional[List[int]] = None) -> 'CompactRoadNetwork':
+        """
+        Hazır dizilerden kompakt ağ (node id = dizi indeksi)
+
+        road_types ROAD_TYPES indeksleridir (uint8). Sentetik / toplu üretilen
+        ağlar için: Python nesnesi oluşturmadan doğrudan dizilere kopyalanır.
+        """
+        compact = cls()
+        compact._lat = array('d', np.ascontiguousarray(lats, dtype=np.float64).tobytes())
+        compact._lon = array('d', np.ascontiguousarray(lons, dtype=np.float64).tobytes())
+        compact._node_total = len(compact._lat)
+        compact._names = dict(names or {})
+        compact.fire_stations = list(fire_stations or [])
+        compact._station_set = set(compact.fire_stations)
+
+        compact._road_from = array('i', np.ascontiguousarray(road_from, dtype=np.int32).tobytes())
+        compact._road_to = array('i', np.ascontiguousarray(road_to, dtype=np.int32).tobytes())
+        compact._road_distance = array('d', np.ascontiguousarray(distances, dtype=np.float64).tobytes())
+        compact._road_weight = array('d', np.ascontiguousarray(weights, dtype=np.float64).tobytes())
+        compact._road_type = array('B', np.ascontiguousarray(road_types, dtype=np.uint8).tobytes())
+        compact._road_bidirectional = array('B', np.ascontiguousarray(bidirectional, dtype=np.uint8).tobytes())
+        return compact
+
+    def to_network(self) -> RoadNetwork:
+        """Sözlük tabanlı RoadNetwork'e geri dönüştür (aynı node id'leri)"""
+        network = RoadNetwork()
+        for node_id, view in self.nodes.items():
+            network.nodes[node_id] = Node(node_id, view.lat, view.lon, view.name, view.is_fire_station)
+        network.fire_stations = list(self.fire_stations)
+        network.node_counter = self.node_counter
+
+        for index in range(len(self._road_from)):
+            from_id, to_id = self._road_from[index], self._road_to[index]
+            road_type = ROAD_TYPES[self._road_type[index]]
+            distance, weight = self._road_distance[index], self._road_weight[index]
+            estimated_time = (distance / road_type.max_speed) * 60
+            bidirectional = bool(self._road_bidirectional[index])
+
+            network.edges[from_id].append(Edge(from_id, to_id, distance, road_type, weight,
+                                               road_type.max_speed, estimated_time, bidirectional))
+            if bidirectional:
+                network.edges[to_id].append(Edge(to_id, from_id, distance, road_type, weight,
+                                                 road_type.max_speed, estimated_time, False))
+        return network
+
+    # Half-edge CSR
+
+    def _half_edges(self):
+        """(kaynak, hedef, kodlanmış yol indeksi) - yol sırasıyla, ileri yön önce"""
+        road_count = len(self._road_from)
+        sources = np.frombuffer(self._road_from, dtype=np.int32) if road_count else np.zeros(0, np.int32)
+        targets = np.frombuffer(self._road_to, dtype=np.int32) if road_count else np.zeros(0, np.int32)
+        bidirectional = np.frombuffer(self._road_bidirectional, dtype=np.uint8).astype(bool) \
+            if road_count else np.zeros(0, bool)
+        roads = np.arange(road_count, dtype=np.int32)
+
+        # Her yol için [ileri, (varsa) ters] half-edge'leri, yol sırasını koruyarak sırala
+        back = np.flatnonzero(bidirectional)
+        all_sources = np.concatenate((sources, targets[back]))
+        all_targets = np.concatenate((targets, sources[back]))
+        all_codes = np.concatenate((roads, ~roads[back]))
+        order_key = np.concatenate((roads * 2, back * 2 + 1))
+        order = np.argsort(order_key, kind='stable')
+        return all_sources[order], all_targets[order], all_codes[order]
+
+    @staticmethod
+    def _build_csr(size: int, sources, targets, codes):
+        order = np.argsort(sources, kind='stable')
+        indptr = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=size), out=indptr[1:])
+        return indptr, targets[order].astype(np.int32), codes[order].astype(np.int32)
+
+    def _adjacency(self):
+        """Çıkan half-edge CSR: (indptr, hedefler, kodlar)"""
+        if self._csr is None:
+            sources, targets, codes = self._half_edges()
+            self._csr = self._build_csr(len(self._lat), sources, targets, codes)
+        return self._csr
+
+    def _reverse_adjacency(self):
+        """Gelen half-edge CSR: (indptr, kaynaklar, kodlar)"""
+        if self._reverse_csr is None:
+            sources, targets, codes = self._half_edges()
+            self._reverse_csr = self._build_csr(len(self._lat), targets, sources, codes)
+        return self._reverse_csr
+
+    def _view(self, from_id: int, to_id: int, code: int) -> EdgeView:
+        road = code if code >= 0 else ~code
+        return EdgeView(from_id, to_id, self._road_distance[road], ROAD_TYPES[self._road_type[road]],
+                        self._road_weight[road],
+                        code >= 0 and self._road_bidirectional[road] == 1, road)
+
+    def _outgoing_views(self, node_id: int) -> List[EdgeView]:
+        indptr, targets, codes = self._adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        return [self._view(node_id, target, code)
+                for target, code in zip(targets[start:end].tolist(), codes[start:end].tolist())]
+
+    # RoadNetwork API
+
+    def radian_coords(self, node_id: int) -> Tuple[float, float, float]:
+        """(lat_rad, lon_rad, cos(lat)) - önbelleksiz (bellek tasarrufu için)"""
+        return to_radians(self._lat[node_id], self._lon[node_id])
+
+    def get_neighbors(self, node_id: int) -> List[Tuple[int, float]]:
+        indptr, targets, codes = self._adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        if start == end:
+            return []
+        weights = self._road_weight
+        return [(target, weights[code if code >= 0 else ~code])
+                for target, code in zip(targets[start:end].tolist(), codes[start:end].tolist())]
+
+    def get_neighbor_edges(self, node_id: int) -> List[Tuple[int, float, int]]:
+        """[(komşu, ağırlık, ref)] - ref kodlanmış yol indeksidir (view oluşturulmaz)"""
+        indptr, targets, codes = self._adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        if start == end:
+            return []
+        weights = self._road_weight
+        return [(target, weights[code if code >= 0 else ~code], code)
+                for target, code in zip(targets[start:end].tolist(), codes[start:end].tolist())]
+
+    def get_incoming_refs(self, node_id: int) -> List[Tuple[int, float, int]]:
+        indptr, sources, codes = self._reverse_adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        weights = self._road_weight
+        return [(source, weights[code if code >= 0 else ~code], code)
+                for source, code in zip(sources[start:end].tolist(), codes[start:end].tolist())]
+
+    def resolve_edge(self, ref: int) -> EdgeView:
+        """Kodlanmış yol indeksinden EdgeView (ters yön: ~yol)"""
+        if ref >= 0:
+            return self._view(self._road_from[ref], self._road_to[ref], ref)
+        road = ~ref
+        return self._view(self._road_to[road], self._road_from[road], ref)
+
+    def get_incoming(self, node_id: int) -> List[Tuple[int, float]]:
+        indptr, sources, codes = self._reverse_adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        weights = self._road_weight
+        return [(source, weights[code if code >= 0 else ~code])
+                for source, code in zip(sources[start:end].tolist(), codes[start:end].tolist())]
+
+    def get_incoming_edges(self, node_id: int) -> List[EdgeView]:
+        indptr, sources, codes = self._reverse_adjacency()
+        if not 0 <= node_id < len(indptr) - 1:
+            return []
+        start, end = indptr[node_id], indptr[node_id + 1]
+        return [self._view(source, node_id, code)
+                for source, code in zip(sources[start:end].tolist(), codes[start:end].tolist())]
+
+    def invalidate_caches(self) -> None:
+        self._csr = None
+        self._reverse_csr = None
+
+    def get_edge(self, from_id: int, to_id: int) -> Optional[EdgeView]:
+        """
+        İki node arası en düşük ağırlıklı edge
+
+        Ayrı bir (u, v) sözlüğü tutulmaz (edge başına ~100 byte olurdu); CSR
+        satırı taranır, yol ağlarında derece küçük olduğundan pratikte O(1)'dir.
+        """
+        best_code = None
+        best_weight = float('inf')
+        for target, weight, code in self.get_neighbor_edges(from_id):
+            if target == to_id and weight < best_weight:
+                best_code, best_weight = code, weight
+        return self.resolve_edge(best_code) if best_code is not None else None
+
+    def node_count(self) -> int:
+        return self._node_total
+
+    def edge_count(self) -> int:
+        return len(self._road_from) + sum(self._road_bidirectional)
+
+    def road_count(self) -> int:
+        """Fiziksel yol sayısı (çift yönlü yollar bir kez)"""
+        return len(self._road_from)
+
+    def induced_subgraph(self, node_ids) -> RoadNetwork:
+        """Alt ağ (sözlük tabanlı RoadNetwork olarak; node id'leri korunur)"""
+        return RoadNetwork.induced_subgraph(self, node_ids)
+
+    def nbytes(self) -> Dict[str, int]:
+        """Depolama boyutları (byte)"""
+        node_bytes = sum(a.itemsize * len(a) for a in (self._lat, self._lon))
+        road_bytes = sum(a.itemsize * len(a) for a in (
+            self._road_from, self._road_to, self._road_distance, self._road_weight,
+            self._road_type, self._road_bidirectional))
+        csr_bytes = sum(part.nbytes for csr in (self._csr, self._reverse_csr) if csr for part in csr)
+        return {'nodes': node_bytes, 'roads': road_bytes, 'adjacency': csr_bytes,
+                'total': node_bytes + road_bytes + csr_bytes}
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import tracemalloc
+
+    from advanced_pathfinding import DijkstraPathfinder, AStarPathfinder
+    from network_builder import build_izmir_manisa_network
+
+    print("🗜️ Kompakt Yol Ağı Testi\n")
+
+    tracemalloc.start()
+    with contextlib.redirect_stdout(io.StringIO()):
+        network = build_izmir_manisa_network(density=100, use_cache=False)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+
+    compact = CompactRoadNetwork.from_network(network)
+    compact._adjacency()
+    compact_bytes = compact.nbytes()['total']
+    tracemalloc.stop()
+
+    edges = network.edge_count()
+    print(f"📊 {network.node_count()} node, {edges} edge ({compact.road_count()} fiziksel yol)")
+    print(f"   RoadNetwork (sözlük) : {dict_bytes / 1e6:8.2f} MB  ({dict_bytes / edges:6.0f} byte/edge)")
+    print(f"   CompactRoadNetwork   : {compact_bytes / 1e6:8.2f} MB  ({compact_bytes / edges:6.0f} byte/edge)")
+    print(f"   1M edge tahmini      : {dict_bytes / edges:8.0f} MB -> {compact_bytes / edges:.0f} MB")
+
+    rng = random.Random(1)
+    for _ in range(20):
+        start_id, end_id = rng.sample(network.fire_stations, 2)
+        for pathfinder in (DijkstraPathfinder, AStarPathfinder):
+            expected = pathfinder(network).find_shortest_path(start_id, end_id)
+            actual = pathfinder(compact).find_shortest_path(start_id, end_id)
+            assert abs(expected['weight'] - actual['weight']) < 1e-9
+            assert abs(expected['distance'] - actual['distance']) < 1e-9
+    print("\n✅ Dijkstra ve A* sonuçları sözlük tabanlı ağ ile aynı")
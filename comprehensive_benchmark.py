@@ -4,21 +4,43 @@
 Koordinat doğrulama, algoritma performansı, sistem sağlığı testleri
 """
 
+import argparse
 import json
-import time
-from typing import Dict, List, Tuple
+import sys
+from typing import Dict, List, Optional, Tuple
 from network_builder import build_izmir_manisa_network
 from advanced_pathfinding import (
     RoadNetwork, DijkstraPathfinder, AStarPathfinder, 
     BidirectionalDijkstra
 )
+from benchmark_harness import (
+    AGGREGATES, BenchmarkHarness, DEFAULT_BASELINE, DEFAULT_REPEAT, load_baseline,
+    save_baseline, print_comparison, sample_pairs
+)
+from differential_testing import check_result, reference_distances
 from fire_stations import load_fire_stations
-import random
+from memory_benchmark import MemoryBenchmark, print_memory_report
+from profiling import add_profile_arguments, profile_from_args
+from synthetic_network import generate_synthetic_network
 
 class ComprehensiveBenchmark:
     """Kapsamlı benchmark test sistemi"""
     
-    def __init__(self):
+    def __init__(self, query_count: int = 30, seed: int = 42, warmup: int = 5, repeat: int = DEFAULT_REPEAT,
+                 baseline_path: Optional[str] = None, threshold: float = 0.15,
+                 save_new_baseline: bool = False, synthetic_nodes: Optional[int] = None,
+                 memory: bool = False, aggregate: str = 'min', allow_workload_mismatch: bool = False):
+        self.query_count = query_count
+        self.seed = seed
+        self.warmup = warmup
+        self.repeat = repeat
+        self.aggregate = aggregate
+        self.allow_workload_mismatch = allow_workload_mismatch
+        self.baseline_path = baseline_path
+        self.threshold = threshold
+        self.save_new_baseline = save_new_baseline
+        self.synthetic_nodes = synthetic_nodes
+        self.memory = memory
         self.results = {
             'coordinate_validation': {},
             'algorithm_performance': {},
@@ -52,6 +74,13 @@ class ComprehensiveBenchmark:
         print("-" * 80)
         health_results = self.test_system_health()
         
+        # 5. Bellek profili (isteğe bağlı, tracemalloc nedeniyle yavaş)
+        memory_results = {}
+        if self.memory:
+            print("\n5️⃣  BELLEK PROFİLİ")
+            print("-" * 80)
+            memory_results = self.test_memory_profile()
+        
         # Özet
         summary = self.generate_summary(coord_results, network_results, algo_results, health_results)
         
@@ -62,6 +91,8 @@ class ComprehensiveBenchmark:
             'system_health': health_results,
             'summary': summary
         }
+        if self.memory:
+            self.results['memory_profile'] = memory_results
         
         return self.results
     
@@ -199,99 +230,88 @@ class ComprehensiveBenchmark:
         
         return results
     
+    def _benchmark_network(self) -> Tuple[RoadNetwork, str]:
+        """Performans testi ağı: sentetik (synthetic_nodes verilmişse) veya İzmir-Manisa"""
+        if self.synthetic_nodes:
+            network = generate_synthetic_network(self.synthetic_nodes, seed=self.seed)
+            return network, f"synthetic:{self.synthetic_nodes}"
+        return build_izmir_manisa_network(), "izmir_manisa"
+    
     def test_algorithm_performance(self) -> Dict:
-        """Algoritma performans testleri"""
+        """Algoritma performans testleri (warm-up, sabit seed, yüzdelikler, baseline)"""
         print("⚡ Algoritma performans testleri yapılıyor...")
         
-        network = build_izmir_manisa_network()
-        fire_stations = network.fire_stations
+        network, network_name = self._benchmark_network()
+        # Sentetik ağda istasyon az: sorgular tüm node'lar arasından seçilir
+        endpoints = list(network.nodes) if self.synthetic_nodes else network.fire_stations
         
-        if len(fire_stations) < 2:
+        if len(endpoints) < 2:
             print("   ⚠️  Yeterli istasyon yok!")
             return {}
         
-        # Test rotaları
-        test_count = min(30, len(fire_stations) * (len(fire_stations) - 1) // 2)
-        test_pairs = random.sample(
-            [(fire_stations[i], fire_stations[j]) 
-             for i in range(len(fire_stations)) 
-             for j in range(i+1, len(fire_stations))],
-            min(test_count, len(fire_stations) * (len(fire_stations) - 1) // 2)
-        )
-        
-        results = {
-            'dijkstra': {'times': [], 'nodes': [], 'distances': []},
-            'astar': {'times': [], 'nodes': [], 'distances': []},
-            'bidirectional': {'times': [], 'nodes': [], 'distances': []},
-            'correctness': {'passed': 0, 'failed': 0}
+        # Test rotaları - sabit seed ile her çalıştırmada aynı iş yükü
+        test_pairs = sample_pairs(endpoints, self.query_count, self.seed)
+        # Tur sayısı ve birleştirme de iş yüküne dahil: min-of-3 ile tek tur karşılaştırılamaz
+        workload = {'network': network_name, 'queries': len(test_pairs), 'seed': self.seed,
+                    'repeat': self.repeat, 'aggregate': self.aggregate}
+        harness = BenchmarkHarness(warmup=self.warmup, repeat=self.repeat, workload=workload,
+                                   aggregate=self.aggregate)
+        
+        algorithms = {
+            'dijkstra': DijkstraPathfinder(network),
+            'astar': AStarPathfinder(network),
+            'bidirectional': BidirectionalDijkstra(network)
         }
         
-        print(f"   🔍 {len(test_pairs)} rota test ediliyor...")
+        print(f"   🔍 {len(test_pairs)} rota test ediliyor "
+              f"({network_name}, {network.node_count()} node, seed={self.seed}, warm-up={self.warmup})...")
         
-        for start_id, end_id in test_pairs:
-            # Dijkstra
-            dijkstra = DijkstraPathfinder(network)
-            start_time = time.time()
-            result_d = dijkstra.find_shortest_path(start_id, end_id)
-            dijkstra_time = time.time() - start_time
-            
-            if result_d:
-                results['dijkstra']['times'].append(dijkstra_time * 1000)  # ms
-                results['dijkstra']['nodes'].append(result_d['stats']['nodes_explored'])
-                results['dijkstra']['distances'].append(result_d['distance'])
-            
-            # A*
-            astar = AStarPathfinder(network)
-            start_time = time.time()
-            result_a = astar.find_shortest_path(start_id, end_id)
-            astar_time = time.time() - start_time
-            
-            if result_a:
-                results['astar']['times'].append(astar_time * 1000)  # ms
-                results['astar']['nodes'].append(result_a['stats']['nodes_explored'])
-                results['astar']['distances'].append(result_a['distance'])
-            
-            # Bidirectional
-            bidirectional = BidirectionalDijkstra(network)
-            start_time = time.time()
-            result_b = bidirectional.find_shortest_path(start_id, end_id)
-            bidirectional_time = time.time() - start_time
+        outputs = {}
+        for algo, pathfinder in algorithms.items():
+            outputs[algo] = harness.measure(algo, pathfinder.find_shortest_path, test_pairs,
+                                            keep_outputs=True)['outputs']
+        
+        results = {'correctness': {'passed': 0, 'failed': 0}}
+        
+        # Doğruluk kontrolü - referans Dijkstra'ya göre ağırlık ve yol geçerliliği
+        results['correctness']['issues'] = []
+        oracle = {}
+        for index, (start_id, end_id) in enumerate(test_pairs):
+            if start_id not in oracle:
+                oracle[start_id] = reference_distances(network, start_id)
+            dist, hops = oracle[start_id]
             
-            if result_b:
-                results['bidirectional']['times'].append(bidirectional_time * 1000)  # ms
-                results['bidirectional']['nodes'].append(result_b['stats']['nodes_explored'])
-                results['bidirectional']['distances'].append(result_b['distance'])
+            issues = []
+            for algo in algorithms:
+                message = check_result(network, start_id, end_id, outputs[algo][index],
+                                       dist.get(end_id), hops.get(end_id, 0), quantum=0.0)
+                if message:
+                    issues.append({'algorithm': algo, 'source': start_id, 'target': end_id,
+                                   'message': message})
             
-            # Doğruluk kontrolü
-            if result_d and result_a and result_b:
-                dist_d = result_d['distance']
-                dist_a = result_a['distance']
-                dist_b = result_b['distance']
-                
-                if abs(dist_d - dist_a) < 0.01 and abs(dist_d - dist_b) < 0.01:
-                    results['correctness']['passed'] += 1
-                else:
-                    results['correctness']['failed'] += 1
+            if issues:
+                results['correctness']['failed'] += 1
+                results['correctness']['issues'].extend(issues)
+            else:
+                results['correctness']['passed'] += 1
         
         # İstatistikler
         stats = {}
-        for algo in ['dijkstra', 'astar', 'bidirectional']:
-            if results[algo]['times']:
+        for algo in algorithms:
+            found = [result for result in outputs[algo] if result]
+            if found:
                 stats[algo] = {
-                    'avg_time_ms': sum(results[algo]['times']) / len(results[algo]['times']),
-                    'min_time_ms': min(results[algo]['times']),
-                    'max_time_ms': max(results[algo]['times']),
-                    'avg_nodes': sum(results[algo]['nodes']) / len(results[algo]['nodes']),
-                    'avg_distance': sum(results[algo]['distances']) / len(results[algo]['distances'])
+                    **{key: value for key, value in harness.results[algo].items() if key != 'name'},
+                    'avg_nodes': sum(result['stats']['nodes_explored'] for result in found) / len(found),
+                    'avg_distance': sum(result['distance'] for result in found) / len(found)
                 }
         
         print(f"\n📊 Performans İstatistikleri:")
-        print(f"{'Algoritma':<15} {'Ort. Süre (ms)':<15} {'Ort. Node':<12} {'Ort. Mesafe (km)'}")
-        print("-" * 70)
-        
+        harness.print_table()
+        print(f"\n{'Algoritma':<15} {'Ort. Node':<12} {'Ort. Mesafe (km)'}")
+        print("-" * 50)
         for algo, algo_stats in stats.items():
-            print(f"{algo:<15} {algo_stats['avg_time_ms']:<15.4f} "
-                  f"{algo_stats['avg_nodes']:<12.1f} {algo_stats['avg_distance']:.2f}")
+            print(f"{algo:<15} {algo_stats['avg_nodes']:<12.1f} {algo_stats['avg_distance']:.2f}")
         
         # Doğruluk
         total_correctness = results['correctness']['passed'] + results['correctness']['failed']
@@ -299,8 +319,48 @@ class ComprehensiveBenchmark:
             correctness_rate = (results['correctness']['passed'] / total_correctness) * 100
             print(f"\n✅ Doğruluk: {results['correctness']['passed']}/{total_correctness} "
                   f"({correctness_rate:.1f}%)")
+            for issue in results['correctness']['issues'][:5]:
+                print(f"   ❌ {issue['algorithm']} {issue['source']} -> {issue['target']}: {issue['message']}")
+        
+        # Baseline karşılaştırması
+        regression = None
+        if self.baseline_path:
+            print(f"\n📏 Baseline: {self.baseline_path}")
+            baseline = load_baseline(self.baseline_path)
+            if baseline is None:
+                print("   ⚠️  Baseline dosyası yok")
+            else:
+                regression = harness.compare(baseline, threshold=self.threshold,
+                                             allow_workload_mismatch=self.allow_workload_mismatch)
+                print_comparison(regression, self.threshold)
+            
+            # Regresyonlu sonuçlar baseline'ın üzerine yazılmaz
+            if self.save_new_baseline:
+                if regression is None or regression['passed']:
+                    save_baseline(self.baseline_path, harness)
+                    print(f"   💾 Baseline kaydedildi: {self.baseline_path}")
+                else:
+                    print("   ⚠️  Karşılaştırma başarısız - baseline güncellenmedi")
         
-        return {'raw_data': results, 'statistics': stats}
+        return {'raw_data': results, 'statistics': stats, 'workload': workload, 'regression': regression}
+    
+    def test_memory_profile(self) -> Dict:
+        """Sözlük tabanlı ve kompakt ağın bellek profili (tracemalloc + RSS)"""
+        print("🧠 Bellek profili çıkarılıyor (tracemalloc)...")
+        
+        network, network_name = self._benchmark_network()
+        endpoints = list(network.nodes) if self.synthetic_nodes else network.fire_stations
+        pairs = sample_pairs(endpoints, min(self.query_count, 5), self.seed)
+        
+        if self.synthetic_nodes:
+            build_dict = lambda: generate_synthetic_network(self.synthetic_nodes, seed=self.seed)
+        else:
+            build_dict = build_izmir_manisa_network
+        
+        profiles = MemoryBenchmark().compare_representations(network, pairs, build_dict)
+        print(f"\n📊 Bellek ({network_name}, {len(pairs)} sorgu):")
+        print_memory_report(profiles)
+        return profiles
     
     def test_system_health(self) -> Dict:
         """Sistem sağlığı testleri"""
@@ -467,6 +527,15 @@ class ComprehensiveBenchmark:
         if health_score < 100:
             summary['recommendations'].append("🔧 Sistem sağlığı iyileştirilmeli")
         
+        regression = algo_results.get('regression')
+        if regression and not regression['passed']:
+            if regression['workload_mismatch']:
+                summary['recommendations'].append("❌ Baseline farklı iş yüküyle kaydedilmiş - yeniden kaydedin")
+            else:
+                summary['recommendations'].append(
+                    f"❌ {len(regression['regressions'])} performans regresyonu (baseline'a göre)"
+                )
+        
         if not summary['recommendations']:
             summary['recommendations'].append("✅ Sistem mükemmel durumda!")
         
@@ -496,22 +565,68 @@ class ComprehensiveBenchmark:
         print("\n" + "=" * 80)
 
 
-def main():
-    """Ana fonksiyon"""
-    benchmark = ComprehensiveBenchmark()
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Kapsamlı benchmark test sistemi")
+    parser.add_argument("--queries", type=int, default=30, help="Performans testi sorgu sayısı")
+    parser.add_argument("--seed", type=int, default=42, help="Sorgu çifti (ve sentetik ağ) seed'i")
+    parser.add_argument("--warmup", type=int, default=5, help="Ölçülmeyen ısınma sorgusu sayısı")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help="Sorgu kümesinin ölçülme tur sayısı (sorgu başına turlar arası min/medyan)")
+    parser.add_argument("--aggregate", choices=AGGREGATES, default="min",
+                        help="Sorgu başına turların birleştirilmesi")
+    parser.add_argument("--synthetic", type=int, default=None, metavar="NODES",
+                        help="İzmir-Manisa yerine bu boyutta sentetik ağ kullan")
+    parser.add_argument("--baseline", nargs="?", const=DEFAULT_BASELINE, default=None,
+                        metavar="PATH", help=f"Baseline ile karşılaştır (varsayılan: {DEFAULT_BASELINE})")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Sonuçları baseline olarak kaydet (karşılaştırma geçerse veya baseline yoksa)")
+    parser.add_argument("--allow-workload-mismatch", action="store_true",
+                        help="Farklı iş yüküyle kaydedilmiş baseline'ı hata saymadan atla")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Regresyon eşiği (oran, 0.15 = %%15 yavaşlama)")
+    parser.add_argument("--memory", action="store_true",
+                        help="Bellek profili de çıkar (byte/node, byte/edge, sorgu başına tepe ayrım)")
+    parser.add_argument("--report", default="comprehensive_benchmark_report.json",
+                        help="JSON rapor dosyası")
+    add_profile_arguments(parser, default_output="comprehensive_benchmark_profile")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Ana fonksiyon - regresyon varsa 1 döner"""
+    args = parse_args(argv)
+    baseline_path = args.baseline
+    if args.save_baseline and baseline_path is None:
+        baseline_path = DEFAULT_BASELINE
+    
+    benchmark = ComprehensiveBenchmark(
+        query_count=args.queries, seed=args.seed, warmup=args.warmup, repeat=args.repeat,
+        baseline_path=baseline_path, threshold=args.threshold,
+        save_new_baseline=args.save_baseline, synthetic_nodes=args.synthetic,
+        memory=args.memory, aggregate=args.aggregate,
+        allow_workload_mismatch=args.allow_workload_mismatch
+    )
     
-    # Tüm testleri çalıştır
-    results = benchmark.run_all_tests()
+    # Tüm testleri çalıştır (--profile verildiyse profiler altında)
+    with profile_from_args(args):
+        results = benchmark.run_all_tests()
     
     # Final özet
     benchmark.print_final_summary()
     
     # Raporu kaydet
-    benchmark.save_report()
+    benchmark.save_report(args.report)
+    
+    regression = results['algorithm_performance'].get('regression')
+    if regression and not regression['passed']:
+        reason = "baseline iş yükü uyuşmuyor" if regression['workload_mismatch'] else "performans regresyonu"
+        print(f"\n❌ BENCHMARK BAŞARISIZ: {reason}!")
+        return 1
     
     print("\n✅ BENCHMARK TESTLERİ TAMAMLANDI!")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
 
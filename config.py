@@ -10,6 +10,16 @@ except ImportError:
 
 TOMTOM_BASE_URL = "https://api.tomtom.com"
 
+# Diğer servis adresleri (yük testi yerel stub sunuculara yönlendirir)
+OSRM_BASE_URL = "https://router.project-osrm.org"
+OPENWEATHER_BASE_URL = "http://api.openweathermap.org"
+
+# Prometheus metrik uç noktası (ör. 9108 -> http://127.0.0.1:9108/metrics; None: kapalı)
+METRICS_PORT = None
+
+# Sorgu kaydı (ör. "queries.jsonl.gz"; None: kapalı) - python query_log.py <yol> ile yeniden oynatılır
+QUERY_LOG_PATH = None
+
 # Yol Ağırlıkları
 ROAD_WEIGHTS = {
     'motorway': 1.0,      # Otoyol - En hızlı
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+🧮 CSR GRAPH 🧮
+RoadNetwork'ün sıkıştırılmış satır (Compressed Sparse Row) dizi gösterimi
+
+Yapı (n node, m edge):
+    node_ids[i]                     -> i. indeksin RoadNetwork node id'si
+    indptr[i] : indptr[i+1]         -> i. node'un çıkan edge aralığı
+    indices[e], weights[e]          -> e. edge'in hedef indeksi ve ağırlığı
+    distances[e], times[e]          -> km ve dakika
+
+Tüm diziler NumPy'dır; vektörize algoritmalar (delta-stepping, toplu sorgular)
+ve süreçler arası paylaşım (shared memory) için kullanılır.
+"""
+
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Paylaşılan belleğe konulan diziler
+CSR_ARRAYS = ("node_ids", "indptr", "indices", "weights", "distances", "times")
+
+
+class CSRGraph:
+    """Salt okunur CSR graph - RoadNetwork'ten bir kez üretilir"""
+
+    def __init__(self, node_ids: np.ndarray, indptr: np.ndarray, indices: np.ndarray,
+                 weights: np.ndarray, distances: Optional[np.ndarray] = None,
+                 times: Optional[np.ndarray] = None):
+        self.node_ids = node_ids
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.distances = distances if distances is not None else np.zeros_like(weights)
+        self.times = times if times is not None else np.zeros_like(weights)
+        self._index_of: Optional[Dict[int, int]] = None
+
+    @classmethod
+    def from_edges(cls, node_ids, sources, targets, weights,
+                   distances=None, times=None) -> 'CSRGraph':
+        """
+        Edge listesinden CSR kur
+
+        sources/targets 0..n-1 arası indekslerdir (node id değil). Aynı kaynaktan
+        çıkan edge'lerin girdi sırası korunur (stable sort).
+        """
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int32)
+        weights = np.asarray(weights, dtype=np.float64)
+
+        order = np.argsort(sources, kind="stable")
+        counts = np.bincount(sources, minlength=node_ids.size)
+        indptr = np.zeros(node_ids.size + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+
+        def _sorted(values):
+            if values is None:
+                return None
+            return np.asarray(values, dtype=np.float64)[order]
+
+        return cls(node_ids, indptr, targets[order], weights[order],
+                   _sorted(distances), _sorted(times))
+
+    @classmethod
+    def from_network(cls, network) -> 'CSRGraph':
+        """RoadNetwork -> CSR (node'lar id sırasına göre indekslenir)"""
+        node_ids = np.array(sorted(network.nodes), dtype=np.int64)
+        index_of = {int(node_id): index for index, node_id in enumerate(node_ids)}
+
+        sources: List[int] = []
+        targets: List[int] = []
+        weights: List[float] = []
+        distances: List[float] = []
+        times: List[float] = []
+        for from_id, edges in network.edges.items():
+            source = index_of.get(from_id)
+            if source is None:
+                continue
+            for edge in edges:
+                sources.append(source)
+                targets.append(index_of[edge.to_node])
+                weights.append(edge.weight)
+                distances.append(edge.distance)
+                times.append(edge.estimated_time)
+
+        graph = cls.from_edges(node_ids, sources, targets, weights, distances, times)
+        graph._index_of = index_of
+        return graph
+
+    @property
+    def node_count(self) -> int:
+        return int(self.node_ids.size)
+
+    @property
+    def edge_count(self) -> int:
+        return int(self.indices.size)
+
+    def index_of(self, node_id: int) -> int:
+        """RoadNetwork node id -> CSR indeksi"""
+        if self._index_of is None:
+            self._index_of = {int(nid): index for index, nid in enumerate(self.node_ids)}
+        return self._index_of[node_id]
+
+    def neighbors(self, index: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Indeksin çıkan komşuları: (hedef indeksleri, ağırlıklar)"""
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    def edge_sources(self) -> np.ndarray:
+        """Her edge'in kaynak indeksi (indptr'ın açılmış hali)"""
+        return np.repeat(np.arange(self.node_count, dtype=np.int32), np.diff(self.indptr))
+
+    def reverse(self) -> 'CSRGraph':
+        """Tüm edge'leri ters çevrilmiş graph (gelen edge'ler üzerinden aramalar için)"""
+        return CSRGraph.from_edges(self.node_ids, self.indices, self.edge_sources(),
+                                   self.weights, self.distances, self.times)
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in CSR_ARRAYS}
+
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in self.arrays().values())
+
+    # Süreçler arası paylaşım
+
+    def to_shared_memory(self) -> Tuple[List[shared_memory.SharedMemory], Dict]:
+        """
+        Dizileri paylaşılan belleğe kopyala
+
+        Returns:
+            (bloklar, tanım) - bloklar sahibi tarafından açık tutulup işi bitince
+            close() + unlink() edilmeli; tanım (picklable) worker'lara gönderilir.
+        """
+        blocks = []
+        descriptor = {}
+        for name, array in self.arrays().items():
+            block = shared_memory.SharedMemory(create=True, size=max(1, array.nbytes))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            blocks.append(block)
+            descriptor[name] = (block.name, array.dtype.str, array.shape)
+        return blocks, descriptor
+
+    @classmethod
+    def from_shared_memory(cls, descriptor: Dict) -> Tuple['CSRGraph', List[shared_memory.SharedMemory]]:
+        """
+        Paylaşılan bellekteki CSR'a kopyasız bağlan
+
+        Dönen bloklar graph kullanıldığı sürece açık tutulmalıdır.
+        """
+        blocks = []
+        arrays = {}
+        for name, (block_name, dtype, shape) in descriptor.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        return cls(**arrays), blocks
+
+
+def release_shared_memory(blocks: List[shared_memory.SharedMemory], unlink: bool = False) -> None:
+    """Paylaşılan bellek bloklarını kapat (sahibi ise unlink=True)"""
+    for block in blocks:
+        block.close()
+        if unlink:
+            block.unlink()
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+"""
+⚡ DELTA-STEPPING SSSP ⚡
+Tek kaynaktan tüm nodelara en kısa yol - CSR dizileri üzerinde NumPy ile
+
+Kapsama, izokron ve mesafe matrisi işleri tam "one-to-all" aramalardır;
+heapq Dijkstra bunları node node, saf Python döngüsünde yapar. Delta-stepping
+(Meyer & Sanders) nodeları Δ genişliğinde kovalara ayırır ve bir kovadaki tüm
+nodeları aynı anda gevşetir (relax) - bu da kova başına birkaç vektörize NumPy
+işlemi demektir.
+
+Algoritma:
+1. Edge'ler hafif (w ≤ Δ) ve ağır (w > Δ) olarak ikiye ayrılır
+2. En küçük dolu kova [iΔ, (i+1)Δ) seçilir
+3. Kovadaki nodeların hafif edge'leri, kova değişmeyene kadar tekrar tekrar
+   gevşetilir (kova içinde label-correcting)
+4. Kovadan çıkan tüm nodeların ağır edge'leri bir kez gevşetilir
+5. Kova kalmayana kadar 2'ye dön
+
+Negatif olmayan ağırlıklarla sonuç Dijkstra ile aynı mesafelerdir.
+
+Faz başına sabit NumPy maliyeti dar frontier'larda (uzun ara node
+zincirleri) heapq Dijkstra'nın toplam maliyetini aşar. Faz sayısı graph
+kurulurken birkaç rastgele kaynaktan vektörize BFS ile tahmin edilir (hop
+seviye sayısı); en çok node'a ulaşan örneğin (en büyük bileşen vekili) seviye
+başına ortalama node sayısı min_frontier'ın altındaysa run() aynı CSR
+üzerinde heapq Dijkstra'ya düşer. İzole / tek yönlü çıkmaz bir başlangıç
+node'u tahmini bozmaz.
+
+Çok kaynaklı işler için DeltaSteppingPool graph'ı paylaşılan belleğe
+(multiprocessing.shared_memory) bir kez koyar; worker süreçler kopyasız bağlanır.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from csr_graph import CSRGraph, release_shared_memory
+
+NO_PREDECESSOR = -1
+
+# Faz (BFS seviyesi) başına bu kadar node'un altında heapq Dijkstra daha hızlı
+MIN_FRONTIER = 64
+# Genişlik tahmini için BFS başlatılan örnek kaynak sayısı
+ESTIMATE_SOURCES = 4
+
+
+class DeltaStepping:
+    """
+    CSR üzerinde delta-stepping tek kaynaklı en kısa yol
+
+    Δ verilmezse ortalama edge ağırlığının delta_factor katı kullanılır; büyük Δ
+    daha az kova (daha az NumPy çağrısı) ama kova içinde daha fazla tekrar demektir.
+
+    Faz sayısı en derin en kısa yol ağacının hop sayısıyla sınırlıdır; geniş
+    (ızgara benzeri) ağlarda frontier'lar büyük olduğundan kazanç yüksektir, uzun
+    ara node zincirlerinde ise faz başına NumPy çağrı maliyeti belirleyici olur.
+    fallback=True iken bu durumda run() heapq Dijkstra kullanır; seçilen yöntem
+    stats['method'], tahminin dayanağı stats['method_estimate'] içindedir.
+    """
+
+    def __init__(self, graph: CSRGraph, delta: Optional[float] = None, delta_factor: float = 8.0,
+                 fallback: bool = True, min_frontier: float = MIN_FRONTIER,
+                 estimate_sources: int = ESTIMATE_SOURCES, seed: int = 0):
+        self.graph = graph
+        if delta is None:
+            mean_weight = float(graph.weights.mean()) if graph.edge_count else 1.0
+            delta = max(mean_weight * delta_factor, 1e-9)
+        self.delta = delta
+
+        light = graph.weights <= delta
+        self._light = self._split(light)
+        self._heavy = self._split(~light)
+
+        self.estimated_phases: Optional[int] = None
+        self.frontier_width: Optional[float] = None
+        if fallback and graph.node_count:
+            self.method_estimate = self._estimate_width(estimate_sources, seed)
+            self.method = 'heapq' if self.frontier_width < min_frontier else 'delta'
+        else:
+            self.method_estimate = {'basis': 'forced' if not fallback else 'empty'}
+            self.method = 'delta'
+        self._lists = None
+
+    def _estimate_width(self, sources: int, seed: int) -> Dict:
+        """
+        Örnek kaynaklardan BFS; en çok node'a ulaşan örneğin seviye sayısı
+        tahmini faz sayısı, ulaşılan / seviye de frontier genişliğidir
+        """
+        graph = self.graph
+        candidates = np.flatnonzero(np.diff(graph.indptr) > 0)  # çıkışı olmayan nodelar temsil etmez
+        if not candidates.size:
+            candidates = np.arange(graph.node_count)
+        rng = np.random.default_rng(seed)
+        picked = rng.choice(candidates, size=min(sources, candidates.size), replace=False)
+
+        best_reached, best_levels = 0, 1
+        for source in picked.tolist():
+            reached, levels = self._hop_levels(source)
+            if reached > best_reached:
+                best_reached, best_levels = reached, levels
+        self.estimated_phases = best_levels
+        self.frontier_width = best_reached / best_levels
+        return {
+            'basis': 'bfs_sample',
+            'sources': int(picked.size),
+            'reached': best_reached,
+            'levels': best_levels,
+            'width': round(self.frontier_width, 1),
+        }
+
+    def _split(self, mask: np.ndarray):
+        """Maskeye uyan edge'lerden alt CSR: (indptr, indices, weights)"""
+        graph = self.graph
+        counts = np.bincount(graph.edge_sources()[mask], minlength=graph.node_count)
+        indptr = np.zeros(graph.node_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return indptr, graph.indices[mask], graph.weights[mask]
+
+    def _hop_levels(self, source_index: int):
+        """Vektörize BFS: (ulaşılan node sayısı, seviye sayısı)"""
+        indptr, indices = self.graph.indptr, self.graph.indices
+        seen = np.zeros(self.graph.node_count, dtype=bool)
+        seen[source_index] = True
+        frontier = np.array([source_index], dtype=np.int64)
+        reached, levels = 1, 0
+        while frontier.size:
+            levels += 1
+            starts = indptr[frontier]
+            counts = indptr[frontier + 1] - starts
+            total = int(counts.sum())
+            if total == 0:
+                break
+            edge_ids = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(total)
+            targets = np.unique(indices[edge_ids])
+            frontier = targets[~seen[targets]]
+            seen[frontier] = True
+            reached += frontier.size
+        return reached, levels
+
+    @staticmethod
+    def _relax(frontier: np.ndarray, part, dist: np.ndarray, pred: np.ndarray) -> np.ndarray:
+        """
+        frontier nodelarının edge'lerini gevşet
+
+        Returns:
+            Mesafesi iyileşen hedef indeksleri (tekil)
+        """
+        indptr, indices, weights = part
+        starts = indptr[frontier]
+        counts = indptr[frontier + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return frontier[:0]
+
+        # Frontier'ın edge aralıklarını tek bir edge indeks dizisine aç
+        offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+        edge_ids = offsets + np.arange(total)
+        owners = np.repeat(frontier, counts)
+
+        targets = indices[edge_ids]
+        candidates = dist[owners] + weights[edge_ids]
+
+        improving = candidates < dist[targets]
+        if not improving.any():
+            return frontier[:0]
+        targets = targets[improving]
+        candidates = candidates[improving]
+        owners = owners[improving]
+
+        # Aynı hedefe birden çok aday: en küçüğü (eşitlikte ilk gelen) kazanır
+        order = np.lexsort((candidates, targets))
+        targets = targets[order]
+        first = np.ones(targets.size, dtype=bool)
+        first[1:] = targets[1:] != targets[:-1]
+        targets = targets[first]
+        dist[targets] = candidates[order][first]
+        pred[targets] = owners[order][first]
+        return targets
+
+    def run(self, source_index: int) -> Dict:
+        """
+        Tek kaynaktan tüm nodelara en kısa mesafeler
+
+        Returns:
+            {
+                'distances': float64 dizi (ulaşılamayan: inf),
+                'predecessors': int32 dizi (kaynak ve ulaşılamayan: -1),
+                'stats': {'method', 'method_estimate', 'buckets', 'phases', 'execution_time'}
+            }
+        """
+        start_time = time.perf_counter()
+        if self.method == 'heapq':
+            if self._lists is None:
+                self._lists = _csr_lists(self.graph)
+            dist, pred = _heapq_search(self._lists, source_index)
+            return {
+                'distances': dist,
+                'predecessors': pred,
+                'stats': {
+                    'method': 'heapq',
+                    'method_estimate': self.method_estimate,
+                    'buckets': 0,
+                    'phases': 0,
+                    'execution_time': time.perf_counter() - start_time
+                }
+            }
+
+        n = self.graph.node_count
+        delta = self.delta
+
+        dist = np.full(n, np.inf)
+        pred = np.full(n, NO_PREDECESSOR, dtype=np.int32)
+        dist[source_index] = 0.0
+
+        settled = np.zeros(n, dtype=bool)
+        pending = np.array([source_index], dtype=np.int32)
+        buckets = 0
+        phases = 0
+
+        while True:
+            # Daha önceki bir kovada kesinleşmiş (eskimiş) kayıtları at
+            pending = pending[~settled[pending]]
+            if not pending.size:
+                break
+            pending_dist = dist[pending]
+            upper = (np.floor(pending_dist.min() / delta) + 1) * delta
+
+            in_bucket = pending_dist < upper
+            frontier = np.unique(pending[in_bucket])
+            pending = pending[~in_bucket]
+            bucket_nodes = [frontier]
+            buckets += 1
+
+            # Hafif edge'ler: kova boşalana kadar
+            while frontier.size:
+                phases += 1
+                improved = self._relax(frontier, self._light, dist, pred)
+                if not improved.size:
+                    break
+                stays = dist[improved] < upper
+                frontier = improved[stays]
+                pending = np.concatenate((pending, improved[~stays]))
+                bucket_nodes.append(frontier)
+
+            # Ağır edge'ler: kovadan çıkan nodelar için bir kez (hedefler daha ileri kovalara düşer)
+            removed = np.unique(np.concatenate(bucket_nodes)) if len(bucket_nodes) > 1 else bucket_nodes[0]
+            settled[removed] = True
+            improved = self._relax(removed, self._heavy, dist, pred)
+            if improved.size:
+                pending = np.concatenate((pending, improved))
+
+        return {
+            'distances': dist,
+            'predecessors': pred,
+            'stats': {
+                'method': 'delta',
+                'method_estimate': self.method_estimate,
+                'buckets': buckets,
+                'phases': phases,
+                'execution_time': time.perf_counter() - start_time
+            }
+        }
+
+    def one_to_all(self, source_id: int) -> Dict:
+        """RoadNetwork node id'si ile run()"""
+        return self.run(self.graph.index_of(source_id))
+
+    def path_to(self, result: Dict, target_index: int) -> List[int]:
+        """run() sonucundan hedefe giden yol (RoadNetwork node id'leri); ulaşılamıyorsa []"""
+        if not np.isfinite(result['distances'][target_index]):
+            return []
+        predecessors = result['predecessors']
+        path = [target_index]
+        while predecessors[path[-1]] != NO_PREDECESSOR:
+            path.append(int(predecessors[path[-1]]))
+        node_ids = self.graph.node_ids
+        return [int(node_ids[index]) for index in reversed(path)]
+
+
+def _csr_lists(graph: CSRGraph):
+    """CSR dizileri Python listesi olarak (heapq döngüsünde NumPy skaler maliyeti yok)"""
+    return graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+
+
+def _heapq_search(lists, source_index: int):
+    """_csr_lists() üzerinde klasik heapq Dijkstra: (mesafeler, öncüller)"""
+    import heapq
+
+    indptr, indices, weights = lists
+    n = len(indptr) - 1
+
+    dist = [float('inf')] * n
+    dist[source_index] = 0.0
+    pred = [NO_PREDECESSOR] * n
+    visited = [False] * n
+    pq = [(0.0, source_index)]
+
+    while pq:
+        current_dist, current = heapq.heappop(pq)
+        if visited[current]:
+            continue
+        visited[current] = True
+        for e in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[e]
+            new_dist = current_dist + weights[e]
+            if new_dist < dist[neighbor]:
+                dist[neighbor] = new_dist
+                pred[neighbor] = current
+                heapq.heappush(pq, (new_dist, neighbor))
+
+    return np.array(dist), np.array(pred, dtype=np.int32)
+
+
+def heapq_one_to_all(graph: CSRGraph, source_index: int) -> np.ndarray:
+    """Karşılaştırma için aynı CSR üzerinde klasik heapq Dijkstra (tüm nodelar)"""
+    return _heapq_search(_csr_lists(graph), source_index)[0]
+
+
+# Çok süreçli sürüm: graph paylaşılan bellekte, worker başına bir kez bağlanır
+
+_worker_state: Dict = {}
+
+
+def _init_worker(descriptor: Dict, result_descriptor, delta: float) -> None:
+    graph, blocks = CSRGraph.from_shared_memory(descriptor)
+    result_block, result = _attach_result(result_descriptor)
+    _worker_state.update(solver=DeltaStepping(graph, delta=delta), blocks=blocks + [result_block],
+                         result=result)
+
+
+def _attach_result(result_descriptor):
+    from multiprocessing import shared_memory
+
+    block_name, shape = result_descriptor
+    block = shared_memory.SharedMemory(name=block_name)
+    return block, np.ndarray(shape, dtype=np.float64, buffer=block.buf)
+
+
+def _solve_row(task) -> float:
+    row, source_index = task
+    outcome = _worker_state['solver'].run(source_index)
+    _worker_state['result'][row] = outcome['distances']
+    return outcome['stats']['execution_time']
+
+
+class DeltaSteppingPool:
+    """
+    Çok kaynaktan one-to-all (ör. mesafe matrisi, kapsama analizi)
+
+    CSR dizileri ve sonuç matrisi paylaşılan bellektedir; her worker graph'a
+    kopyasız bağlanır ve kendi satırlarını doğrudan sonuç matrisine yazar.
+    """
+
+    def __init__(self, graph: CSRGraph, workers: Optional[int] = None,
+                 delta: Optional[float] = None):
+        self.graph = graph
+        self.workers = workers or os.cpu_count() or 1
+        self.delta = delta if delta is not None else DeltaStepping(graph).delta
+
+    def distance_matrix(self, source_indices: Sequence[int]) -> np.ndarray:
+        """len(sources) × n mesafe matrisi"""
+        from multiprocessing import shared_memory
+
+        source_indices = list(source_indices)
+        shape = (len(source_indices), self.graph.node_count)
+        result_block = shared_memory.SharedMemory(create=True, size=max(1, 8 * shape[0] * shape[1]))
+        graph_blocks, descriptor = self.graph.to_shared_memory()
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                     initargs=(descriptor, (result_block.name, shape), self.delta)) as pool:
+                list(pool.map(_solve_row, enumerate(source_indices),
+                              chunksize=max(1, len(source_indices) // (self.workers * 4))))
+            result = np.ndarray(shape, dtype=np.float64, buffer=result_block.buf).copy()
+        finally:
+            release_shared_memory(graph_blocks + [result_block], unlink=True)
+
+        return result
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+
+    from advanced_pathfinding import LandmarkHeuristic
+    from network_builder import build_izmir_manisa_network
+
+    def compare(title: str, graph: CSRGraph, sources: List[int], network=None) -> None:
+        print(f"\n📊 {title}: {graph.node_count} node, {graph.edge_count} edge")
+        solver = DeltaStepping(graph, fallback=False)
+        auto = DeltaStepping(graph)
+
+        timings = {'network': 0.0, 'csr_heapq': 0.0, 'delta': 0.0, 'auto': 0.0}
+        max_diff = 0.0
+        for source in sources:
+            if network is not None:
+                start = time.perf_counter()
+                LandmarkHeuristic._one_to_all(int(graph.node_ids[source]), network.get_neighbors)
+                timings['network'] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            reference = heapq_one_to_all(graph, source)
+            timings['csr_heapq'] += time.perf_counter() - start
+
+            outcome = solver.run(source)
+            timings['delta'] += outcome['stats']['execution_time']
+            timings['auto'] += auto.run(source)['stats']['execution_time']
+            finite = np.isfinite(reference)
+            assert np.array_equal(finite, np.isfinite(outcome['distances']))
+            max_diff = max(max_diff, float(np.abs(reference[finite] - outcome['distances'][finite]).max()))
+
+        per_source = {name: total * 1000 / len(sources) for name, total in timings.items()}
+        if network is not None:
+            print(f"   heapq Dijkstra (RoadNetwork) : {per_source['network']:8.1f} ms/kaynak")
+        print(f"   heapq Dijkstra (CSR)         : {per_source['csr_heapq']:8.1f} ms/kaynak")
+        print(f"   {f'Delta-stepping (Δ={solver.delta:.2f})':<29}: {per_source['delta']:8.1f} ms/kaynak")
+        print(f"   {f'Otomatik ({auto.method})':<29}: {per_source['auto']:8.1f} ms/kaynak "
+              f"(BFS seviye genişliği {auto.frontier_width:.0f})")
+        print(f"   Maks. mesafe farkı           : {max_diff:.2e}")
+
+    print("⚡ Delta-Stepping vs heapq Dijkstra (one-to-all)")
+    rng = random.Random(7)
+
+    # 1. Yoğunlaştırılmış İzmir-Manisa ağı (uzun ara node zincirleri)
+    with contextlib.redirect_stdout(io.StringIO()):
+        network = build_izmir_manisa_network(density=100)
+    graph = CSRGraph.from_network(network)
+    sources = [graph.index_of(rng.choice(network.fire_stations)) for _ in range(5)]
+    compare("İzmir-Manisa (density=100)", graph, sources, network)
+
+    # 2. Izgara benzeri şehir ağı (geniş frontier'lar)
+    side = 400
+    grid = np.arange(side * side).reshape(side, side)
+    a = np.concatenate([grid[:, :-1].ravel(), grid[:-1, :].ravel()])
+    b = np.concatenate([grid[:, 1:].ravel(), grid[1:, :].ravel()])
+    weights = np.random.default_rng(7).uniform(0.1, 1.0, a.size)
+    grid_graph = CSRGraph.from_edges(np.arange(side * side), np.concatenate([a, b]),
+                                     np.concatenate([b, a]), np.concatenate([weights, weights]))
+    compare(f"{side}x{side} ızgara", grid_graph, [rng.randrange(side * side) for _ in range(3)])
+
+    # 3. Çok kaynaklı: paylaşılan bellekte süreç havuzu
+    pool = DeltaSteppingPool(graph)
+    start = time.perf_counter()
+    matrix = pool.distance_matrix(sources)
+    print(f"\n🧵 {pool.workers} worker ile {len(sources)} kaynak: "
+          f"{(time.perf_counter() - start) * 1000:.1f} ms, matris {matrix.shape}")
+    assert np.array_equal(matrix[0], DeltaStepping(graph).run(sources[0])['distances'])
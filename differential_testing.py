@@ -0,0 +1,443 @@
+#!/usr/bin/env python3
+"""
+🔬 DİFERANSİYEL TEST MOTORU 🔬
+Tüm pathfinder'ları bağımsız bir referans Dijkstra'ya (oracle) karşı sınar
+
+Her (graph, kaynak, hedef, motor) için:
+1. Bulundu / bulunamadı durumu oracle ile aynı olmalı
+2. Ağırlık (optimize edilen metrik, km değil) oracle ile aynı olmalı:
+       |w − w*| ≤ 1e-9 · w* + quantum · (|yol| + |yol*|) / 2
+   quantum: tamsayı öncelikli kuyruklarda (radix, bucket) edge başına
+   yuvarlama payı, diğer motorlarda 0
+3. Yol geçerli olmalı: kaynakta başlar, hedefte biter, ardışık her node
+   çifti arasında edge vardır ve edge ağırlıklarının toplamı raporlanan
+   ağırlığa eşittir
+
+Graph'lar:
+- Rastgele küçük graph'lar: paralel edge'ler, sıfır uzunluklu edge'ler,
+  tek yönlü yollar, izole node'lar
+- Sentetik yol ağları (synthetic_network)
+
+Sorgular: rastgele çiftler + adversarial çiftler (aynı node, tek yönlü
+edge'in tersi, en uzak köşeler, erişilemeyen node'lar, istasyonlar).
+
+Başarısız durumlar küçültülür (delta debugging): hata devam ettiği sürece
+yol kümeleri atılır, sonra kullanılmayan node'lar silinir; sonuç elle
+incelenebilecek kadar küçük bir GraphSpec'tir.
+"""
+
+import contextlib
+import heapq
+import io
+import random
+import tempfile
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from advanced_pathfinding import (
+    RoadNetwork, RoadType, DijkstraPathfinder, AStarPathfinder,
+    BidirectionalDijkstra, BidirectionalAStar, LandmarkHeuristic
+)
+from alternative_routes import AlternativeRouteGenerator
+from compact_network import CompactRoadNetwork, ROAD_TYPES
+from csr_graph import CSRGraph
+from delta_stepping import DeltaStepping
+from graph_partition import GraphPartitioner, TiledRoadNetwork
+from synthetic_network import generate_road_arrays
+
+# Ağırlık karşılaştırmasında göreli tolerans (toplama sırası farkları)
+RELATIVE_TOLERANCE = 1e-9
+
+Road = Tuple[int, int, RoadType, bool]
+Query = Callable[[int, int], Optional[Dict]]
+
+
+@dataclass
+class GraphSpec:
+    """Test graph'ının yeniden kurulabilir tanımı (küçültme bunun üzerinde çalışır)"""
+    coords: List[Tuple[float, float]]
+    roads: List[Road]
+    stations: List[int] = field(default_factory=list)
+    name: str = ""
+
+    def build(self) -> RoadNetwork:
+        network = RoadNetwork()
+        station_set = set(self.stations)
+        for node_id, (lat, lon) in enumerate(self.coords):
+            network.add_node(lat, lon, f"İstasyon {node_id}" if node_id in station_set else "",
+                             is_fire_station=node_id in station_set)
+        for from_id, to_id, road_type, bidirectional in self.roads:
+            network.add_edge(from_id, to_id, road_type, bidirectional)
+        return network
+
+    def with_roads(self, roads: List[Road]) -> 'GraphSpec':
+        return GraphSpec(self.coords, roads, self.stations, self.name)
+
+    def without_unused_nodes(self, keep: Sequence[int]) -> Tuple['GraphSpec', Dict[int, int]]:
+        """Hiçbir yola değmeyen node'ları at (keep hariç); eski id -> yeni id"""
+        used = set(keep)
+        for from_id, to_id, _, _ in self.roads:
+            used.update((from_id, to_id))
+        mapping = {old: new for new, old in enumerate(sorted(used))}
+        spec = GraphSpec(
+            [self.coords[old] for old in sorted(used)],
+            [(mapping[u], mapping[v], road_type, both) for u, v, road_type, both in self.roads],
+            [mapping[station] for station in self.stations if station in mapping],
+            self.name
+        )
+        return spec, mapping
+
+    def describe(self) -> str:
+        lines = [f"GraphSpec({len(self.coords)} node, {len(self.roads)} yol)"]
+        for node_id, (lat, lon) in enumerate(self.coords):
+            lines.append(f"   node {node_id}: ({lat:.6f}, {lon:.6f})")
+        for from_id, to_id, road_type, bidirectional in self.roads:
+            arrow = "<->" if bidirectional else "->"
+            lines.append(f"   {from_id} {arrow} {to_id} [{road_type.code}]")
+        return "\n".join(lines)
+
+
+def random_spec(seed: int, node_count: int = 40) -> GraphSpec:
+    """
+    Zorlayıcı küçük graph: paralel edge'ler, sıfır uzunluklu edge'ler
+    (aynı koordinatlı node'lar), tek yönlü yollar ve izole node'lar
+    """
+    rng = random.Random(seed)
+    coords = [(38.40 + rng.random() * 0.05, 27.10 + rng.random() * 0.05) for _ in range(node_count)]
+    for index in rng.sample(range(1, node_count), max(1, node_count // 20)):
+        coords[index] = coords[index - 1]  # Sıfır uzunluklu edge adayı
+
+    isolated = set(rng.sample(range(node_count), max(1, node_count // 20)))
+    road_types = list(RoadType)
+    roads: List[Road] = []
+    for from_id in range(node_count):
+        if from_id in isolated:
+            continue
+        for _ in range(2):
+            to_id = (from_id + rng.randint(1, 6)) % node_count
+            if to_id in isolated or to_id == from_id:
+                continue
+            road = (from_id, to_id, rng.choice(road_types), rng.random() > 0.25)
+            roads.append(road)
+            if rng.random() < 0.1:  # Paralel yol (farklı tip)
+                roads.append((from_id, to_id, rng.choice(road_types), road[3]))
+
+    stations = rng.sample([n for n in range(node_count) if n not in isolated], 3)
+    return GraphSpec(coords, roads, stations, f"random-{seed}")
+
+
+def synthetic_spec(node_count: int, seed: int, oneway_ratio: float = 0.3) -> GraphSpec:
+    """synthetic_network ağından GraphSpec"""
+    data = generate_road_arrays(node_count, seed=seed, oneway_ratio=oneway_ratio)
+    roads = [(u, v, ROAD_TYPES[code], bool(both)) for u, v, code, both in zip(
+        data.road_from.tolist(), data.road_to.tolist(), data.road_types.tolist(),
+        data.bidirectional.tolist())]
+    coords = list(zip(data.lats.tolist(), data.lons.tolist()))
+    return GraphSpec(coords, roads, data.stations.tolist(), f"synthetic-{node_count}-{seed}")
+
+
+def adversarial_pairs(spec: GraphSpec, rng: random.Random, count: int) -> List[Tuple[int, int]]:
+    """Sınır durumları + rastgele çiftler"""
+    node_count = len(spec.coords)
+    pairs = [(0, 0)]
+
+    # Tek yönlü yolların tersi (dolambaçlı yol gerektirir) ve komşu çiftler
+    oneways = [road for road in spec.roads if not road[3]]
+    for from_id, to_id, _, _ in rng.sample(oneways, min(5, len(oneways))):
+        pairs.extend([(to_id, from_id), (from_id, to_id)])
+    for from_id, to_id, _, _ in rng.sample(spec.roads, min(3, len(spec.roads))):
+        pairs.append((from_id, to_id))
+
+    # En uzak köşeler
+    by_diagonal = sorted(range(node_count), key=lambda n: spec.coords[n][0] + spec.coords[n][1])
+    pairs.extend([(by_diagonal[0], by_diagonal[-1]), (by_diagonal[-1], by_diagonal[0])])
+
+    # Erişilemeyen (yolu olmayan) node'lar
+    used = {u for u, _, _, _ in spec.roads} | {v for _, v, _, _ in spec.roads}
+    unused = [n for n in range(node_count) if n not in used]
+    for node_id in unused[:2]:
+        pairs.extend([(node_id, by_diagonal[0]), (by_diagonal[0], node_id)])
+
+    # İstasyonlar arası
+    for source in spec.stations:
+        for target in spec.stations:
+            if source != target:
+                pairs.append((source, target))
+
+    while len(pairs) < count:
+        pairs.append((rng.randrange(node_count), rng.randrange(node_count)))
+    return pairs
+
+
+def reference_distances(network: RoadNetwork, source: int) -> Tuple[Dict[int, float], Dict[int, int]]:
+    """
+    Oracle: en basit haliyle Dijkstra (network.edges üzerinden, optimizasyonsuz)
+
+    Returns:
+        (node -> en kısa ağırlık, node -> en kısa yoldaki edge sayısı)
+    """
+    dist = {source: 0.0}
+    hops = {source: 0}
+    done = set()
+    pq = [(0.0, source)]
+    while pq:
+        d, node_id = heapq.heappop(pq)
+        if node_id in done:
+            continue
+        done.add(node_id)
+        for edge in network.edges.get(node_id, []):
+            candidate = d + edge.weight
+            if candidate < dist.get(edge.to_node, float('inf')):
+                dist[edge.to_node] = candidate
+                hops[edge.to_node] = hops[node_id] + 1
+                heapq.heappush(pq, (candidate, edge.to_node))
+    return dist, hops
+
+
+# Motorlar: isim -> (network'ten sorgu fonksiyonu üreten fabrika, quantum)
+
+def _pathfinder(cls, **options) -> Callable[[RoadNetwork], Query]:
+    return lambda network: cls(network, **options).find_shortest_path
+
+
+def _compact(cls, **options) -> Callable[[RoadNetwork], Query]:
+    return lambda network: cls(CompactRoadNetwork.from_network(network), **options).find_shortest_path
+
+
+def _bidirectional_alt(network: RoadNetwork) -> Query:
+    heuristic = LandmarkHeuristic(network, landmark_count=4)
+    return BidirectionalAStar(network, heuristic=heuristic).find_shortest_path
+
+
+def _delta_stepping(**options) -> Callable[[RoadNetwork], Query]:
+    def factory(network: RoadNetwork) -> Query:
+        graph = CSRGraph.from_network(network)
+        solver = DeltaStepping(graph, **options)
+
+        def query(start_id: int, end_id: int) -> Optional[Dict]:
+            result = solver.one_to_all(start_id)
+            path = solver.path_to(result, graph.index_of(end_id))
+            if not path:
+                return None
+            return {'path': path, 'weight': float(result['distances'][graph.index_of(end_id)])}
+        return query
+    return factory
+
+
+def _tiled(network: RoadNetwork) -> Query:
+    directory = tempfile.TemporaryDirectory(prefix="difftest_tiles_")
+    with contextlib.redirect_stdout(io.StringIO()):
+        GraphPartitioner(network, max_cell_size=max(8, network.node_count() // 4)).save(directory.name)
+    tiled = TiledRoadNetwork(directory.name, max_loaded_tiles=2)
+
+    def query(start_id: int, end_id: int) -> Optional[Dict]:
+        query.directory = directory  # Dizin, sorgu fonksiyonu yaşadıkça silinmez
+        return tiled.find_shortest_path(start_id, end_id)
+    return query
+
+
+def _yen_first(network: RoadNetwork) -> Query:
+    generator = AlternativeRouteGenerator(network)
+
+    def query(start_id: int, end_id: int) -> Optional[Dict]:
+        routes = generator.k_shortest_paths(start_id, end_id, k=1)
+        return routes[0] if routes else None
+    return query
+
+
+ENGINES: Dict[str, Tuple[Callable[[RoadNetwork], Query], float]] = {
+    'dijkstra': (_pathfinder(DijkstraPathfinder), 0.0),
+    'dijkstra_off': (_pathfinder(DijkstraPathfinder, stats_level='off'), 0.0),
+    'dijkstra_indexed': (_pathfinder(DijkstraPathfinder, queue='indexed'), 0.0),
+    'dijkstra_radix': (_pathfinder(DijkstraPathfinder, queue='radix'), 1e-3),
+    'dijkstra_bucket': (_pathfinder(DijkstraPathfinder, queue='bucket'), 1e-3),
+    'astar': (_pathfinder(AStarPathfinder), 0.0),
+    'astar_off': (_pathfinder(AStarPathfinder, stats_level='off'), 0.0),
+    'astar_indexed': (_pathfinder(AStarPathfinder, queue='indexed'), 0.0),
+    'bidirectional_dijkstra': (_pathfinder(BidirectionalDijkstra), 0.0),
+    'bidirectional_astar': (_pathfinder(BidirectionalAStar), 0.0),
+    'bidirectional_alt': (_bidirectional_alt, 0.0),
+    'compact_dijkstra': (_compact(DijkstraPathfinder), 0.0),
+    'compact_astar': (_compact(AStarPathfinder, stats_level='off'), 0.0),
+    'compact_bidirectional_astar': (_compact(BidirectionalAStar), 0.0),
+    'delta_stepping': (_delta_stepping(fallback=False), 0.0),
+    'delta_stepping_heapq': (_delta_stepping(min_frontier=float('inf')), 0.0),
+    'tiled': (_tiled, 0.0),
+    'yen_first': (_yen_first, 0.0),
+}
+
+
+def check_result(network: RoadNetwork, start_id: int, end_id: int, result: Optional[Dict],
+                 expected: Optional[float], expected_hops: int, quantum: float) -> Optional[str]:
+    """Tek sonucun oracle'a göre doğrulanması; hata yoksa None, varsa açıklama"""
+    if expected is None:
+        return None if result is None else f"oracle yol yok derken yol döndü: {result.get('path')}"
+    if result is None:
+        return f"yol bulunamadı (oracle: {expected!r})"
+
+    path = result.get('path') or []
+    if not path or path[0] != start_id or path[-1] != end_id:
+        return f"yol uçları hatalı: {path[:3]}...{path[-3:]}"
+
+    walked = 0.0
+    for from_id, to_id in zip(path, path[1:]):
+        edge = network.get_edge(from_id, to_id)
+        if edge is None:
+            return f"yolda edge yok: {from_id} -> {to_id}"
+        walked += edge.weight
+
+    weight = result['weight']
+    allowed = RELATIVE_TOLERANCE * max(1.0, abs(expected)) + quantum * (len(path) - 1 + expected_hops) / 2
+    if abs(weight - expected) > allowed:
+        return f"ağırlık {weight!r} != oracle {expected!r} (fark {weight - expected:.3e})"
+    if abs(walked - weight) > allowed + quantum * (len(path) - 1):
+        return f"yol ağırlığı {walked!r} raporlanan {weight!r} ile uyuşmuyor"
+    return None
+
+
+class DifferentialTester:
+    """
+    Kullanım:
+        tester = DifferentialTester()
+        report = tester.run([random_spec(1), synthetic_spec(2000, 1)], pairs_per_graph=200)
+    """
+
+    def __init__(self, engines: Optional[Sequence[str]] = None, seed: int = 42, shrink: bool = True):
+        names = list(engines) if engines else list(ENGINES)
+        unknown = [name for name in names if name not in ENGINES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen motor: {', '.join(unknown)}")
+        self.engines = names
+        self.seed = seed
+        self.shrink_failures = shrink
+
+    def check_graph(self, spec: GraphSpec, pairs: Sequence[Tuple[int, int]],
+                    engines: Optional[Sequence[str]] = None, stop_at_first: bool = False) -> Dict:
+        """Bir graph üzerinde tüm motorlar × tüm çiftler"""
+        network = spec.build()
+        oracle: Dict[int, Tuple[Dict[int, float], Dict[int, int]]] = {}
+        failures = []
+        checks = 0
+
+        for engine in engines or self.engines:
+            factory, quantum = ENGINES[engine]
+            query = factory(network)
+            for start_id, end_id in pairs:
+                if start_id not in oracle:
+                    oracle[start_id] = reference_distances(network, start_id)
+                dist, hops = oracle[start_id]
+
+                checks += 1
+                try:
+                    result = query(start_id, end_id)
+                    message = check_result(network, start_id, end_id, result, dist.get(end_id),
+                                           hops.get(end_id, 0), quantum)
+                except Exception as e:
+                    message = f"istisna: {type(e).__name__}: {e}"
+
+                if message:
+                    failures.append({'graph': spec.name, 'engine': engine, 'source': start_id,
+                                     'target': end_id, 'message': message})
+                    if stop_at_first:
+                        return {'checks': checks, 'failures': failures}
+
+        return {'checks': checks, 'failures': failures}
+
+    def fails(self, spec: GraphSpec, engine: str, start_id: int, end_id: int) -> bool:
+        return bool(self.check_graph(spec, [(start_id, end_id)], [engine], stop_at_first=True)['failures'])
+
+    def shrink(self, spec: GraphSpec, engine: str, start_id: int, end_id: int) -> Tuple[GraphSpec, int, int]:
+        """
+        Başarısız durumu küçült (ddmin): hata sürdükçe yol parçalarını at
+
+        Returns:
+            (küçük GraphSpec, yeni kaynak, yeni hedef)
+        """
+        roads = list(spec.roads)
+        chunks = 2
+        while len(roads) >= 1:
+            size = max(1, len(roads) // chunks)
+            removed = False
+            for offset in range(0, len(roads), size):
+                candidate = roads[:offset] + roads[offset + size:]
+                if self.fails(spec.with_roads(candidate), engine, start_id, end_id):
+                    roads = candidate
+                    chunks = max(chunks - 1, 2)
+                    removed = True
+                    break
+            if not removed:
+                if size == 1:
+                    break
+                chunks = min(len(roads), chunks * 2)
+
+        small, mapping = spec.with_roads(roads).without_unused_nodes([start_id, end_id])
+        small.name = f"{spec.name}-shrunk"
+        return small, mapping[start_id], mapping[end_id]
+
+    def run(self, specs: Sequence[GraphSpec], pairs_per_graph: int = 100, verbose: bool = True) -> Dict:
+        """
+        Returns:
+            {'graphs', 'checks', 'failures': [...], 'per_engine': {motor: {'checks', 'failures'}},
+             'shrunk': [{'engine', 'message', 'spec', 'source', 'target'}]}
+        """
+        rng = random.Random(self.seed)
+        report = {'graphs': 0, 'checks': 0, 'failures': [], 'shrunk': [],
+                  'per_engine': {engine: {'checks': 0, 'failures': 0} for engine in self.engines}}
+
+        for spec in specs:
+            pairs = adversarial_pairs(spec, rng, pairs_per_graph)
+            result = self.check_graph(spec, pairs)
+            report['graphs'] += 1
+            report['checks'] += result['checks']
+            report['failures'].extend(result['failures'])
+            for engine in self.engines:
+                report['per_engine'][engine]['checks'] += len(pairs)
+            for failure in result['failures']:
+                report['per_engine'][failure['engine']]['failures'] += 1
+
+            if verbose:
+                status = "✅" if not result['failures'] else f"❌ {len(result['failures'])} hata"
+                print(f"   {spec.name:<28} {len(spec.coords):>6} node, {len(pairs):>4} çift, "
+                      f"{result['checks']:>6} kontrol  {status}")
+
+        if self.shrink_failures:
+            shrunk_engines = set()
+            for failure in report['failures']:
+                if failure['engine'] in shrunk_engines:
+                    continue
+                shrunk_engines.add(failure['engine'])
+                spec = next(s for s in specs if s.name == failure['graph'])
+                small, source, target = self.shrink(spec, failure['engine'], failure['source'], failure['target'])
+                report['shrunk'].append({'engine': failure['engine'], 'message': failure['message'],
+                                         'spec': small, 'source': source, 'target': target})
+        return report
+
+
+def print_differential_report(report: Dict) -> None:
+    print(f"\n📊 {report['graphs']} graph, {report['checks']} kontrol, {len(report['failures'])} hata")
+    print(f"{'Motor':<30} {'Kontrol':>8} {'Hata':>6}")
+    print("-" * 46)
+    for engine, stats in report['per_engine'].items():
+        mark = "✅" if not stats['failures'] else "❌"
+        print(f"{engine:<30} {stats['checks']:>8} {stats['failures']:>6} {mark}")
+
+    for case in report['shrunk']:
+        print(f"\n🔻 {case['engine']}: {case['message']}")
+        print(f"   Küçültülmüş durum: {case['source']} -> {case['target']}")
+        print(case['spec'].describe())
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import time
+
+    print("🔬 Diferansiyel Test\n")
+
+    start = time.perf_counter()
+    specs = [random_spec(seed) for seed in range(12)]
+    specs += [synthetic_spec(400, seed, oneway_ratio=0.6) for seed in range(3)]
+    specs.append(synthetic_spec(3000, 99))
+
+    report = DifferentialTester(seed=7).run(specs, pairs_per_graph=60)
+    print_differential_report(report)
+    print(f"\n⏱️  {time.perf_counter() - start:.1f} sn")
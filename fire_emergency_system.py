@@ -5,6 +5,7 @@ TomTom Haritası Üzerinden Yangın Noktası Seçimi ve En Yakın İtfaiye Yönl
 Tali yolları önceliklendiren akıllı rota sistemi
 """
 
+import argparse
 import folium
 from typing import Dict, List, Tuple, Optional
 # from route_planner import RoutePlanner  # Artık kullanılmıyor
@@ -13,6 +14,10 @@ from fire_stations import load_fire_stations, categorize_fire_stations
 from map_utils import create_interactive_map, create_emergency_route_map
 import route_calculator
 import config
+from metrics import serve_metrics
+from structured_logging import configure_logging
+from query_log import enable_query_log
+from profiling import add_profile_arguments, profile_from_args
 
 class FireEmergencySystem:
     """Yangın acil durum sistemi - Tali yolları önceliklendir"""
@@ -106,13 +111,19 @@ class FireEmergencySystem:
         print(f"✅ Harita oluşturuldu: {map_file}")
         return map_file
 
-async def main():
-    """Ana program"""
+async def run_interactive():
+    """Etkileşimli menü döngüsü"""
     system = FireEmergencySystem()
     
     print("🚨 YANGIN ACİL DURUM SİSTEMİ 🚨")
     print("🌾 Tali Yolları Önceliklendiren Akıllı Rota Sistemi")
     print("🔍 Otomatik İtfaiye Bulma Sistemi Aktif")
+    if config.METRICS_PORT:
+        serve_metrics(config.METRICS_PORT)
+        print(f"📈 Metrikler: http://127.0.0.1:{config.METRICS_PORT}/metrics")
+    if config.QUERY_LOG_PATH:
+        enable_query_log(config.QUERY_LOG_PATH)
+        print(f"🗂️  Sorgu kaydı: {config.QUERY_LOG_PATH}")
     print("=" * 60)
     
     while True:
@@ -176,6 +187,20 @@ async def main():
         else:
             print("❌ Geçersiz seçim! 1-4 arası bir sayı girin.")
 
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Yangın acil durum sistemi")
+    add_profile_arguments(parser, default_output="fire_emergency_profile")
+    return parser.parse_args(argv)
+
+async def main(argv: Optional[List[str]] = None):
+    """Ana program"""
+    args = parse_args(argv)
+    configure_logging()
+    
+    # --profile: oturum boyunca (menü beklemesi dahil) profille
+    with profile_from_args(args):
+        await run_interactive()
+
 if __name__ == "__main__":
     import asyncio
     asyncio.run(main())
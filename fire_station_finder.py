@@ -10,10 +10,21 @@ from typing import Dict, List, Tuple, Optional
 import config
 from tomtom_api import TomTomAPI
 from fire_stations import load_fire_stations
+from geodesy import haversine, haversine_many, nearest_indices
+from tracing import span, annotate, traced
+from metrics import record_cache, record_rate_limit_wait, timed_request
+from structured_logging import get_logger
+from query_log import logged_request
 import time
-import logging
 
-logger = logging.getLogger(__name__)
+log = get_logger(__name__)
+
+# Sürüş süresi sorguları için varsayılan yol ağı: edge'ler ara nodelara bölünür,
+# olay yeri bir itfaiye node'una değil en yakın yol noktasına bağlanır
+DRIVE_TIME_NETWORK_DENSITY = 20
+# Olay yeri ile en yakın yol node'u arası (yolsuz) bağlantı bacağı
+SNAP_SPEED_KMH = 30.0
+MAX_SNAP_KM = 3.0
 
 class FireStationFinder:
     """Otomatik itfaiye bulucu - TomTom API entegrasyonu"""
@@ -24,8 +35,11 @@ class FireStationFinder:
         self.cache_duration = 3600  # 1 saat cache
         self.last_api_call = 0  # Rate limiting için
         self.min_api_interval = 1.0  # API çağrıları arası minimum süre (saniye)
-        logger.info("FireStationFinder başlatıldı")
+        self.network_index = None  # (network, node_ids, lats, lons) - yol ağı sorguları için
+        self._default_network = None  # network verilmeyen sorgular için bir kez yüklenir
+        log.debug("FireStationFinder başlatıldı")
         
+    @traced('finder.rate_limit')
     async def _rate_limit(self):
         """TomTom API rate limiting kontrolü"""
         current_time = time.time()
@@ -33,11 +47,15 @@ class FireStationFinder:
         
         if time_since_last_call < self.min_api_interval:
             wait_time = self.min_api_interval - time_since_last_call
-            logger.warning(f"Rate limit aşıldı. {wait_time:.1f} saniye bekleniyor.")
+            log.info("Rate limit bekleniyor", wait_s=round(wait_time, 3))
+            annotate(wait_s=wait_time)
+            record_rate_limit_wait('fire_station_finder', wait_time)
             await asyncio.sleep(wait_time)
         
         self.last_api_call = time.time()  # Son çağrı zamanını güncelle
         
+    @traced('finder.find_nearby_fire_stations',
+            attrs=lambda self, fire_location, radius_km=100.0, max_results=20: {'radius_km': radius_km})
     async def find_nearby_fire_stations(
         self, 
         fire_location: Tuple[float, float], 
@@ -60,10 +78,13 @@ class FireStationFinder:
         # Önbellekte varsa kullan
         cache_key = f"{fire_lat:.4f}_{fire_lon:.4f}_{radius_km}"
         if cache_key in self.cache:
-            print(f"✅ Önbellekten itfaiye verileri alındı")
+            annotate(cache='hit')
+            record_cache('fire_stations', True)
+            log.debug("İtfaiye verisi önbellekten alındı", cache_key=cache_key)
             return self.cache[cache_key]
+        record_cache('fire_stations', False)
         
-        print(f"🔍 {radius_km} km yarıçapında itfaiye aranıyor...")
+        search_start = time.perf_counter()
         
         try:
             # TomTom API ile yakındaki itfaiyeleri ara - Daha kapsamlı arama
@@ -91,27 +112,34 @@ class FireStationFinder:
                 }
             
             # API çağrısı yap
-            async with aiohttp.ClientSession() as session:
-                url = f"https://api.tomtom.com/search/2/poiSearch/{search_query}.json"
-                params['key'] = config.TOMTOM_API_KEY
-                
-                async with session.get(url, params=params, timeout=30) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        if 'results' in data and data['results']:
-                            all_results.extend(data['results'])
-                    else:
-                        print(f"⚠️ {search_query} araması hatası: {response.status}")
+            with span('tomtom.poi_search', query=search_query) as trace_span:
+                async with aiohttp.ClientSession() as session:
+                    url = f"{config.TOMTOM_BASE_URL}/search/2/poiSearch/{search_query}.json"
+                    params['key'] = config.TOMTOM_API_KEY
+                    
+                    async with logged_request('tomtom_search', search_query, lambda: timed_request(
+                            'tomtom_search', session.get(url, params=params, timeout=30))) as response:
+                        trace_span.set(status=response.status)
+                        if response.status == 200:
+                            data = await response.json()
+                            if 'results' in data and data['results']:
+                                all_results.extend(data['results'])
+                        else:
+                            log.warning("TomTom POI araması hatası", query=search_query, status=response.status)
             
             # Tüm sonuçları işle
             if all_results:
-                return await self._process_fire_station_results({'results': all_results}, fire_location)
+                fire_stations = await self._process_fire_station_results({'results': all_results}, fire_location)
+                log.info("İtfaiye araması tamamlandı", source='tomtom', radius_km=radius_km,
+                         results=len(all_results), stations=len(fire_stations),
+                         duration_ms=round((time.perf_counter() - search_start) * 1000, 3))
+                return fire_stations
             else:
-                print("❌ Hiç sonuç bulunamadı, fallback kullanılıyor")
+                log.warning("TomTom araması sonuç vermedi, fallback kullanılıyor", radius_km=radius_km)
                 return await self._fallback_search(fire_location, radius_km)
                         
         except Exception as e:
-            print(f"❌ İtfaiye arama hatası: {e}")
+            log.warning("İtfaiye arama hatası, fallback kullanılıyor", error=f"{type(e).__name__}: {e}")
             return await self._fallback_search(fire_location, radius_km)
     
     async def _process_fire_station_results(
@@ -124,7 +152,7 @@ class FireStationFinder:
         fire_lat, fire_lon = fire_location
         
         if 'results' not in api_data:
-            print("⚠️ API sonuçları bulunamadı")
+            log.warning("API yanıtında sonuç alanı yok")
             return []
         
         for result in api_data['results']:
@@ -156,7 +184,7 @@ class FireStationFinder:
                     })
                     
             except Exception as e:
-                print(f"⚠️ Sonuç işleme hatası: {e}")
+                log.debug("Sonuç işlenemedi", error=f"{type(e).__name__}: {e}")
                 continue
         
         # Mesafeye göre sırala
@@ -166,7 +194,6 @@ class FireStationFinder:
         cache_key = f"{fire_lat:.4f}_{fire_lon:.4f}_50.0"
         self.cache[cache_key] = fire_stations
         
-        print(f"✅ {len(fire_stations)} itfaiye bulundu")
         return fire_stations
     
     def _is_fire_station(self, name: str, category: List) -> bool:
@@ -192,30 +219,16 @@ class FireStationFinder:
     
     def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
         """İki nokta arası mesafeyi hesapla (km)"""
-        import math
-        
-        # Dereceyi radyana çevir
-        lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-        
-        # Haversine formülü
-        dlat = lat2 - lat1
-        dlon = lon2 - lon1
-        a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        # Dünya yarıçapı (km)
-        r = 6371
-        
-        return c * r
+        return haversine(lat1, lon1, lat2, lon2)
     
+    @traced('finder.fallback_search')
     async def _fallback_search(
         self, 
         fire_location: Tuple[float, float], 
         radius_km: float
     ) -> List[Dict]:
         """API hatası durumunda fallback arama"""
-        print("🔄 Fallback arama yapılıyor...")
-        
+        search_start = time.perf_counter()
         fire_lat, fire_lon = fire_location
         
         # Basit grid arama - belirli aralıklarla itfaiye ara
@@ -224,8 +237,16 @@ class FireStationFinder:
         # İzmir ve Manisa illerine ait doğrulanmış istasyonlar
         known_stations = load_fire_stations()
         
-        for name, coords in known_stations.items():
-            distance = self._haversine_distance(fire_lat, fire_lon, coords[0], coords[1])
+        # Tüm istasyonlara mesafe tek bir vektörel işlemle
+        names = list(known_stations)
+        distances = haversine_many(
+            fire_lat, fire_lon,
+            [known_stations[name][0] for name in names],
+            [known_stations[name][1] for name in names]
+        ).tolist()
+        
+        for name, distance in zip(names, distances):
+            coords = known_stations[name]
             
             if distance <= radius_km:
                 fire_stations.append({
@@ -241,7 +262,9 @@ class FireStationFinder:
         # Mesafeye göre sırala
         fire_stations.sort(key=lambda x: x['distance'])
         
-        print(f"✅ Fallback ile {len(fire_stations)} itfaiye bulundu")
+        log.info("İtfaiye araması tamamlandı", source='fallback', radius_km=radius_km,
+                 stations=len(fire_stations),
+                 duration_ms=round((time.perf_counter() - search_start) * 1000, 3))
         return fire_stations
     
     async def get_nearest_fire_station(
@@ -255,7 +278,7 @@ class FireStationFinder:
             return None
         
         nearest = fire_stations[0]
-        print(f"🎯 En yakın itfaiye: {nearest['name']} ({nearest['distance']:.1f} km)")
+        log.debug("En yakın itfaiye", station=nearest['name'], distance_km=round(nearest['distance'], 3))
         return nearest
     
     async def get_multiple_fire_stations(
@@ -271,6 +294,87 @@ class FireStationFinder:
         
         # En yakın 'count' kadar itfaiyeyi döndür
         return fire_stations[:count]
+    
+    def get_nearest_stations_by_drive_time(
+        self,
+        fire_location: Tuple[float, float],
+        count: int = 3,
+        network=None,
+        max_snap_km: float = MAX_SNAP_KM
+    ) -> List[Dict]:
+        """
+        Yol ağı üzerinde sürüş süresine göre en yakın birkaç itfaiye
+        
+        Haversine sıralamasının aksine gerçek yol süresini kullanır; yangın
+        noktasından tek bir ters yönlü Dijkstra çalışır ve 'count' itfaiye
+        kesinleştiğinde durur (NearestStationSearch).
+        
+        Olay yeri en yakın yol node'una bağlanır; bu bağlantı bacağı
+        (snap_distance, SNAP_SPEED_KMH ile) mesafe ve süreye eklenir. Bağlantı
+        max_snap_km'den uzunsa yol ağı olay yerini temsil etmiyordur: uyarı
+        loglanır ve [] döner (çağıran haversine sıralamasına düşebilir).
+        
+        Args:
+            fire_location: (lat, lon)
+            count: İstenen itfaiye sayısı
+            network: RoadNetwork (verilmezse ara nodelarla yoğunlaştırılmış
+                İzmir-Manisa ağı ilk çağrıda bir kez yüklenir ve sonraki
+                çağrılarda yeniden kullanılır)
+            max_snap_km: Olay yeri ile yol ağı arası kabul edilen en uzak mesafe
+        """
+        from advanced_pathfinding import NearestStationSearch
+        
+        if network is None:
+            if self._default_network is None:
+                from network_builder import build_izmir_manisa_network
+                self._default_network = build_izmir_manisa_network(density=DRIVE_TIME_NETWORK_DENSITY)
+            network = self._default_network
+        
+        if self.network_index is None or self.network_index[0] is not network:
+            node_ids = list(network.nodes)
+            self.network_index = (
+                network,
+                node_ids,
+                [network.nodes[nid].lat for nid in node_ids],
+                [network.nodes[nid].lon for nid in node_ids],
+            )
+        _, node_ids, lats, lons = self.network_index
+        
+        fire_lat, fire_lon = fire_location
+        nearest, snap_distances = nearest_indices(fire_lat, fire_lon, lats, lons, k=1)
+        if nearest.size == 0:
+            return []
+        incident_id = node_ids[int(nearest[0])]
+        snap_distance = float(snap_distances[0])
+        if snap_distance > max_snap_km:
+            log.warning("Olay yeri yol ağına çok uzak, sürüş süresi hesaplanmadı",
+                        lat=fire_lat, lon=fire_lon, snap_km=round(snap_distance, 3), max_snap_km=max_snap_km)
+            return []
+        snap_time = snap_distance / SNAP_SPEED_KMH * 60  # dakika
+        
+        search = NearestStationSearch(network, metric='time')
+        routes = search.find_nearest_stations(incident_id, count)
+        
+        fire_stations = []
+        for route in routes:
+            node = network.nodes[route['station_id']]
+            fire_stations.append({
+                'name': route['name'],
+                'coords': (node.lat, node.lon),
+                'distance': route['distance'] + snap_distance,
+                'drive_time': route['estimated_time'] + snap_time,
+                'haversine_distance': self._haversine_distance(fire_lat, fire_lon, node.lat, node.lon),
+                'snap_distance': snap_distance,
+                'path': route['path'],
+                'address': f"{route['name']} - Yol ağı",
+                'phone': '',
+                'website': '',
+                'source': 'Road Network'
+            })
+        
+        log.info("Sürüş süresine göre itfaiyeler bulundu", stations=len(fire_stations),
+                 nodes_explored=search.stats['nodes_explored'])
+        return fire_stations
 
 # Test fonksiyonu
 async def test_fire_station_finder():
@@ -309,6 +413,13 @@ async def test_fire_station_finder():
     
     for i, station in enumerate(multiple, 1):
         print(f"   {i}. {station['name']} - {station['distance']:.1f} km")
+    
+    # Sürüş süresine göre (yol ağı)
+    print(f"\n🛣️ Sürüş süresine göre en yakın 3 itfaiye...")
+    by_drive_time = finder.get_nearest_stations_by_drive_time(test_fire_location, 3)
+    
+    for i, station in enumerate(by_drive_time, 1):
+        print(f"   {i}. {station['name']} - {station['drive_time']:.1f} dk, {station['distance']:.1f} km")
 
 if __name__ == "__main__":
     asyncio.run(test_fire_station_finder())
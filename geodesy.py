@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+🌍 JEODEZİ FONKSİYONLARI 🌍
+Haversine ve yardımcı mesafe hesapları - tekil ve NumPy toplu (batch) sürümler
+
+Formül (Haversine):
+a = sin²(Δφ/2) + cos φ1 × cos φ2 × sin²(Δλ/2)
+c = 2 × asin(√a)
+d = R × c
+
+Kısa mesafeler için (birkaç km altı) eşdikdörtgen (equirectangular) yaklaşım
+çok daha ucuzdur ve hata ihmal edilebilir düzeydedir:
+x = Δλ × cos φm,  y = Δφ,  d = R × √(x² + y²)
+"""
+
+import math
+from typing import Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """İki nokta arası Haversine mesafesi (km)"""
+    lat1_rad, lat2_rad = math.radians(lat1), math.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = math.radians(lon2 - lon1)
+
+    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def to_radians(lat: float, lon: float) -> Tuple[float, float, float]:
+    """(lat_rad, lon_rad, cos(lat)) - tekrar tekrar kullanılacak noktalar için önhesap"""
+    lat_rad = math.radians(lat)
+    return lat_rad, math.radians(lon), math.cos(lat_rad)
+
+
+def haversine_precomputed(point1: Tuple[float, float, float],
+                          point2: Tuple[float, float, float]) -> float:
+    """to_radians() çıktıları arası Haversine (km) - cos(lat) yeniden hesaplanmaz"""
+    lat1_rad, lon1_rad, cos1 = point1
+    lat2_rad, lon2_rad, cos2 = point2
+
+    a = math.sin((lat2_rad - lat1_rad)/2)**2 + cos1 * cos2 * math.sin((lon2_rad - lon1_rad)/2)**2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(1.0, a)))
+
+
+def haversine_pairwise(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Eleman bazında Haversine (km) - girdiler aynı şekle yayınlanabilir diziler"""
+    lat1_rad, lat2_rad = np.radians(lat1), np.radians(lat2)
+    dlat = lat2_rad - lat1_rad
+    dlon = np.radians(np.asarray(lon2) - np.asarray(lon1))
+
+    a = np.sin(dlat/2)**2 + np.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(dlon/2)**2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def haversine_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """Tek noktadan çok noktaya Haversine mesafeleri (km)"""
+    return haversine_pairwise(lat, lon, np.asarray(lats, dtype=np.float64),
+                              np.asarray(lons, dtype=np.float64))
+
+
+def haversine_matrix(lats1, lons1, lats2=None, lons2=None) -> np.ndarray:
+    """
+    Mesafe matrisi (km): sonuç[i, j] = d(nokta1_i, nokta2_j)
+
+    İkinci küme verilmezse birinci kümenin kendi içindeki matrisi döner.
+    """
+    lats1 = np.asarray(lats1, dtype=np.float64)
+    lons1 = np.asarray(lons1, dtype=np.float64)
+    if lats2 is None:
+        lats2, lons2 = lats1, lons1
+    lats2 = np.asarray(lats2, dtype=np.float64)
+    lons2 = np.asarray(lons2, dtype=np.float64)
+
+    return haversine_pairwise(lats1[:, None], lons1[:, None], lats2[None, :], lons2[None, :])
+
+
+def polyline_segment_lengths(lats, lons) -> np.ndarray:
+    """Polyline'ın ardışık noktaları arası segment uzunlukları (km)"""
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    if lats.size < 2:
+        return np.zeros(0)
+    return haversine_pairwise(lats[:-1], lons[:-1], lats[1:], lons[1:])
+
+
+def polyline_length(coords: Sequence[Tuple[float, float]]) -> float:
+    """[(lat, lon), ...] polyline'ın toplam uzunluğu (km)"""
+    if len(coords) < 2:
+        return 0.0
+    points = np.asarray(coords, dtype=np.float64)
+    return float(polyline_segment_lengths(points[:, 0], points[:, 1]).sum())
+
+
+def cos_lat(lats) -> np.ndarray:
+    """Node başına önhesaplanmış cos(lat) - equirectangular ve Haversine için"""
+    return np.cos(np.radians(np.asarray(lats, dtype=np.float64)))
+
+
+def equirectangular_many(lat: float, lon: float, lats, lons) -> np.ndarray:
+    """
+    Kısa mesafeler için hızlı yaklaşık mesafe (km)
+
+    Birkaç km'lik mesafelerde Haversine'den farkı metrenin altındadır;
+    uzun mesafelerde sadece sıralama/ön eleme için kullanılmalıdır.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+
+    mean_lat = np.radians((lats + lat) / 2)
+    x = np.radians(lons - lon) * np.cos(mean_lat)
+    y = np.radians(lats - lat)
+    return EARTH_RADIUS_KM * np.sqrt(x * x + y * y)
+
+
+def nearest_indices(lat: float, lon: float, lats, lons, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Noktaya en yakın k noktanın indeksleri ve mesafeleri (yakından uzağa)
+
+    Tam sıralama yerine argpartition kullanılır: O(n + k log k).
+    """
+    distances = haversine_many(lat, lon, lats, lons)
+    if distances.size == 0 or k <= 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0)
+
+    k = min(k, distances.size)
+    if k < distances.size:
+        candidates = np.argpartition(distances, k - 1)[:k]
+    else:
+        candidates = np.arange(distances.size)
+    order = candidates[np.argsort(distances[candidates], kind="stable")]
+    return order, distances[order]
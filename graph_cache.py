@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+💾 GRAPH BUILD CACHE 💾
+Oluşturulan yol ağlarını içerik adresli (content-addressed) olarak diskte saklar
+
+Anahtar: (bbox, itfaiye listesi, use_osm, density, RoadType ağırlıkları, format
+sürümü, builder kaynak kodu özeti) parametrelerinin SHA-256 özeti. Girdilerden
+biri - pickle'lanan graph'ı üreten veya tanımlayan kod dahil (BUILDER_SOURCES) -
+değiştiğinde anahtar da değişir, eski dosya kendiliğinden geçersiz kalır; aynı girdilerle
+tekrar çalıştırıldığında network hiç oluşturulmadan diskten yüklenir.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from advanced_pathfinding import RoadNetwork, RoadType
+from metrics import record_cache
+from structured_logging import get_logger
+
+log = get_logger(__name__)
+
+# Serileştirme veya builder mantığı değiştiğinde artırılmalı
+CACHE_FORMAT_VERSION = 5
+
+DEFAULT_CACHE_DIR = os.environ.get("GRAPH_CACHE_DIR", ".graph_cache")
+
+
+def road_type_signature() -> List[List]:
+    """RoadType ağırlık/hız tablosu - ağırlıklar değişirse cache geçersizleşir"""
+    return [[rt.code, rt.weight, rt.max_speed] for rt in RoadType]
+
+
+def _builder_sources() -> List:
+    """
+    Cache'lenen graph'ın içeriğini belirleyen kod: builder, pickle'lanan
+    sınıflar (RoadNetwork / Node / Edge / RoadType, compact=True için
+    compact_network), edge mesafelerini hesaplayan geodesy ve bu modül
+    """
+    # network_builder ve compact_network bu modülü (dolaylı) import ettiği için geç import
+    import advanced_pathfinding
+    import compact_network
+    import geodesy
+    import network_builder
+
+    return [network_builder, geodesy, compact_network, sys.modules[__name__],
+            advanced_pathfinding.RoadNetwork, advanced_pathfinding.Node,
+            advanced_pathfinding.Edge, advanced_pathfinding.RoadType]
+
+
+@functools.lru_cache(maxsize=None)
+def builder_source_signature() -> str:
+    """
+    _builder_sources() kaynak kodunun SHA-256 özeti
+
+    Bu kodlardan biri CACHE_FORMAT_VERSION artırılmadan değişse bile eski
+    graph'lar yeniden kullanılmaz. Kaynak okunamazsa (ör. yalnızca .pyc
+    dağıtımı) yalnızca CACHE_FORMAT_VERSION'a güvenilir; o durumda bu
+    modüllerdeki her değişiklikte sürüm artırılmalıdır.
+    """
+    digest = hashlib.sha256()
+    try:
+        for obj in _builder_sources():
+            digest.update(inspect.getsource(obj).encode("utf-8"))
+    except (OSError, TypeError):
+        log.warning("Builder kaynağı okunamadı, cache anahtarı yalnızca format sürümüne dayanıyor")
+        return "unavailable"
+    return digest.hexdigest()
+
+
+def build_cache_key(params: Dict) -> str:
+    """Build parametrelerinden deterministik cache anahtarı üret"""
+    payload = {
+        "format_version": CACHE_FORMAT_VERSION,
+        "road_types": road_type_signature(),
+        "builder_source": builder_source_signature(),
+        **params,
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class GraphBuildCache:
+    """Diskteki serileştirilmiş network deposu"""
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"network_{key}.pkl")
+
+    def load(self, key: str) -> Optional[RoadNetwork]:
+        """Cache'ten network yükle - yoksa veya bozuksa None"""
+        path = self.path_for(key)
+        if not os.path.exists(path):
+            self.misses += 1
+            record_cache('graph_build', False)
+            return None
+
+        try:
+            with open(path, "rb") as f:
+                network = pickle.load(f)
+        except Exception as e:
+            log.warning("Bozuk cache dosyası yok sayılıyor", path=path, error=f"{type(e).__name__}: {e}")
+            self.misses += 1
+            record_cache('graph_build', False)
+            return None
+
+        self.hits += 1
+        record_cache('graph_build', True)
+        return network
+
+    def store(self, key: str, network: RoadNetwork) -> str:
+        """Network'ü atomik olarak diske yaz (yarım yazılmış dosya bırakmaz)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.path_for(key)
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(network, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return path
@@ -0,0 +1,405 @@
+#!/usr/bin/env python3
+"""
+🧩 GRAPH PARTITIONING - TILE TABANLI AĞ 🧩
+Bölge ölçekli yol ağlarını dengeli hücrelere (tile) bölüp ayrı ayrı saklar
+
+Yapı:
+1. Inertial bisection: Node koordinatları ana eksene (PCA) izdüşürülüp medyandan
+   ikiye bölünür; her hücre max_cell_size altına inene kadar tekrarlanır
+2. Her hücre ayrı dosyada saklanır: hücre içi nodelar + hücre içi edge'ler
+3. Overlay graph: hücreler arası (cut) edge'ler + her hücrenin giriş sınır
+   nodelarından çıkış sınır nodelarına kısayollar (hücre içi en kısa yollar)
+4. Sorgu: Sadece başlangıç ve hedef hücreleri yüklenir, aradaki hücreler overlay
+   üzerinden geçilir; kısayollar yol açılırken ilgili tile yüklenerek çözülür
+
+Böylece bir worker tüm bölgeyi RAM'de tutmadan sorgu cevaplayabilir:
+bellekte overlay + en fazla max_loaded_tiles adet tile bulunur.
+"""
+
+import heapq
+import json
+import math
+import os
+import pickle
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from advanced_pathfinding import RoadNetwork, DijkstraPathfinder
+
+MANIFEST_FILE = "manifest.json"
+OVERLAY_FILE = "overlay.pkl"
+CUT_EDGE = -1
+
+
+@dataclass
+class OverlayEdge:
+    """Overlay kenarı - hücreler arası yol veya hücre içi kısayol"""
+    to_node: int
+    weight: float
+    distance: float  # km
+    estimated_time: float  # dakika
+    cell: int = CUT_EDGE  # CUT_EDGE: gerçek yol, >= 0: bu hücre içinden geçen kısayol
+
+
+def inertial_partition(lats: np.ndarray, lons: np.ndarray, max_cell_size: int) -> np.ndarray:
+    """
+    Koordinatları dengeli hücrelere böl (recursive inertial bisection)
+
+    Her adımda noktaların ana ekseni (kovaryansın en büyük özvektörü) bulunur,
+    noktalar bu eksene izdüşürülür ve medyandan ikiye ayrılır. Hücre boyutları
+    en fazla bir node farkla dengelidir.
+
+    Returns:
+        Her nokta için hücre numarası (0'dan başlayan, deterministik)
+    """
+    count = len(lats)
+    cells = np.zeros(count, dtype=np.int32)
+    if count == 0:
+        return cells
+
+    # Eşit-alanlı düzlem yaklaşımı: boylamı ortalama enlemin kosinüsüyle ölçekle
+    lat_arr = np.asarray(lats, dtype=np.float64)
+    lon_arr = np.asarray(lons, dtype=np.float64)
+    points = np.column_stack([lon_arr * math.cos(math.radians(float(lat_arr.mean()))), lat_arr])
+
+    next_cell = 0
+    stack = [np.arange(count)]
+    while stack:
+        indices = stack.pop()
+        if len(indices) <= max_cell_size:
+            cells[indices] = next_cell
+            next_cell += 1
+            continue
+
+        subset = points[indices]
+        centered = subset - subset.mean(axis=0)
+        _, eigenvectors = np.linalg.eigh(centered.T @ centered)
+        projection = centered @ eigenvectors[:, -1]
+
+        order = np.argsort(projection, kind="stable")
+        half = len(indices) // 2
+        # Sol yarı önce numaralansın diye sağ yarı yığına önce konur
+        stack.append(indices[order[half:]])
+        stack.append(indices[order[:half]])
+
+    return cells
+
+
+def _cell_shortcuts(tile: RoadNetwork, source: int,
+                    targets: Set[int]) -> Dict[int, Tuple[float, float, float]]:
+    """Hücre içinde source'tan hedef sınır nodelarına (ağırlık, mesafe, süre)"""
+    weights = {source: 0.0}
+    metrics = {source: (0.0, 0.0)}
+    pq = [(0.0, source)]
+    visited = set()
+    remaining = set(targets)
+    remaining.discard(source)
+    found = {}
+
+    while pq and remaining:
+        current_weight, current_id = heapq.heappop(pq)
+        if current_id in visited:
+            continue
+        visited.add(current_id)
+
+        if current_id in remaining:
+            remaining.discard(current_id)
+            found[current_id] = (current_weight, *metrics[current_id])
+
+        current_distance, current_time = metrics[current_id]
+        for edge in tile.edges.get(current_id, ()):
+            new_weight = current_weight + edge.weight
+            if new_weight < weights.get(edge.to_node, float('inf')):
+                weights[edge.to_node] = new_weight
+                metrics[edge.to_node] = (current_distance + edge.distance,
+                                         current_time + edge.estimated_time)
+                heapq.heappush(pq, (new_weight, edge.to_node))
+
+    return found
+
+
+class GraphPartitioner:
+    """RoadNetwork'ü hücrelere bölüp tile dosyaları + overlay graph olarak kaydeder"""
+
+    def __init__(self, network: RoadNetwork, max_cell_size: int = 5000):
+        if max_cell_size < 1:
+            raise ValueError("max_cell_size en az 1 olmalı")
+        self.network = network
+        self.max_cell_size = max_cell_size
+
+    def partition(self) -> Dict[int, int]:
+        """node_id -> hücre numarası"""
+        node_ids = sorted(self.network.nodes)
+        lats = np.array([self.network.nodes[nid].lat for nid in node_ids])
+        lons = np.array([self.network.nodes[nid].lon for nid in node_ids])
+        cells = inertial_partition(lats, lons, self.max_cell_size)
+        return dict(zip(node_ids, cells.tolist()))
+
+    def save(self, directory: str) -> Dict:
+        """
+        Tile'ları ve overlay graph'ı dizine yaz
+
+        Returns:
+            Manifest (hücre sayısı, sınır node sayısı, dosya adları vb.)
+        """
+        start_time = time.time()
+        os.makedirs(directory, exist_ok=True)
+
+        node_to_cell = self.partition()
+        cell_nodes: Dict[int, List[int]] = defaultdict(list)
+        for node_id, cell in node_to_cell.items():
+            cell_nodes[cell].append(node_id)
+
+        print(f"🧩 Network {len(cell_nodes)} hücreye bölündü (max {self.max_cell_size} node/hücre)")
+
+        # Hücreler arası edge'ler ve sınır nodeları
+        overlay: Dict[int, List[OverlayEdge]] = defaultdict(list)
+        entries: Dict[int, Set[int]] = defaultdict(set)
+        exits: Dict[int, Set[int]] = defaultdict(set)
+        cut_edge_count = 0
+
+        for from_id, edges in self.network.edges.items():
+            from_cell = node_to_cell[from_id]
+            for edge in edges:
+                to_cell = node_to_cell[edge.to_node]
+                if from_cell == to_cell:
+                    continue
+                overlay[from_id].append(OverlayEdge(edge.to_node, edge.weight, edge.distance,
+                                                    edge.estimated_time, CUT_EDGE))
+                exits[from_cell].add(from_id)
+                entries[to_cell].add(edge.to_node)
+                cut_edge_count += 1
+
+        # Tile dosyaları + hücre içi kısayollar (giriş -> çıkış)
+        cells_info = {}
+        shortcut_count = 0
+        for cell, nodes in sorted(cell_nodes.items()):
+            tile = self.network.induced_subgraph(nodes)
+            file_name = f"tile_{cell:05d}.pkl"
+            with open(os.path.join(directory, file_name), "wb") as f:
+                pickle.dump(tile, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+            for entry in sorted(entries[cell]):
+                for exit_id, (weight, distance, minutes) in _cell_shortcuts(tile, entry, exits[cell]).items():
+                    overlay[entry].append(OverlayEdge(exit_id, weight, distance, minutes, cell))
+                    shortcut_count += 1
+
+            lats = [self.network.nodes[nid].lat for nid in nodes]
+            lons = [self.network.nodes[nid].lon for nid in nodes]
+            cells_info[cell] = {
+                'file': file_name,
+                'nodes': len(nodes),
+                'boundary_nodes': len(entries[cell] | exits[cell]),
+                'bbox': [min(lats), min(lons), max(lats), max(lons)],
+            }
+
+        node_ids = np.array(sorted(node_to_cell), dtype=np.int64)
+        node_cells = np.array([node_to_cell[nid] for nid in node_ids.tolist()], dtype=np.int32)
+
+        with open(os.path.join(directory, OVERLAY_FILE), "wb") as f:
+            pickle.dump({
+                'node_ids': node_ids,
+                'node_cells': node_cells,
+                'overlay': dict(overlay),
+                'fire_stations': list(self.network.fire_stations),
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        manifest = {
+            'max_cell_size': self.max_cell_size,
+            'node_count': self.network.node_count(),
+            'edge_count': self.network.edge_count(),
+            'cell_count': len(cells_info),
+            'cut_edges': cut_edge_count,
+            'shortcuts': shortcut_count,
+            'overlay_file': OVERLAY_FILE,
+            'cells': {str(cell): info for cell, info in cells_info.items()},
+        }
+        with open(os.path.join(directory, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        print(f"✅ {len(cells_info)} tile kaydedildi: {cut_edge_count} cut edge, "
+              f"{shortcut_count} kısayol ({time.time() - start_time:.2f} s)")
+
+        return manifest
+
+
+class TiledRoadNetwork:
+    """
+    Diskteki tile'lar üzerinde sorgu - tile'lar ihtiyaç oldukça yüklenir
+
+    Bellekte sadece overlay graph ve LRU ile sınırlı sayıda tile tutulur.
+    """
+
+    def __init__(self, directory: str, max_loaded_tiles: int = 8):
+        self.directory = directory
+        self.max_loaded_tiles = max(2, max_loaded_tiles)
+
+        with open(os.path.join(directory, MANIFEST_FILE), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(directory, self.manifest['overlay_file']), "rb") as f:
+            data = pickle.load(f)
+
+        self._node_ids: np.ndarray = data['node_ids']
+        self._node_cells: np.ndarray = data['node_cells']
+        self.overlay: Dict[int, List[OverlayEdge]] = data['overlay']
+        self.fire_stations: List[int] = data['fire_stations']
+        self._tiles: "OrderedDict[int, RoadNetwork]" = OrderedDict()
+        self.tile_loads = 0
+
+    def cell_of(self, node_id: int) -> Optional[int]:
+        """Node'un bulunduğu hücre (bilinmeyen node için None)"""
+        index = int(np.searchsorted(self._node_ids, node_id))
+        if index >= len(self._node_ids) or int(self._node_ids[index]) != node_id:
+            return None
+        return int(self._node_cells[index])
+
+    def load_tile(self, cell: int) -> RoadNetwork:
+        """Tile'ı getir - gerekirse diskten yükle, LRU sınırını aşanı bırak"""
+        tile = self._tiles.get(cell)
+        if tile is not None:
+            self._tiles.move_to_end(cell)
+            return tile
+
+        file_name = self.manifest['cells'][str(cell)]['file']
+        with open(os.path.join(self.directory, file_name), "rb") as f:
+            tile = pickle.load(f)
+        self.tile_loads += 1
+
+        self._tiles[cell] = tile
+        while len(self._tiles) > self.max_loaded_tiles:
+            self._tiles.popitem(last=False)
+
+        return tile
+
+    def loaded_tiles(self) -> List[int]:
+        return list(self._tiles)
+
+    def find_shortest_path(self, start_id: int, end_id: int) -> Optional[Dict]:
+        """
+        Tile'lar üzerinde en kısa yol (Dijkstra)
+
+        Başlangıç/hedef hücrelerinde tam tile kullanılır; diğer hücrelerde
+        sadece sınır nodeları ve kısayollar gezilir.
+        """
+        start_time = time.time()
+        stats = {'nodes_explored': 0, 'edges_relaxed': 0, 'execution_time': 0.0,
+                 'tiles_loaded': 0}
+
+        start_cell = self.cell_of(start_id)
+        end_cell = self.cell_of(end_id)
+        if start_cell is None or end_cell is None:
+            return None
+
+        loads_before = self.tile_loads
+        active = {start_cell: self.load_tile(start_cell), end_cell: self.load_tile(end_cell)}
+
+        distances = {start_id: 0.0}
+        previous: Dict[int, Optional[Tuple[int, object]]] = {start_id: None}
+        pq = [(0.0, start_id)]
+        visited = set()
+
+        while pq:
+            current_dist, current_id = heapq.heappop(pq)
+            if current_id in visited:
+                continue
+            visited.add(current_id)
+            stats['nodes_explored'] += 1
+
+            if current_id == end_id:
+                break
+
+            current_cell = self.cell_of(current_id)
+            tile = active.get(current_cell)
+            overlay_edges = self.overlay.get(current_id, ())
+
+            if tile is not None:
+                # Aktif hücre: tam yol ağı + hücreden çıkan cut edge'ler
+                hops = list(tile.edges.get(current_id, ()))
+                hops.extend(e for e in overlay_edges if e.cell == CUT_EDGE)
+            else:
+                # Diğer hücreler: sadece overlay (kısayol + cut edge)
+                hops = overlay_edges
+
+            for hop in hops:
+                neighbor_id = hop.to_node
+                if neighbor_id in visited:
+                    continue
+
+                new_dist = current_dist + hop.weight
+                stats['edges_relaxed'] += 1
+
+                if new_dist < distances.get(neighbor_id, float('inf')):
+                    distances[neighbor_id] = new_dist
+                    previous[neighbor_id] = (current_id, hop)
+                    heapq.heappush(pq, (new_dist, neighbor_id))
+
+        if end_id not in visited:
+            return None
+
+        path, total_distance, total_time = self._unpack_path(previous, end_id)
+
+        stats['tiles_loaded'] = self.tile_loads - loads_before
+        stats['execution_time'] = time.time() - start_time
+
+        return {
+            'path': path,
+            'distance': total_distance,
+            'weight': distances[end_id],
+            'estimated_time': total_time,
+            'stats': stats,
+            'algorithm': 'Tiled Dijkstra'
+        }
+
+    def _unpack_path(self, previous: Dict, end_id: int) -> Tuple[List[int], float, float]:
+        """Overlay yolunu gerçek node dizisine aç (kısayollar tile içinde çözülür)"""
+        reversed_path = [end_id]
+        total_distance = 0.0
+        total_time = 0.0
+
+        current = end_id
+        while previous[current] is not None:
+            from_id, hop = previous[current]
+
+            if isinstance(hop, OverlayEdge) and hop.cell != CUT_EDGE:
+                segment = DijkstraPathfinder(self.load_tile(hop.cell), stats_level='off').find_shortest_path(
+                    from_id, current)
+                reversed_path.extend(reversed(segment['path'][:-1]))
+                total_distance += segment['distance']
+                total_time += segment['estimated_time']
+            else:
+                reversed_path.append(from_id)
+                total_distance += hop.distance
+                total_time += hop.estimated_time
+
+            current = from_id
+
+        reversed_path.reverse()
+        return reversed_path, total_distance, total_time
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import tempfile
+    from network_builder import build_izmir_manisa_network
+
+    print("🧩 Graph Partitioning Test Ediliyor...\n")
+
+    network = build_izmir_manisa_network(density=10)
+    directory = tempfile.mkdtemp(prefix="tiles_")
+    GraphPartitioner(network, max_cell_size=400).save(directory)
+
+    tiled = TiledRoadNetwork(directory, max_loaded_tiles=4)
+    start_id, end_id = network.fire_stations[0], network.fire_stations[-1]
+
+    expected = DijkstraPathfinder(network).find_shortest_path(start_id, end_id)
+    result = tiled.find_shortest_path(start_id, end_id)
+
+    print(f"\n📏 Tam ağ:   {expected['weight']:.4f} ({expected['stats']['nodes_explored']} node)")
+    print(f"📏 Tile ağı: {result['weight']:.4f} ({result['stats']['nodes_explored']} node, "
+          f"{result['stats']['tiles_loaded']} tile yüklendi)")
+    print(f"🧠 Bellekteki tile'lar: {tiled.loaded_tiles()}")
+    print("\n✅ Test tamamlandı!")
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+🔥 EŞZAMANLI YÜK BENCHMARK'I 🔥
+Çok sayıda eşzamanlı yangın ihbarında FireEmergencySystem.analyze_fire_location
+
+Bölgesel bir orman yangını dalgasında sistem aynı anda onlarca ihbarı
+analiz etmek zorunda kalır. Bu modül:
+1. OSRM, OpenWeather ve TomTom için yerel stub sunucular başlatır
+   (ayrı bir thread'in event loop'unda; gecikme, jitter ve hata enjeksiyonu)
+2. config'teki servis adreslerini stub'lara yönlendirir
+3. N ihbarı en fazla C eşzamanlı analiz ile çalıştırır
+4. Ölçer: verim (analiz/sn), gecikme (p50/p90/p99), sonuç dağılımı ve
+   event loop tıkanması (loop lag monitörü - async kod içindeki bloklayan
+   çağrılar burada görünür)
+5. --trace ile en yavaş ihbarın aşama dökümünü yazdırır ve son çalıştırmanın
+   span'lerini Chrome trace formatında kaydeder
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import logging
+import random
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import polyline
+from aiohttp import web
+
+import config
+from benchmark_harness import summarize_latencies
+from geodesy import haversine
+from metrics import serve_metrics
+from query_log import disable_query_log, enable_query_log
+from tracing import enable_tracing, print_breakdown, print_stage_totals
+
+SERVICES = ('osrm', 'openweather', 'tomtom')
+
+# config'te her servisin adres değişkeni
+SERVICE_URL_SETTINGS = {
+    'osrm': 'OSRM_BASE_URL',
+    'openweather': 'OPENWEATHER_BASE_URL',
+    'tomtom': 'TOMTOM_BASE_URL',
+}
+
+# İhbarların üretildiği bölge (İzmir çevresi): (min_lat, max_lat, min_lon, max_lon)
+INCIDENT_BOUNDS = (38.20, 38.70, 26.80, 27.50)
+
+# Stub OSRM yanıtındaki adımların yol tipleri (talimat metninden çıkarılır)
+STUB_ROAD_TYPES = ('primary', 'secondary', 'tertiary', 'residential', 'trunk')
+
+
+@dataclass
+class StubProfile:
+    """Bir stub servisin davranışı"""
+    latency_ms: float = 50.0
+    jitter_ms: float = 10.0
+    error_rate: float = 0.0
+    error_status: int = 503
+
+
+class StubServers:
+    """
+    OSRM / OpenWeather / TomTom taklidi yapan yerel HTTP sunucuları
+
+    Sunucular kendi thread'inde, ayrı bir event loop'ta çalışır; test edilen
+    koddaki bloklayan (senkron) istekler de kilitlenmeden yanıt alır.
+
+    Kullanım:
+        with StubServers({'osrm': StubProfile(latency_ms=120)}) as urls:
+            urls['osrm']  # "http://127.0.0.1:<port>"
+    """
+
+    def __init__(self, profiles: Optional[Dict[str, StubProfile]] = None, seed: int = 42):
+        profiles = profiles or {}
+        unknown = [name for name in profiles if name not in SERVICES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen servis: {', '.join(unknown)}")
+        self.profiles = {name: profiles.get(name, StubProfile()) for name in SERVICES}
+        self.rngs = {name: random.Random(f"{seed}-{name}") for name in SERVICES}
+        self.requests = {name: 0 for name in SERVICES}
+        self.errors = {name: 0 for name in SERVICES}
+        self.urls: Dict[str, str] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._runners: List[web.AppRunner] = []
+
+    def __enter__(self) -> Dict[str, str]:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def start(self) -> Dict[str, str]:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.urls = asyncio.run_coroutine_threadsafe(self._start_all(), self._loop).result(timeout=10)
+        return self.urls
+
+    def stop(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._stop_all(), self._loop).result(timeout=10)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    async def _start_all(self) -> Dict[str, str]:
+        routes = {
+            'osrm': [web.get('/route/v1/{profile}/{coords}', self._osrm_route)],
+            'openweather': [web.get('/data/2.5/weather', self._weather)],
+            'tomtom': [web.get('/search/2/poiSearch/{query}', self._poi_search),
+                       web.get('/traffic/services/4/flowSegmentData/{style}/{zoom}/json',
+                               self._flow_segment)],
+        }
+        urls = {}
+        for service in SERVICES:
+            app = web.Application()
+            app.add_routes(routes[service])
+            runner = web.AppRunner(app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, '127.0.0.1', 0)
+            await site.start()
+            self._runners.append(runner)
+            host, port = runner.addresses[0][:2]
+            urls[service] = f"http://{host}:{port}"
+        return urls
+
+    async def _stop_all(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+    async def _inject(self, service: str) -> Optional[web.Response]:
+        """Gecikmeyi uygula; hata enjekte edilecekse hata yanıtını döndür"""
+        profile, rng = self.profiles[service], self.rngs[service]
+        self.requests[service] += 1
+        delay_ms = max(0.0, profile.latency_ms + rng.uniform(-profile.jitter_ms, profile.jitter_ms))
+        await asyncio.sleep(delay_ms / 1000)
+        if rng.random() < profile.error_rate:
+            self.errors[service] += 1
+            return web.json_response({'error': 'enjekte edilmiş hata'}, status=profile.error_status)
+        return None
+
+    async def _osrm_route(self, request: web.Request) -> web.Response:
+        error = await self._inject('osrm')
+        if error is not None:
+            return error
+
+        (lon1, lat1), (lon2, lat2) = [tuple(map(float, point.split(',')))
+                                      for point in request.match_info['coords'].split(';')]
+        points = [(lat1 + (lat2 - lat1) * i / 20, lon1 + (lon2 - lon1) * i / 20) for i in range(21)]
+        distance = haversine(lat1, lon1, lat2, lon2) * 1000 * 1.3
+        steps = [{'maneuver': {'instruction': f"Continue on {road_type} road"}}
+                 for road_type in STUB_ROAD_TYPES]
+        return web.json_response({
+            'code': 'Ok',
+            'routes': [{
+                'geometry': polyline.encode(points),
+                'distance': distance,
+                'duration': distance / 12.0,
+                'legs': [{'steps': steps}],
+            }],
+        })
+
+    async def _weather(self, request: web.Request) -> web.Response:
+        error = await self._inject('openweather')
+        if error is not None:
+            return error
+        return web.json_response({
+            'weather': [{'main': 'Clear'}],
+            'main': {'temp': 31.0, 'humidity': 22},
+            'wind': {'speed': 6.5},
+            'visibility': 10000,
+        })
+
+    async def _poi_search(self, request: web.Request) -> web.Response:
+        error = await self._inject('tomtom')
+        if error is not None:
+            return error
+
+        lat, lon = float(request.query['lat']), float(request.query['lon'])
+        return web.json_response({'results': [
+            {
+                'position': {'lat': lat + dlat, 'lon': lon + dlon},
+                'poi': {'name': f"Stub Fire Station {index}", 'categorySet': [{'id': '7392'}]},
+                'address': {'freeformAddress': f"Stub Adres {index}"},
+            }
+            for index, (dlat, dlon) in enumerate(((0.02, 0.01), (-0.03, 0.02), (0.05, -0.04)))
+        ]})
+
+    async def _flow_segment(self, request: web.Request) -> web.Response:
+        error = await self._inject('tomtom')
+        if error is not None:
+            return error
+        return web.json_response({'flowSegmentData': {
+            'currentSpeed': 42, 'freeFlowSpeed': 60, 'confidence': 0.9,
+        }})
+
+
+class LoopLagMonitor:
+    """
+    Event loop gecikme monitörü
+
+    interval aralıklarla uyur ve uyanmanın ne kadar geciktiğini ölçer; gecikme
+    loop'un o süre boyunca başka bir iş tarafından bloklandığını gösterir.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples_ns: List[int] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        clock = time.perf_counter_ns
+        interval_ns = int(self.interval * 1e9)
+        while True:
+            start = clock()
+            await asyncio.sleep(self.interval)
+            self.samples_ns.append(max(0, clock() - start - interval_ns))
+
+    def start(self) -> None:
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> Dict:
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        return self.summary()
+
+    def summary(self, blocked_threshold_ms: float = 10.0) -> Dict:
+        """Gecikme özeti; blocked_threshold_ms üstündeki gecikmeler tıkanma sayılır"""
+        if not self.samples_ns:
+            return {'samples': 0, 'max_ms': 0.0, 'p99_ms': 0.0, 'blocked_ms': 0.0, 'stalls': 0}
+        stats = summarize_latencies(self.samples_ns)
+        stalls = [sample / 1e6 for sample in self.samples_ns if sample / 1e6 > blocked_threshold_ms]
+        return {
+            'samples': stats['count'],
+            'max_ms': stats['max_ms'],
+            'p99_ms': stats['p99_ms'],
+            'blocked_ms': sum(stalls),
+            'stalls': len(stalls),
+        }
+
+
+def generate_incidents(count: int, seed: int = 42,
+                       bounds: Tuple[float, float, float, float] = INCIDENT_BOUNDS) -> List[Tuple[float, float]]:
+    """Sabit seed ile bölge içinde rastgele yangın noktaları"""
+    rng = random.Random(seed)
+    min_lat, max_lat, min_lon, max_lon = bounds
+    return [(rng.uniform(min_lat, max_lat), rng.uniform(min_lon, max_lon)) for _ in range(count)]
+
+
+def classify_outcome(result: Dict) -> str:
+    """Analiz sonucunu sınıflandır: ok / degraded (optimizasyon başarısız) / failed"""
+    if 'error' in result:
+        return 'failed'
+    if 'error' in result.get('smart_optimization', {}):
+        return 'degraded'
+    return 'ok'
+
+
+class LoadBenchmark:
+    """
+    Eşzamanlı analiz yük testi
+
+    Kullanım:
+        benchmark = LoadBenchmark(incidents=200, profiles={'osrm': StubProfile(latency_ms=150)})
+        report = benchmark.run(concurrency=50)
+    """
+
+    def __init__(self, incidents: int = 100, seed: int = 42,
+                 profiles: Optional[Dict[str, StubProfile]] = None, quiet: bool = True):
+        self.incidents = generate_incidents(incidents, seed)
+        self.seed = seed
+        self.profiles = profiles or {}
+        self.quiet = quiet
+
+    def run(self, concurrency: int = 10) -> Dict:
+        """Stub sunucuları başlat, config adreslerini yönlendir ve yükü çalıştır"""
+        servers = StubServers(self.profiles, seed=self.seed)
+        saved = {setting: getattr(config, setting) for setting in SERVICE_URL_SETTINGS.values()}
+        output = io.StringIO()
+        try:
+            urls = servers.start()
+            for service, setting in SERVICE_URL_SETTINGS.items():
+                setattr(config, setting, urls[service])
+            if self.quiet:
+                logging.disable(logging.CRITICAL)
+            with contextlib.redirect_stdout(output if self.quiet else sys.stdout):
+                report = asyncio.run(self._drive(concurrency))
+        finally:
+            logging.disable(logging.NOTSET)
+            for setting, value in saved.items():
+                setattr(config, setting, value)
+            servers.stop()
+
+        report['stub_requests'] = dict(servers.requests)
+        report['stub_errors'] = dict(servers.errors)
+        return report
+
+    async def _drive(self, concurrency: int) -> Dict:
+        from fire_emergency_system import FireEmergencySystem
+
+        system = FireEmergencySystem()
+        semaphore = asyncio.Semaphore(concurrency)
+        latencies: List[int] = []
+        outcomes = {'ok': 0, 'degraded': 0, 'failed': 0, 'exception': 0}
+        clock = time.perf_counter_ns
+
+        async def analyze(lat: float, lon: float) -> None:
+            async with semaphore:
+                start = clock()
+                try:
+                    outcome = classify_outcome(await system.analyze_fire_location(lat, lon))
+                except Exception:
+                    outcome = 'exception'
+                latencies.append(clock() - start)
+                outcomes[outcome] += 1
+
+        monitor = LoopLagMonitor()
+        monitor.start()
+        wall_start = clock()
+        await asyncio.gather(*(analyze(lat, lon) for lat, lon in self.incidents))
+        wall_s = (clock() - wall_start) / 1e9
+        loop_lag = await monitor.stop()
+
+        latency = summarize_latencies(latencies)
+        latency.pop('qps', None)  # sıralı qps eşzamanlı çalışmada anlamsız
+        return {
+            'incidents': len(self.incidents),
+            'concurrency': concurrency,
+            'wall_s': wall_s,
+            'throughput': len(self.incidents) / wall_s if wall_s > 0 else 0.0,
+            'latency': latency,
+            'outcomes': outcomes,
+            'loop_lag': loop_lag,
+            'blocked_ratio': loop_lag['blocked_ms'] / 1000 / wall_s if wall_s > 0 else 0.0,
+        }
+
+
+def print_load_report(reports: Sequence[Dict]) -> None:
+    """Eşzamanlılık seviyesi başına özet tablo"""
+    print(f"{'Eşzamanlı':>9} {'analiz/sn':>10} {'p50 (ms)':>10} {'p90 (ms)':>10} {'p99 (ms)':>10} "
+          f"{'ok/deg/fail':>12} {'loop maks (ms)':>15} {'bloklu':>8}")
+    print("-" * 92)
+    for report in reports:
+        latency, outcomes = report['latency'], report['outcomes']
+        outcome_text = (f"{outcomes['ok']}/{outcomes['degraded']}/"
+                        f"{outcomes['failed'] + outcomes['exception']}")
+        print(f"{report['concurrency']:>9} {report['throughput']:>10.1f} {latency['p50_ms']:>10.1f} "
+              f"{latency['p90_ms']:>10.1f} {latency['p99_ms']:>10.1f} {outcome_text:>12} "
+              f"{report['loop_lag']['max_ms']:>15.1f} {report['blocked_ratio']:>7.0%}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Eşzamanlı yangın analizi yük testi (yerel stub servislerle)")
+    parser.add_argument('--incidents', type=int, default=100, help="Toplam ihbar sayısı")
+    parser.add_argument('--concurrency', default="1,10,50",
+                        help="Virgülle ayrılmış eşzamanlılık seviyeleri (ör. 1,10,50)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Stub servis gecikmesi (ms)")
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help="Gecikme jitter'ı (± ms)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Hata enjeksiyon oranı (0-1)")
+    parser.add_argument('--osrm-latency-ms', type=float, default=None,
+                        help="Yalnız OSRM için gecikme (varsayılan: --latency-ms)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--verbose', action='store_true', help="Sistem çıktısını bastırma")
+    parser.add_argument('--trace', metavar='PATH', default=None,
+                        help="Aşama span'lerini kaydet (Chrome trace JSON) ve en yavaş ihbarı dök")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Çalışma boyunca Prometheus /metrics uç noktasını bu portta aç")
+    parser.add_argument('--query-log', metavar='PATH', default=None,
+                        help="Analizleri sorgu kaydına ekle (python query_log.py PATH ile yeniden oynatılır)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    profiles = {service: StubProfile(args.latency_ms, args.jitter_ms, args.error_rate)
+                for service in SERVICES}
+    if args.osrm_latency_ms is not None:
+        profiles['osrm'] = StubProfile(args.osrm_latency_ms, args.jitter_ms, args.error_rate)
+
+    print("🔥 Eşzamanlı Yük Benchmark'ı")
+    print(f"   📊 {args.incidents} ihbar, stub gecikmesi {args.latency_ms:.0f}±{args.jitter_ms:.0f} ms, "
+          f"hata oranı %{args.error_rate * 100:.0f}\n")
+
+    if args.metrics_port is not None:
+        serve_metrics(args.metrics_port)
+        print(f"   📈 Metrikler: http://127.0.0.1:{args.metrics_port}/metrics\n")
+
+    query_log = enable_query_log(args.query_log) if args.query_log else None
+
+    tracer = enable_tracing(capacity=max(10_000, args.incidents * 40)) if args.trace else None
+    benchmark = LoadBenchmark(args.incidents, seed=args.seed, profiles=profiles, quiet=not args.verbose)
+    reports = []
+    for level in (int(value) for value in args.concurrency.split(',')):
+        if tracer:
+            tracer.clear()
+        reports.append(benchmark.run(concurrency=level))
+        print(f"   ✅ {level} eşzamanlı: {reports[-1]['throughput']:.1f} analiz/sn")
+
+    print()
+    print_load_report(reports)
+    print(f"\n📡 Stub istekleri (son çalıştırma): {reports[-1]['stub_requests']}")
+    if query_log:
+        print(f"🗂️  {query_log.count} analiz sorgu kaydına eklendi: {args.query_log}")
+        disable_query_log()
+
+    if tracer:
+        slowest = tracer.slowest_traces(1, name='route.analyze_emergency_route')
+        if slowest:
+            print(f"\n🐢 En yavaş ihbar ({slowest[0]['duration_ms']:.1f} ms, "
+                  f"{reports[-1]['concurrency']} eşzamanlı):")
+            print_breakdown(tracer, slowest[0]['trace_id'])
+        print("\n📊 Aşama toplamları:")
+        print_stage_totals(tracer)
+        tracer.export_chrome_trace(args.trace)
+        print(f"\n💾 Chrome trace kaydedildi: {args.trace} (chrome://tracing veya ui.perfetto.dev)")
+    return 0
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    sys.exit(main())
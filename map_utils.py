@@ -4,9 +4,15 @@
 Folium harita oluşturma ve görselleştirme fonksiyonları - Tali yolları önceliklendir
 """
 
+import logging
+import time
 import folium
 from typing import Dict, Tuple
 from fire_stations import categorize_fire_stations
+from structured_logging import get_logger
+import config
+
+log = get_logger(__name__)
 
 
 def create_interactive_map(fire_stations: Dict[str, Tuple[float, float]]) -> str:
@@ -58,6 +64,7 @@ def create_emergency_route_map(
     route_info: Dict
 ) -> str:
     """Acil durum rota haritası oluştur - Tali yolları önceliklendir"""
+    render_start = time.perf_counter()
     # Harita merkezi (yangın noktası ve en yakın itfaiye arasında)
     fire_lat, fire_lon = fire_location
     station_coords = fire_stations[nearest_station]
@@ -90,18 +97,18 @@ def create_emergency_route_map(
     
     # Rotayı çiz
     route_drawn = False
+    drawn_with = None
+    point_count = 0
     
     # OSRM geometrisi varsa onu kullan
     if route_info.get('decoded_geometry') and 'coordinates' in route_info['decoded_geometry']:
         try:
             coords = route_info['decoded_geometry']['coordinates']
-            print(f"✅ Decoded OSRM geometrisi bulundu: {len(coords)} nokta")
         except:
             coords = []
     elif route_info.get('geometry') and len(route_info['geometry']) > 0:
         try:
             coords = route_info['geometry']
-            print(f"✅ OSRM geometrisi bulundu: {len(coords)} nokta")
             
             # Rota türüne göre renk ve kalınlık belirle
             route_type = route_info.get('route_type', 'N/A')
@@ -147,20 +154,18 @@ def create_emergency_route_map(
                     tooltip=tooltip_text
                 ).add_to(m)
                 route_drawn = True
-                print(f"✅ Gerçek rota geometrisi çizildi ({len(valid_coords)} nokta)")
-                print(f"   🎨 Rota türü: {route_type} - Renk: {color} - Kalınlık: {weight}")
-                print(f"   🗺️ Arazi türü: {terrain_type} - Tali yol oranı: {secondary_ratio*100:.1f}%")
+                drawn_with = 'geometry'
+                point_count = len(valid_coords)
+                log.debug("Rota geometrisi çizildi", points=point_count, route_type=route_type,
+                          color=color, terrain_type=terrain_type, secondary_ratio=secondary_ratio)
             else:
-                print("⚠️ Geçersiz koordinatlar bulundu, fallback kullanılıyor")
+                log.warning("Geçersiz rota koordinatları, fallback kullanılıyor", points=len(coords))
                 
-        except Exception as e:
-            print(f"⚠️ Route geometri hatası: {e}")
-            print("⚠️ Fallback rota çizimi kullanılıyor")
+        except Exception:
+            log.exception("Rota geometri hatası, fallback kullanılıyor", level=logging.WARNING)
     
     # OSRM geometrisi yoksa veya hatalıysa fallback olarak OSRM ile rota çiz
     if not route_drawn:
-        print("🔄 OSRM ile fallback rota çizimi yapılıyor...")
-        
         # Basit rota çizimi
         coords = f"{station_coords[1]},{station_coords[0]};{fire_lon},{fire_lat}"
         
@@ -192,7 +197,7 @@ def create_emergency_route_map(
         for profile, profile_name, color, weight in profiles:
             try:
                 import requests
-                url = f"https://router.project-osrm.org/route/v1/{profile}/{coords}"
+                url = f"{config.OSRM_BASE_URL}/route/v1/{profile}/{coords}"
                 params = {
                     'overview': 'full',
                     'geometries': 'geojson',
@@ -216,17 +221,18 @@ def create_emergency_route_map(
                             tooltip=f"🛣️ {profile_name}: {route_info.get('distance', 0):.1f} km"
                         ).add_to(m)
                         route_drawn = True
-                        print(f"✅ {profile_name} profili ile rota çizildi")
-                        print(f"   🎨 Renk: {color}, Kalınlık: {weight}")
-                        print(f"   📍 {len(geo_latlon)} nokta ile rota çizildi")
+                        drawn_with = f"osrm_{profile}"
+                        point_count = len(geo_latlon)
                         break
-            except Exception as e:
-                print(f"⚠️ {profile_name} hatası: {e}")
+            except Exception:
+                log.exception("Fallback rota profili hatası", level=logging.WARNING, profile=profile)
                 continue
     
     # Hiçbir rota çizilemezse basit çizgi çiz
     if not route_drawn:
-        print("⚠️ Hiçbir rota çizilemedi, basit çizgi çiziliyor...")
+        log.warning("Hiçbir rota çizilemedi, basit çizgi çiziliyor", station=nearest_station)
+        drawn_with = 'straight_line'
+        point_count = 2
         folium.PolyLine(
             [station_coords, fire_location],
             weight=3,
@@ -234,7 +240,6 @@ def create_emergency_route_map(
             opacity=0.6,
             tooltip="⚠️ Basit rota (OSRM hatası)"
         ).add_to(m)
-        print("✅ Basit çizgi rota çizildi")
     
     # Bilgi kutusu ekle
     info_html = f"""
@@ -266,4 +271,6 @@ def create_emergency_route_map(
     # Harita dosyasını kaydet
     map_file = "emergency_route_map.html"
     m.save(map_file)
+    log.info("Acil durum haritası oluşturuldu", file=map_file, drawn_with=drawn_with,
+             points=point_count, duration_ms=round((time.perf_counter() - render_start) * 1000, 3))
     return map_file
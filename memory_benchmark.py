@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+🧠 BELLEK BENCHMARK'I 🧠
+Graph gösterimlerinin ve aramaların bellek maliyeti (tracemalloc + RSS)
+
+Ölçülenler (gösterim başına: sözlük tabanlı RoadNetwork / CompactRoadNetwork):
+1. Ağ boyutu     : oluşturma sırasında ayrılan bellek, byte/node ve byte/edge
+                   (sorgulardan sonra lazy önbellekler - ters komşuluk,
+                   radyan koordinatlar, CSR - dahil edilerek tekrar ölçülür)
+2. Sorgu başına  : tek bir find_shortest_path çağrısının tepe (peak) ayrımı
+3. Arama durumu  : arama fonksiyonu dönerken canlı olan ayrımların satır
+                   bazında dökümü (g_score / previous / heap / visited ...)
+4. RSS           : ölçüm boyunca arka planda örneklenen süreç RSS'i
+
+tracemalloc kendisi Python ayrımlarını yavaşlatır; burada süreler değil
+byte'lar raporlanır.
+"""
+
+import gc
+import linecache
+import os
+import sys
+import threading
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from advanced_pathfinding import (
+    RoadNetwork, DijkstraPathfinder, AStarPathfinder, BidirectionalAStar
+)
+from compact_network import CompactRoadNetwork
+
+ENGINES = {
+    'dijkstra': DijkstraPathfinder,
+    'astar': AStarPathfinder,
+    'bidirectional_astar': BidirectionalAStar,
+}
+
+# Dönüşünde arama durumunun hâlâ canlı olduğu fonksiyonlar (ilk eşleşen kullanılır)
+SEARCH_FUNCTIONS = ('_search_plain', '_search_counted', '_find_with_queue', 'find_shortest_path')
+
+# Arama durumu dökümünde dikkate alınan kaynak dosyalar
+TRACED_FILES = ('*advanced_pathfinding.py', '*compact_network.py', '*priority_queues.py')
+
+
+def rss_bytes() -> int:
+    """Süreç RSS'i (byte) - Linux'ta /proc, diğerlerinde tepe RSS"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RSSSampler:
+    """
+    Arka plan thread'i ile RSS örnekleme
+
+    Kullanım:
+        with RSSSampler(interval=0.01) as sampler:
+            ...
+        sampler.peak, sampler.start_rss
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start_rss = 0
+        self.peak = 0
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak = max(self.peak, rss_bytes())
+            self.samples += 1
+
+    def __enter__(self) -> 'RSSSampler':
+        self.start_rss = self.peak = rss_bytes()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+
+def traced_allocation(func: Callable) -> Tuple[object, int, int]:
+    """
+    func() çalışırken ayrılan bellek (tracemalloc açık olmalı)
+
+    Returns:
+        (sonuç, kalıcı byte, tepe byte) - ikisi de çağrı öncesine göre
+    """
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    tracemalloc.reset_peak()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    return result, current - before, peak - before
+
+
+def search_state_allocations(func: Callable, limit: int = 8) -> List[Dict]:
+    """
+    Arama fonksiyonu dönerken canlı olan ayrımlar (satır bazında, büyükten küçüğe)
+
+    sys.setprofile ile SEARCH_FUNCTIONS'tan biri dönerken snapshot alınır;
+    bu anda arama durumu (dict'ler, heap, visited) henüz serbest bırakılmamıştır.
+    """
+    snapshots = []
+
+    def hook(frame, event, arg):
+        if event == 'return' and not snapshots and frame.f_code.co_name in SEARCH_FUNCTIONS:
+            snapshots.append(tracemalloc.take_snapshot())
+
+    filters = [tracemalloc.Filter(True, pattern) for pattern in TRACED_FILES]
+    gc.collect()
+    before = tracemalloc.take_snapshot().filter_traces(filters)
+    sys.setprofile(hook)
+    try:
+        func()
+    finally:
+        sys.setprofile(None)
+    if not snapshots:
+        return []
+
+    lines = []
+    for stat in snapshots[0].filter_traces(filters).compare_to(before, 'lineno')[:limit]:
+        if stat.size_diff <= 0:
+            continue
+        frame = stat.traceback[0]
+        lines.append({
+            'location': f"{os.path.basename(frame.filename)}:{frame.lineno}",
+            'source': linecache.getline(frame.filename, frame.lineno).strip(),
+            'size_bytes': stat.size_diff,
+            'blocks': stat.count_diff,
+        })
+    return lines
+
+
+class MemoryBenchmark:
+    """Gösterim × algoritma bellek profili"""
+
+    def __init__(self, engines: Sequence[str] = ('dijkstra', 'astar', 'bidirectional_astar')):
+        unknown = [engine for engine in engines if engine not in ENGINES]
+        if unknown:
+            raise ValueError(f"Bilinmeyen algoritma: {', '.join(unknown)}")
+        self.engines = list(engines)
+
+    def profile(self, name: str, build: Callable[[], RoadNetwork],
+                pairs: Sequence[Tuple[int, int]]) -> Dict:
+        """
+        Bir gösterimi ölç
+
+        Args:
+            build: Ağı oluşturan fonksiyon (ölçüm ondan önce başlar)
+            pairs: (kaynak, hedef) sorguları
+        """
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        try:
+            with RSSSampler() as sampler:
+                network, build_bytes, build_peak = traced_allocation(build)
+                after_build = tracemalloc.get_traced_memory()[0]
+                nodes, edges = network.node_count(), network.edge_count()
+
+                queries = {}
+                pathfinder = None
+                for engine in self.engines:
+                    pathfinder = ENGINES[engine](network)
+                    peaks = []
+                    for start_id, end_id in pairs:
+                        _, _, peak = traced_allocation(
+                            lambda: pathfinder.find_shortest_path(start_id, end_id))
+                        peaks.append(peak)
+
+                    state = search_state_allocations(
+                        lambda: pathfinder.find_shortest_path(*pairs[0])) if pairs else []
+                    queries[engine] = {
+                        'mean_peak_bytes': sum(peaks) / len(peaks) if peaks else 0,
+                        'max_peak_bytes': max(peaks) if peaks else 0,
+                        'search_state': state,
+                    }
+
+                # Sorgular lazy önbellekleri kurmuş olabilir - ağın güncel boyutu
+                pathfinder = None
+                gc.collect()
+                resident_bytes = build_bytes + tracemalloc.get_traced_memory()[0] - after_build
+        finally:
+            if started:
+                tracemalloc.stop()
+
+        return {
+            'representation': name,
+            'nodes': nodes,
+            'edges': edges,
+            'build_bytes': build_bytes,
+            'build_peak_bytes': build_peak,
+            'bytes_per_node': build_bytes / nodes if nodes else 0.0,
+            'bytes_per_edge': build_bytes / edges if edges else 0.0,
+            'resident_bytes': resident_bytes,
+            'resident_bytes_per_edge': resident_bytes / edges if edges else 0.0,
+            'rss_start': sampler.start_rss,
+            'rss_peak': sampler.peak,
+            'queries': queries,
+        }
+
+    def compare_representations(self, network: RoadNetwork, pairs: Sequence[Tuple[int, int]],
+                                build_dict: Optional[Callable[[], RoadNetwork]] = None) -> Dict[str, Dict]:
+        """
+        Sözlük tabanlı ve kompakt gösterimi karşılaştır
+
+        build_dict verilirse sözlük ağı ölçüm altında yeniden oluşturulur;
+        aksi halde verilen ağın bir kopyası (to_network ile) ölçülür.
+        """
+        compact_source = CompactRoadNetwork.from_network(network)
+        if build_dict is None:
+            build_dict = compact_source.to_network
+        return {
+            'dict': self.profile('dict', build_dict, pairs),
+            'compact': self.profile('compact', lambda: _with_adjacency(
+                CompactRoadNetwork.from_network(network)), pairs),
+        }
+
+
+def _with_adjacency(network: CompactRoadNetwork) -> CompactRoadNetwork:
+    """Kompakt ağın CSR komşuluğunu kur (ilk sorguya kalmasın, boyuta dahil olsun)"""
+    network._adjacency()
+    return network
+
+
+def print_memory_report(profiles: Dict[str, Dict]) -> None:
+    """Gösterim karşılaştırma tablosu"""
+    print(f"{'Gösterim':<10} {'Node':>9} {'Edge':>10} {'Ağ (MB)':>9} {'B/node':>8} "
+          f"{'B/edge':>8} {'Önbellekli (MB)':>16} {'RSS tepe (MB)':>14}")
+    print("-" * 92)
+    for name, profile in profiles.items():
+        print(f"{name:<10} {profile['nodes']:>9} {profile['edges']:>10} "
+              f"{profile['build_bytes'] / 1e6:>9.2f} {profile['bytes_per_node']:>8.0f} "
+              f"{profile['bytes_per_edge']:>8.0f} {profile['resident_bytes'] / 1e6:>16.2f} "
+              f"{profile['rss_peak'] / 1e6:>14.1f}")
+
+    print(f"\n{'Gösterim':<10} {'Algoritma':<22} {'Ort. tepe/sorgu (KB)':>21} {'Maks. tepe (KB)':>16}")
+    print("-" * 72)
+    for name, profile in profiles.items():
+        for engine, stats in profile['queries'].items():
+            print(f"{name:<10} {engine:<22} {stats['mean_peak_bytes'] / 1024:>21.1f} "
+                  f"{stats['max_peak_bytes'] / 1024:>16.1f}")
+
+    for name, profile in profiles.items():
+        for engine, stats in profile['queries'].items():
+            if not stats['search_state']:
+                continue
+            print(f"\n🔍 Arama durumu - {name} / {engine} (dönüş anında canlı ayrımlar):")
+            for line in stats['search_state']:
+                print(f"   {line['size_bytes'] / 1024:>9.1f} KB {line['blocks']:>7} blok  "
+                      f"{line['location']:<28} {line['source'][:60]}")
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    from benchmark_harness import sample_pairs
+    from synthetic_network import generate_road_arrays
+
+    print("🧠 Bellek Benchmark Testi\n")
+
+    data = generate_road_arrays(20_000, seed=3)
+    pairs = sample_pairs(list(range(data.node_count)), 3, seed=3)
+
+    benchmark = MemoryBenchmark(engines=('dijkstra', 'astar'))
+    profiles = {
+        'dict': benchmark.profile('dict', data.to_network, pairs),
+        'compact': benchmark.profile('compact', lambda: _with_adjacency(data.to_compact()), pairs),
+    }
+    print_memory_report(profiles)
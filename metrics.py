@@ -0,0 +1,584 @@
+#!/usr/bin/env python3
+"""
+📈 METRİK KAYDI (PROMETHEUS) 📈
+Sayaç, gösterge ve sabit kovalı histogramlar + /metrics HTTP uç noktası
+
+Uzun süre çalışan serviste sorgu sayıları, gecikme dağılımları, önbellek
+isabet oranları, dış API hataları ve rate-limit beklemeleri Prometheus
+metin formatında (0.0.4) dışarı açılır.
+
+Sıcak yol maliyeti:
+- Etiketli metrikler için alt metrik (child) bir kez çözülüp saklanabilir
+  (ör. @metered dekoratörü tanımlanırken); her çağrıda yalnızca bir toplama
+- Histogram gözlemi: bisect ile kova bulma + iki toplama
+- Sayaç ve histogram güncellemeleri kilitsizdir ama thread başına ayrı
+  hücreye yazılır (threading.local): her hücreye tek thread yazdığından
+  eşzamanlı thread'lerde artış kaybolmaz; scrape hücreleri toplar. Biten
+  thread'lerin hücreleri (yeni hücre açılırken ve scrape'te) ortak taban
+  hücreye katlanır, istek / executor başına thread açan serviste liste
+  büyümez. Kilit yalnızca yeni etiket kombinasyonu, bir thread'in ilk
+  hücresi veya scrape sırasında alınır. inc() döngü dahil ~160 ns; çağrı başına kilit
+  ~320 ns, korumasız += ~105 ns (CPython 3.11)
+- Göstergeler (gauge) seyrek güncellendiğinden kilitle korunur
+- Metin formatına dönüştürme yalnızca scrape sırasında yapılır
+
+Kullanım:
+    serve_metrics(9108)               # http://127.0.0.1:9108/metrics
+    CACHE_REQUESTS.labels('weather', 'hit').inc()
+    with api_call('osrm') as call:
+        ...
+        call.status = response.status
+"""
+
+import bisect
+import functools
+import inspect
+import math
+import threading
+import time
+import weakref
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+DEFAULT_PORT = 9108
+
+# Rota sorguları (ms altından saniyelere) ve dış API çağrıları için kovalar (saniye)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+API_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class _PerThread:
+    """
+    Thread başına hücre - hücreye yalnızca sahibi yazar, okuyucu tümünü toplar
+
+    Biten thread'in hücresine artık yazılamaz; _compact() onu _base'e katlayıp
+    listeden çıkarır (yalnızca kilit altında).
+    """
+
+    __slots__ = ('_local', '_cells', '_lock', '_base')
+
+    def __init__(self):
+        self._local = threading.local()
+        self._cells: List[Tuple[weakref.ref, object]] = []  # (sahip thread, hücre)
+        self._lock = threading.Lock()
+        self._base = self._new_cell()
+
+    def _new_cell(self):
+        raise NotImplementedError
+
+    def _fold(self, cell) -> None:
+        raise NotImplementedError
+
+    def _cell(self):
+        cell = self._new_cell()
+        with self._lock:
+            self._compact()
+            self._cells.append((weakref.ref(threading.current_thread()), cell))
+        self._local.cell = cell
+        return cell
+
+    def _compact(self) -> None:
+        live = []
+        for owner, cell in self._cells:
+            thread = owner()
+            if thread is not None and thread.is_alive():
+                live.append((owner, cell))
+            else:
+                self._fold(cell)
+        self._cells = live
+
+    def _all_cells(self) -> List:
+        with self._lock:
+            self._compact()
+            return [self._base] + [cell for _, cell in self._cells]
+
+
+class _CounterChild(_PerThread):
+    __slots__ = ()
+
+    def _new_cell(self) -> List[float]:
+        return [0.0]
+
+    def _fold(self, cell: List[float]) -> None:
+        self._base[0] += cell[0]
+
+    def inc(self, amount: float = 1.0) -> None:
+        if amount < 0:
+            raise ValueError("Sayaç yalnızca artırılabilir")
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cell()
+        cell[0] += amount
+
+    @property
+    def value(self) -> float:
+        return sum(cell[0] for cell in self._all_cells())
+
+
+class _GaugeChild:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = float(value)
+
+
+class _HistogramChild(_PerThread):
+    __slots__ = ('upper_bounds',)
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self.upper_bounds = upper_bounds
+        super().__init__()
+
+    def _new_cell(self) -> List:
+        return [[0] * (len(self.upper_bounds) + 1), 0.0]  # [kova sayıları (son: +Inf), toplam]
+
+    def _fold(self, cell: List) -> None:
+        base_counts = self._base[0]
+        for index, count in enumerate(cell[0]):
+            base_counts[index] += count
+        self._base[1] += cell[1]
+
+    def observe(self, value: float) -> None:
+        try:
+            cell = self._local.cell
+        except AttributeError:
+            cell = self._cell()
+        cell[0][bisect.bisect_left(self.upper_bounds, value)] += 1
+        cell[1] += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        """(kova sayıları, toplam) - tüm thread'lerin hücreleri toplanmış"""
+        counts = [0] * (len(self.upper_bounds) + 1)
+        total = 0.0
+        for cell_counts, cell_sum in self._all_cells():
+            for index, count in enumerate(list(cell_counts)):
+                counts[index] += count
+            total += cell_sum
+        return counts, total
+
+    def time(self) -> '_Timer':
+        """with bloğunun süresini gözlemle"""
+        return _Timer(self)
+
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child: _HistogramChild):
+        self.child = child
+        self.start = 0.0
+
+    def __enter__(self) -> '_Timer':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.child.observe(time.perf_counter() - self.start)
+
+
+class _Metric:
+    """Ortak metrik: ad, açıklama ve etiket adları; etiket değerleri başına alt metrik"""
+
+    TYPE = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        """Etiket değerleri için alt metrik (ilk çağrıda oluşturulur)"""
+        if kwargs:
+            values = tuple(kwargs[name] for name in self.labelnames)
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name}: {len(self.labelnames)} etiket bekleniyor, {len(key)} verildi")
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def _label_text(self, key: Tuple[str, ...], extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(zip(self.labelnames, key))
+        if extra:
+            pairs.append(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.TYPE}"]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Yalnızca artan sayaç"""
+
+    TYPE = 'counter'
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_text(key)} {_format(child.value)}"
+                for key, child in list(self._children.items())]
+
+
+class Gauge(_Metric):
+    """Artıp azalabilen değer"""
+
+    TYPE = 'gauge'
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._label_text(key)} {_format(child.value)}"
+                for key, child in list(self._children.items())]
+
+
+class Histogram(_Metric):
+    """Sabit kovalı histogram (_bucket kümülatif, _sum, _count)"""
+
+    TYPE = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = QUERY_BUCKETS):
+        upper_bounds = tuple(sorted(float(bound) for bound in buckets if bound != math.inf))
+        if not upper_bounds:
+            raise ValueError(f"{name}: en az bir kova sınırı gerekli")
+        self.upper_bounds = upper_bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.upper_bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.upper_bounds + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{self._label_text(key, ('le', _format(bound)))} {cumulative}")
+            lines.append(f"{self.name}_sum{self._label_text(key)} {_format(total)}")
+            lines.append(f"{self.name}_count{self._label_text(key)} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', r'\\').replace('\n', r'\n').replace('"', r'\"')
+
+
+def _format(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    """Metrik kümesi - ada göre tekil"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metrik {name} farklı tip veya etiketlerle zaten kayıtlı")
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = QUERY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Prometheus metin formatı"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return '\n'.join(metric.render() for metric in metrics) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+# Paylaşılan metrikler
+ROUTING_QUERIES = REGISTRY.counter(
+    'routing_queries_total', "Rota sorguları (result: found / not_found / error)", ('engine', 'result'))
+ROUTING_LATENCY = REGISTRY.histogram(
+    'routing_query_duration_seconds', "Rota sorgu süresi", ('engine',), buckets=QUERY_BUCKETS)
+CACHE_REQUESTS = REGISTRY.counter(
+    'cache_requests_total', "Önbellek erişimleri (result: hit / miss)", ('cache', 'result'))
+API_REQUESTS = REGISTRY.counter(
+    'external_api_requests_total', "Dış API çağrıları (status: HTTP kodu veya error)", ('api', 'status'))
+API_LATENCY = REGISTRY.histogram(
+    'external_api_request_duration_seconds', "Dış API çağrı süresi", ('api',), buckets=API_BUCKETS)
+RATE_LIMIT_WAITS = REGISTRY.counter(
+    'rate_limit_waits_total', "Rate limit nedeniyle yapılan beklemeler", ('client',))
+RATE_LIMIT_WAIT_SECONDS = REGISTRY.counter(
+    'rate_limit_wait_seconds_total', "Rate limit nedeniyle beklenen toplam süre", ('client',))
+ANALYSES_IN_PROGRESS = REGISTRY.gauge(
+    'emergency_analyses_in_progress', "Devam eden acil durum rota analizleri")
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def record_rate_limit_wait(client: str, seconds: float) -> None:
+    RATE_LIMIT_WAITS.labels(client).inc()
+    RATE_LIMIT_WAIT_SECONDS.labels(client).inc(seconds)
+
+
+class api_call:
+    """
+    Dış API çağrısını say ve süresini ölç
+
+    Bloktan önce call.status atanmadıysa (bağlantı hatası, zaman aşımı)
+    çağrı status="error" olarak sayılır.
+    """
+
+    __slots__ = ('api', 'status', 'start')
+
+    def __init__(self, api: str):
+        self.api = api
+        self.status = None
+        self.start = 0.0
+
+    def __enter__(self) -> 'api_call':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        API_LATENCY.labels(self.api).observe(time.perf_counter() - self.start)
+        API_REQUESTS.labels(self.api, self.status if self.status is not None else 'error').inc()
+
+
+class timed_request:
+    """
+    aiohttp isteğini sar: async with timed_request('osrm', session.get(...)) as response
+
+    Yanıt durum kodu ve (gövde okuma dahil) süre kaydedilir; yanıt alınamazsa
+    status="error".
+    """
+
+    __slots__ = ('call', 'request')
+
+    def __init__(self, api: str, request):
+        self.call = api_call(api)
+        self.request = request
+
+    async def __aenter__(self):
+        self.call.__enter__()
+        try:
+            response = await self.request.__aenter__()
+        except BaseException:
+            self.call.__exit__()
+            raise
+        self.call.status = response.status
+        return response
+
+    async def __aexit__(self, *exc):
+        try:
+            return await self.request.__aexit__(*exc)
+        finally:
+            self.call.__exit__()
+
+
+def metered(engine: str) -> Callable:
+    """
+    Rota sorgu fonksiyonunu say ve süresini ölç
+
+    Sonuç None ise 'not_found', boş olmayan değer 'found', istisna 'error'.
+    Alt metrikler dekoratör tanımlanırken çözülür; çağrı başına sözlük araması yok.
+    """
+    found = ROUTING_QUERIES.labels(engine, 'found')
+    not_found = ROUTING_QUERIES.labels(engine, 'not_found')
+    errors = ROUTING_QUERIES.labels(engine, 'error')
+    latency = ROUTING_LATENCY.labels(engine)
+    clock = time.perf_counter
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = clock()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException:
+                errors.inc()
+                raise
+            finally:
+                latency.observe(clock() - start)
+            (found if result else not_found).inc()
+            return result
+        return wrapper
+
+    return decorator
+
+
+def track_in_progress(gauge: Gauge) -> Callable:
+    """Fonksiyon (senkron veya async) çalışırken göstergeyi bir artır"""
+    def decorator(func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                gauge.inc()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    gauge.dec()
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            gauge.inc()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                gauge.dec()
+        return wrapper
+
+    return decorator
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split('?')[0] not in ('/metrics', '/'):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        pass  # scrape başına erişim logu yazma
+
+
+def serve_metrics(port: int = DEFAULT_PORT, host: str = '127.0.0.1',
+                  registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """
+    /metrics uç noktasını arka plan thread'inde başlat
+
+    Returns:
+        Sunucu (durdurmak için server.shutdown(); port=0 ise server.server_address[1])
+    """
+    handler = type('MetricsHandler', (_MetricsHandler,), {'registry': registry})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import sys
+    import urllib.request
+
+    print("📈 Metrik Testi\n")
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter('demo_requests_total', "Demo istekleri", ('status',))
+    latency = registry.histogram('demo_latency_seconds', "Demo gecikmesi", buckets=(0.001, 0.01, 0.1))
+    for index in range(100):
+        requests_total.labels('200' if index % 10 else '503').inc()
+        latency.observe(index / 1000)
+
+    server = serve_metrics(0, registry=registry)
+    port = server.server_address[1]
+    text = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode('utf-8')
+    server.shutdown()
+    print(text)
+
+    assert 'demo_requests_total{status="200"} 90' in text
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 100' in text
+    assert 'demo_latency_seconds_count 100' in text
+
+    # Sıcak yol maliyeti
+    child = requests_total.labels('200')
+    start = time.perf_counter()
+    for _ in range(1_000_000):
+        child.inc()
+    inc_ns = (time.perf_counter() - start) * 1000
+    hist = latency._default
+    start = time.perf_counter()
+    for _ in range(1_000_000):
+        hist.observe(0.004)
+    observe_ns = (time.perf_counter() - start) * 1000
+    print(f"⚡ inc: {inc_ns:.0f} ns, observe: {observe_ns:.0f} ns (çağrı başına)")
+
+    # Eşzamanlı thread'ler: thread başına hücre, artış kaybolmaz
+    shared = registry.counter('demo_threads_total', "Thread testi")
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    workers = [threading.Thread(target=lambda: [shared.inc() for _ in range(100_000)]) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    sys.setswitchinterval(switch_interval)
+    assert shared._default.value == 400_000, shared._default.value
+    print(f"🧵 4 thread x 100000 inc: {shared._default.value:.0f}")
+    print(f"\n✅ /metrics uç noktası port {port} üzerinde doğrulandı")
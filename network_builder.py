@@ -12,20 +12,147 @@ OpenStreetMap ve gerçek itfaiye verilerinden yol ağı oluşturur
 """
 
 import json
+import logging
+import os
 import requests
 import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from collections import Counter, defaultdict
 from typing import Dict, List, Tuple, Optional
-from advanced_pathfinding import RoadNetwork, RoadType
+from advanced_pathfinding import RoadNetwork, RoadType, Edge
 from fire_stations import load_fire_stations
-import math
+from graph_cache import GraphBuildCache, build_cache_key
+from geodesy import haversine_matrix, haversine_pairwise
+from structured_logging import get_logger
+import numpy as np
+
+log = get_logger(__name__)
+
+
+# Koordinat anahtarları: 1e-7 derece (~1 cm) çözünürlükte tamsayıya yuvarlanmış
+# lat/lon tek bir int64 içine paketlenir -> float gürültüsüyle çoğalan nodelar birleşir
+COORD_SCALE = 10_000_000
+_LAT_OFFSET = 90 * COORD_SCALE   # [0, 1.8e9] -> 31 bit
+_LON_OFFSET = 180 * COORD_SCALE  # [0, 3.6e9] -> 32 bit
+
+
+def coord_key(lat: float, lon: float) -> int:
+    """Tek koordinat için quantize edilmiş int64 anahtar"""
+    q_lat = round(lat * COORD_SCALE) + _LAT_OFFSET
+    q_lon = round(lon * COORD_SCALE) + _LON_OFFSET
+    return (q_lat << 32) | q_lon
+
+
+def coord_keys(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """coord_key'in vektörel hali - aynı yuvarlama (round-half-even) kuralı"""
+    q_lat = np.rint(np.asarray(lats, dtype=np.float64) * COORD_SCALE).astype(np.int64) + _LAT_OFFSET
+    q_lon = np.rint(np.asarray(lons, dtype=np.float64) * COORD_SCALE).astype(np.int64) + _LON_OFFSET
+    return (q_lat << 32) | q_lon
+
+
+# OSM highway tag -> RoadType
+OSM_HIGHWAY_ROAD_TYPES = {
+    'motorway': RoadType.MOTORWAY,
+    'motorway_link': RoadType.MOTORWAY,
+    'trunk': RoadType.TRUNK,
+    'trunk_link': RoadType.TRUNK,
+    'primary': RoadType.PRIMARY,
+    'primary_link': RoadType.PRIMARY,
+    'secondary': RoadType.SECONDARY,
+    'secondary_link': RoadType.SECONDARY,
+    'tertiary': RoadType.TERTIARY,
+    'tertiary_link': RoadType.TERTIARY,
+    'residential': RoadType.RESIDENTIAL,
+    'unclassified': RoadType.UNCLASSIFIED,
+    'service': RoadType.RESIDENTIAL,
+    'living_street': RoadType.RESIDENTIAL
+}
+
+OVERPASS_URL = "http://overpass-api.de/api/interpreter"
+
+
+def overpass_road_query(bbox: Tuple[float, float, float, float], timeout: int = 60) -> str:
+    """Bbox içindeki yolları (ve nodelarını) çeken Overpass QL sorgusu"""
+    return f"""
+        [out:json][timeout:{timeout}];
+        (
+          way["highway"]["highway"!~"footway|path|cycleway"]({bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]});
+        );
+        out body;
+        >;
+        out skel qt;
+        """
+
+
+def split_bbox(bbox: Tuple[float, float, float, float], rows: int,
+               cols: int) -> List[Tuple[float, float, float, float]]:
+    """Bbox'ı rows x cols alt bbox'a böl (satır satır, güneybatıdan başlayarak)"""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    lat_step = (max_lat - min_lat) / rows
+    lon_step = (max_lon - min_lon) / cols
+    
+    tiles = []
+    for row in range(rows):
+        for col in range(cols):
+            tiles.append((
+                round(min_lat + row * lat_step, 7),
+                round(min_lon + col * lon_step, 7),
+                round(min_lat + (row + 1) * lat_step, 7) if row < rows - 1 else max_lat,
+                round(min_lon + (col + 1) * lon_step, 7) if col < cols - 1 else max_lon,
+            ))
+    return tiles
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 3)
+
+
+def _fetch_osm_tile(task: Tuple[int, Tuple[float, float, float, float], str, Optional[str]]) -> Dict:
+    """
+    Process pool worker'ı: tek bir tile'ın yol verisini çek ve sadeleştir
+    
+    Veri yerel extract dosyasından (extract_dir/tile_<index>.json, Overpass JSON
+    formatında) ya da Overpass API'den okunur. Sadece tanınan yol tipleri ve bu
+    yolların referans verdiği nodelar döndürülür; böylece ana process'e taşınan
+    veri küçük kalır.
+    """
+    index, tile_bbox, overpass_url, extract_dir = task
+    
+    if extract_dir:
+        with open(os.path.join(extract_dir, f"tile_{index}.json"), encoding='utf-8') as f:
+            osm_data = json.load(f)
+    else:
+        response = requests.post(overpass_url, data={'data': overpass_road_query(tile_bbox)}, timeout=120)
+        response.raise_for_status()
+        osm_data = response.json()
+    
+    ways = []
+    referenced = set()
+    for elem in osm_data.get('elements', []):
+        if elem['type'] != 'way' or 'nodes' not in elem:
+            continue
+        tags = elem.get('tags', {})
+        highway = tags.get('highway', '').lower()
+        if highway not in OSM_HIGHWAY_ROAD_TYPES:
+            continue
+        ways.append((elem['id'], elem['nodes'], highway, tags.get('oneway', 'no')))
+        referenced.update(elem['nodes'])
+    
+    nodes = [(elem['id'], elem['lat'], elem['lon'])
+             for elem in osm_data.get('elements', [])
+             if elem['type'] == 'node' and elem['id'] in referenced]
+    
+    return {'index': index, 'nodes': nodes, 'ways': ways}
 
 class NetworkBuilder:
     """Yol ağı oluşturucu - Gerçek verilerle"""
     
     def __init__(self):
         self.network = RoadNetwork()
-        self.node_map = {}  # (lat, lon) -> node_id mapping
-        self.overpass_url = "http://overpass-api.de/api/interpreter"
+        self.node_map: Dict[int, int] = {}  # coord_key(lat, lon) -> node_id mapping
+        self.overpass_url = OVERPASS_URL
+        self.source = None  # 'osm' veya 'fire_stations' - fallback tespiti için
+        self.failed_tiles: Dict[int, str] = {}
         
     def build_from_fire_stations(self, fire_stations: Optional[Dict[str, Tuple[float, float]]] = None) -> RoadNetwork:
         """
@@ -39,30 +166,26 @@ class NetworkBuilder:
         if fire_stations is None:
             fire_stations = load_fire_stations()
         
-        print(f"🏗️  Network oluşturuluyor: {len(fire_stations)} itfaiye istasyonu")
+        build_start = time.perf_counter()
+        self.source = 'fire_stations'
         
         # İtfaiye istasyonlarını nodelar olarak ekle
         station_ids = {}
         for name, (lat, lon) in fire_stations.items():
             node_id = self.network.add_node(lat, lon, name, is_fire_station=True)
             station_ids[name] = node_id
-            self.node_map[(lat, lon)] = node_id
-        
-        print(f"✅ {len(station_ids)} itfaiye istasyonu eklendi")
+            self.node_map.setdefault(coord_key(lat, lon), node_id)
         
         # Her istasyonu en yakın N komşusuna bağla
-        print("🔗 Bağlantılar oluşturuluyor...")
         n_neighbors = min(5, len(fire_stations) - 1)  # Her node en fazla 5 komşuya bağlı
         
+        names = list(fire_stations)
+        neighbor_lists = self._find_k_nearest_neighbors(fire_stations, n_neighbors)
+        
         edge_count = 0
-        for name1, (lat1, lon1) in fire_stations.items():
+        for name1, neighbors in zip(names, neighbor_lists):
             node1_id = station_ids[name1]
             
-            # En yakın komşuları bul
-            neighbors = self._find_k_nearest_neighbors(
-                (lat1, lon1), fire_stations, n_neighbors, exclude=[name1]
-            )
-            
             for neighbor_name, distance in neighbors:
                 node2_id = station_ids[neighbor_name]
                 
@@ -75,8 +198,9 @@ class NetworkBuilder:
                 except ValueError:
                     continue
         
-        print(f"✅ {edge_count} bağlantı oluşturuldu")
-        print(f"📊 Network hazır: {self.network.node_count()} node, {self.network.edge_count()} edge")
+        log.info("Network oluşturuldu", source=self.source, stations=len(station_ids),
+                 links=edge_count, nodes=self.network.node_count(), edges=self.network.edge_count(),
+                 duration_ms=_elapsed_ms(build_start))
         
         return self.network
     
@@ -95,19 +219,10 @@ class NetworkBuilder:
         if fire_stations is None:
             fire_stations = load_fire_stations()
         
-        print(f"🗺️  OpenStreetMap'ten veri çekiliyor...")
-        print(f"   Bbox: {bbox}")
+        fetch_start = time.perf_counter()
         
         # Overpass QL sorgusu - Yolları çek
-        overpass_query = f"""
-        [out:json][timeout:60];
-        (
-          way["highway"]["highway"!~"footway|path|cycleway"]({bbox[0]},{bbox[1]},{bbox[2]},{bbox[3]});
-        );
-        out body;
-        >;
-        out skel qt;
-        """
+        overpass_query = overpass_road_query(bbox)
         
         try:
             response = requests.post(
@@ -117,24 +232,114 @@ class NetworkBuilder:
             )
             
             if response.status_code != 200:
-                print(f"❌ Overpass API hatası: {response.status_code}")
-                print("🔄 Fallback: İtfaiye istasyonlarından network oluşturuluyor...")
+                log.warning("Overpass API hatası, itfaiye ağına dönülüyor",
+                            status=response.status_code, bbox=bbox)
                 return self.build_from_fire_stations(fire_stations)
             
             osm_data = response.json()
-            print(f"✅ OSM verisi alındı: {len(osm_data.get('elements', []))} element")
+            log.info("OSM verisi alındı", bbox=bbox, elements=len(osm_data.get('elements', [])),
+                     duration_ms=_elapsed_ms(fetch_start))
             
             # OSM verilerini işle
             return self._process_osm_data(osm_data, fire_stations)
             
-        except Exception as e:
-            print(f"❌ OSM veri çekme hatası: {e}")
-            print("🔄 Fallback: İtfaiye istasyonlarından network oluşturuluyor...")
+        except Exception:
+            log.exception("OSM veri çekme hatası, itfaiye ağına dönülüyor", level=logging.WARNING, bbox=bbox)
             return self.build_from_fire_stations(fire_stations)
     
+    def build_from_osm_tiles(self, bbox: Tuple[float, float, float, float],
+                             tiles: Tuple[int, int] = (4, 4),
+                             fire_stations: Optional[Dict[str, Tuple[float, float]]] = None,
+                             workers: Optional[int] = None, retries: int = 2,
+                             extract_dir: Optional[str] = None) -> RoadNetwork:
+        """
+        OSM network'ünü tile tile, paralel process'lerde çekip birleştirerek oluştur
+        
+        Strateji:
+        1. Bbox rows x cols alt bbox'a bölünür
+        2. Her tile bir process pool worker'ında çekilir/parse edilir
+           (Overpass API veya extract_dir/tile_<index>.json yerel extract'ları)
+        3. Başarısız tile'lar diğerlerinden bağımsız olarak tekrar denenir
+        4. Tile'lar ortak OSM node id'leri üzerinden tek ağda birleştirilir
+           (tile sınırını kesen yollar her iki tile'da gelir, way id ile tekilleşir)
+        
+        Args:
+            bbox: (min_lat, min_lon, max_lat, max_lon)
+            tiles: (rows, cols) bölme sayısı
+            workers: Process sayısı (None: CPU sayısı)
+            retries: Tile başına ek deneme sayısı
+            extract_dir: Yerel Overpass JSON extract dizini
+        """
+        if fire_stations is None:
+            fire_stations = load_fire_stations()
+        
+        tile_bboxes = split_bbox(bbox, *tiles)
+        start_time = time.perf_counter()
+        results: Dict[int, Dict] = {}
+        pending = list(range(len(tile_bboxes)))
+        errors: Dict[int, str] = {}
+        
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for attempt in range(retries + 1):
+                if not pending:
+                    break
+                if attempt > 0:
+                    log.info("Tile'lar tekrar deneniyor", pending=len(pending), attempt=attempt + 1)
+                    time.sleep(min(2 ** attempt, 30))
+                
+                futures = {
+                    pool.submit(_fetch_osm_tile, (index, tile_bboxes[index], self.overpass_url, extract_dir)): index
+                    for index in pending
+                }
+                failed = []
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        results[index] = future.result()
+                        errors.pop(index, None)
+                    except Exception as e:
+                        errors[index] = str(e)
+                        failed.append(index)
+                pending = sorted(failed)
+        
+        self.failed_tiles = {index: errors[index] for index in pending}
+        if self.failed_tiles:
+            for index, error in self.failed_tiles.items():
+                log.warning("Tile başarısız", tile=index, bbox=tile_bboxes[index], error=error)
+            log.warning("Tile hatası, itfaiye ağına dönülüyor", failed=len(self.failed_tiles))
+            return self.build_from_fire_stations(fire_stations)
+        
+        log.info("OSM tile'ları alındı", tiles=len(results), workers=workers or os.cpu_count(),
+                 duration_ms=_elapsed_ms(start_time))
+        
+        return self._process_osm_data(self._stitch_tiles(results), fire_stations)
+    
+    def _stitch_tiles(self, tile_results: Dict[int, Dict]) -> Dict:
+        """Tile sonuçlarını OSM node/way id'lerine göre tekilleştirip birleştir"""
+        nodes: Dict[int, Tuple[float, float]] = {}
+        ways: Dict[int, Tuple] = {}
+        
+        for index in sorted(tile_results):
+            result = tile_results[index]
+            for osm_id, lat, lon in result['nodes']:
+                nodes.setdefault(osm_id, (lat, lon))
+            for way_id, way_nodes, highway, oneway in result['ways']:
+                ways.setdefault(way_id, (way_nodes, highway, oneway))
+        
+        elements = [{'type': 'node', 'id': osm_id, 'lat': lat, 'lon': lon}
+                    for osm_id, (lat, lon) in sorted(nodes.items())]
+        elements.extend({'type': 'way', 'id': way_id, 'nodes': way_nodes,
+                         'tags': {'highway': highway, 'oneway': oneway}}
+                        for way_id, (way_nodes, highway, oneway) in sorted(ways.items()))
+        
+        log.debug("Tile'lar birleştirildi", nodes=len(nodes), ways=len(ways))
+        return {'elements': elements}
+    
     def _process_osm_data(self, osm_data: Dict, fire_stations: Dict[str, Tuple[float, float]]) -> RoadNetwork:
         """OSM verilerini işleyerek network oluştur"""
+        build_start = time.perf_counter()
         elements = osm_data.get('elements', [])
+        self.source = 'osm'
         
         # Önce nodeları map'e al
         osm_nodes = {}
@@ -142,91 +347,126 @@ class NetworkBuilder:
             if elem['type'] == 'node':
                 osm_nodes[elem['id']] = (elem['lat'], elem['lon'])
         
-        print(f"📍 {len(osm_nodes)} OSM node bulundu")
-        
         # İtfaiye istasyonlarını ekle
         station_ids = {}
         for name, (lat, lon) in fire_stations.items():
             node_id = self.network.add_node(lat, lon, name, is_fire_station=True)
             station_ids[name] = node_id
-            self.node_map[(lat, lon)] = node_id
-        
-        print(f"✅ {len(station_ids)} itfaiye istasyonu eklendi")
-        
-        # Wayları işle (yollar)
-        way_count = 0
-        edge_count = 0
+            self.node_map.setdefault(coord_key(lat, lon), node_id)
         
+        # Geçerli wayları topla (yollar)
+        ways = []
         for elem in elements:
             if elem['type'] == 'way' and 'nodes' in elem:
                 tags = elem.get('tags', {})
-                highway_type = tags.get('highway', '')
                 
                 # Yol tipini belirle
-                road_type = self._osm_to_road_type(highway_type)
+                road_type = self._osm_to_road_type(tags.get('highway', ''))
                 if road_type is None:
                     continue
                 
-                way_count += 1
-                way_nodes = elem['nodes']
+                oneway = tags.get('oneway', 'no') == 'yes'
+                ways.append((elem['nodes'], road_type, oneway))
+        
+        # Waylerde kullanılan OSM nodelarını toplu olarak tekilleştir
+        osm_to_node = self._ingest_osm_nodes(osm_nodes, ways)
+        
+        way_count = len(ways)
+        edge_count = 0
+        
+        for way_nodes, road_type, oneway in ways:
+            # Way'deki ardışık nodeları edge olarak ekle
+            for i in range(len(way_nodes) - 1):
+                node1_id = osm_to_node.get(way_nodes[i])
+                node2_id = osm_to_node.get(way_nodes[i + 1])
                 
-                # Way'deki ardışık nodeları edge olarak ekle
-                for i in range(len(way_nodes) - 1):
-                    node1_osm_id = way_nodes[i]
-                    node2_osm_id = way_nodes[i + 1]
-                    
-                    if node1_osm_id not in osm_nodes or node2_osm_id not in osm_nodes:
-                        continue
-                    
-                    lat1, lon1 = osm_nodes[node1_osm_id]
-                    lat2, lon2 = osm_nodes[node2_osm_id]
-                    
-                    # Networkümüze node ekle (eğer yoksa)
-                    if (lat1, lon1) not in self.node_map:
-                        node1_id = self.network.add_node(lat1, lon1)
-                        self.node_map[(lat1, lon1)] = node1_id
-                    else:
-                        node1_id = self.node_map[(lat1, lon1)]
-                    
-                    if (lat2, lon2) not in self.node_map:
-                        node2_id = self.network.add_node(lat2, lon2)
-                        self.node_map[(lat2, lon2)] = node2_id
-                    else:
-                        node2_id = self.node_map[(lat2, lon2)]
-                    
-                    # Edge ekle
-                    try:
-                        oneway = tags.get('oneway', 'no') == 'yes'
-                        self.network.add_edge(node1_id, node2_id, road_type, bidirectional=not oneway)
-                        edge_count += 1
-                    except ValueError:
-                        continue
+                # Eksik node veya tekilleştirme sonrası oluşan self-loop
+                if node1_id is None or node2_id is None or node1_id == node2_id:
+                    continue
+                
+                # Edge ekle
+                try:
+                    self.network.add_edge(node1_id, node2_id, road_type, bidirectional=not oneway)
+                    edge_count += 1
+                except ValueError:
+                    continue
         
-        print(f"✅ {way_count} yol işlendi, {edge_count} edge oluşturuldu")
-        print(f"📊 Network hazır: {self.network.node_count()} node, {self.network.edge_count()} edge")
+        log.info("Network oluşturuldu", source=self.source, osm_nodes=len(osm_nodes),
+                 stations=len(station_ids), ways=way_count, links=edge_count,
+                 nodes=self.network.node_count(), edges=self.network.edge_count(),
+                 duration_ms=_elapsed_ms(build_start))
         
         return self.network
     
-    def _find_k_nearest_neighbors(self, point: Tuple[float, float], 
-                                  all_points: Dict[str, Tuple[float, float]], 
-                                  k: int, exclude: List[str] = None) -> List[Tuple[str, float]]:
-        """K en yakın komşuyu bul"""
-        if exclude is None:
-            exclude = []
+    def _ingest_osm_nodes(self, osm_nodes: Dict[int, Tuple[float, float]],
+                          ways: List[Tuple[List[int], RoadType, bool]]) -> Dict[int, int]:
+        """
+        Waylerde referans verilen OSM nodelarını toplu olarak networke ekle
         
-        distances = []
-        lat1, lon1 = point
+        Koordinatlar quantize edilmiş int64 anahtarlara çevrilir ve np.unique
+        ile tekilleştirilir; aynı noktaya düşen OSM nodeları (ve itfaiye
+        istasyonlarıyla çakışanlar) tek bir network node'una bağlanır. Yeni
+        nodelar anahtar sırasıyla eklenir, böylece node id'leri girdi
+        sırasından bağımsız ve deterministiktir.
         
-        for name, (lat2, lon2) in all_points.items():
-            if name in exclude:
-                continue
-            
-            dist = self._haversine_distance(lat1, lon1, lat2, lon2)
-            distances.append((name, dist))
+        Returns:
+            OSM node id -> network node id
+        """
+        referenced = np.unique(np.fromiter(
+            (osm_id for way_nodes, _, _ in ways for osm_id in way_nodes if osm_id in osm_nodes),
+            dtype=np.int64
+        ))
+        if referenced.size == 0:
+            return {}
+        
+        coords = np.array([osm_nodes[osm_id] for osm_id in referenced.tolist()], dtype=np.float64)
+        keys = coord_keys(coords[:, 0], coords[:, 1])
+        unique_keys, first_index, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        
+        # Zaten kayıtlı (itfaiye) anahtarları yeniden kullan, kalanları toplu ekle
+        known = np.fromiter(self.node_map.keys(), dtype=np.int64, count=len(self.node_map))
+        is_new = ~np.isin(unique_keys, known)
         
-        # Mesafeye göre sırala ve ilk k'yı al
-        distances.sort(key=lambda x: x[1])
-        return distances[:k]
+        unique_node_ids = np.empty(unique_keys.size, dtype=np.int64)
+        new_positions = first_index[is_new]
+        new_ids = self.network.add_nodes_bulk(coords[new_positions, 0].tolist(),
+                                              coords[new_positions, 1].tolist())
+        unique_node_ids[is_new] = np.arange(new_ids.start, new_ids.stop)
+        unique_node_ids[~is_new] = [self.node_map[key] for key in unique_keys[~is_new].tolist()]
+        
+        self.node_map.update(zip(unique_keys[is_new].tolist(), new_ids))
+        
+        log.debug("OSM nodeları tekilleştirildi", referenced=int(referenced.size), unique=int(unique_keys.size))
+        
+        return dict(zip(referenced.tolist(), unique_node_ids[inverse.ravel()].tolist()))
+    
+    def find_node(self, lat: float, lon: float) -> Optional[int]:
+        """Koordinata (1e-7 derece hassasiyetle) karşılık gelen node id'si"""
+        return self.node_map.get(coord_key(lat, lon))
+    
+    def _find_k_nearest_neighbors(self, points: Dict[str, Tuple[float, float]],
+                                  k: int) -> List[List[Tuple[str, float]]]:
+        """
+        Her nokta için (kendisi hariç) K en yakın komşu
+        
+        Tüm mesafeler tek bir NumPy mesafe matrisiyle hesaplanır.
+        
+        Returns:
+            points sırasıyla, her nokta için [(komşu_adı, mesafe_km), ...] (yakından uzağa)
+        """
+        names = list(points)
+        if not names or k <= 0:
+            return [[] for _ in names]
+        
+        coords = np.array([points[name] for name in names], dtype=np.float64)
+        distances = haversine_matrix(coords[:, 0], coords[:, 1])
+        np.fill_diagonal(distances, np.inf)
+        
+        order = np.argsort(distances, axis=1, kind='stable')[:, :k]
+        return [
+            [(names[j], float(distances[i, j])) for j in row if np.isfinite(distances[i, j])]
+            for i, row in enumerate(order.tolist())
+        ]
     
     def _estimate_road_type(self, distance_km: float) -> RoadType:
         """
@@ -246,123 +486,202 @@ class NetworkBuilder:
     
     def _osm_to_road_type(self, highway_tag: str) -> Optional[RoadType]:
         """OSM highway tag'ini RoadType'a çevir"""
-        mapping = {
-            'motorway': RoadType.MOTORWAY,
-            'motorway_link': RoadType.MOTORWAY,
-            'trunk': RoadType.TRUNK,
-            'trunk_link': RoadType.TRUNK,
-            'primary': RoadType.PRIMARY,
-            'primary_link': RoadType.PRIMARY,
-            'secondary': RoadType.SECONDARY,
-            'secondary_link': RoadType.SECONDARY,
-            'tertiary': RoadType.TERTIARY,
-            'tertiary_link': RoadType.TERTIARY,
-            'residential': RoadType.RESIDENTIAL,
-            'unclassified': RoadType.UNCLASSIFIED,
-            'service': RoadType.RESIDENTIAL,
-            'living_street': RoadType.RESIDENTIAL
-        }
-        
-        return mapping.get(highway_tag.lower())
-    
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        """Haversine ile mesafe hesapla"""
-        R = 6371  # km
-        
-        lat1_rad = math.radians(lat1)
-        lat2_rad = math.radians(lat2)
-        dlat = math.radians(lat2 - lat1)
-        dlon = math.radians(lon2 - lon1)
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
-        
-        return R * c
+        return OSM_HIGHWAY_ROAD_TYPES.get(highway_tag.lower())
     
     def add_intermediate_nodes(self, density: int = 10) -> None:
         """
         Network'e ara nodelar ekle (daha gerçekçi network)
         
+        Tek geçişte çalışır: her fiziksel yol bir kez ele alınır, ara
+        koordinatlar NumPy ile toplu interpolasyonla hesaplanır ve yeni
+        komşuluk yapısı baştan oluşturulur. Yol yönü (tek/çift yön) korunur.
+        
         Args:
-            density: Her edge için kaç ara node ekleneceği
+            density: Her edge kaç parçaya bölünecek (density - 1 ara node)
         """
-        print(f"🔧 Ara nodelar ekleniyor (density={density})...")
-        
-        # Mevcut edge'leri kopyala
-        original_edges = []
-        for from_id, edges in list(self.network.edges.items()):
-            for edge in edges:
-                original_edges.append((from_id, edge))
-        
-        new_nodes_count = 0
-        
-        for from_id, edge in original_edges:
-            to_id = edge.to_node
+        densify_start = time.perf_counter()
+        if density < 2:
+            return
+        
+        roads = self._collect_roads()
+        if not roads:
+            return
+        
+        nodes = self.network.nodes
+        inter_count = density - 1
+        
+        from_lat = np.array([nodes[e.from_node].lat for e in roads])
+        from_lon = np.array([nodes[e.from_node].lon for e in roads])
+        to_lat = np.array([nodes[e.to_node].lat for e in roads])
+        to_lon = np.array([nodes[e.to_node].lon for e in roads])
+        
+        # İnterpolasyon ile ara koordinatlar: (yol sayısı, density - 1)
+        ratios = np.arange(1, density) / density
+        inter_lat = from_lat[:, None] + (to_lat - from_lat)[:, None] * ratios
+        inter_lon = from_lon[:, None] + (to_lon - from_lon)[:, None] * ratios
+        
+        new_ids = self.network.add_nodes_bulk(inter_lat.ravel().tolist(), inter_lon.ravel().tolist())
+        inter_keys = coord_keys(inter_lat.ravel(), inter_lon.ravel()).tolist()
+        for key, node_id in zip(inter_keys, new_ids):
+            self.node_map.setdefault(key, node_id)
+        
+        # Her yolun zinciri: from -> ara nodelar -> to, segment mesafeleri tek seferde
+        chain_lat = np.hstack([from_lat[:, None], inter_lat, to_lat[:, None]])
+        chain_lon = np.hstack([from_lon[:, None], inter_lon, to_lon[:, None]])
+        segment_distances = haversine_pairwise(
+            chain_lat[:, :-1], chain_lon[:, :-1], chain_lat[:, 1:], chain_lon[:, 1:]
+        ).tolist()
+        
+        new_edges: Dict[int, List[Edge]] = defaultdict(list)
+        first_id = new_ids.start
+        
+        for road_index, edge in enumerate(roads):
+            base = first_id + road_index * inter_count
+            chain = [edge.from_node, *range(base, base + inter_count), edge.to_node]
             
-            from_node = self.network.nodes[from_id]
-            to_node = self.network.nodes[to_id]
+            # Dinamik faktörler dahil orijinal ağırlık/mesafe oranını koru
+            if edge.distance > 0:
+                weight_per_km = edge.weight / edge.distance
+            else:
+                weight_per_km = edge.road_type.weight
             
-            # Edge'i sil
-            self.network.edges[from_id] = [e for e in self.network.edges[from_id] if e.to_node != to_id]
-            
-            # Ara nodelar oluştur
-            prev_id = from_id
-            for i in range(1, density):
-                # İnterpolasyon ile ara koordinatlar
-                ratio = i / density
-                inter_lat = from_node.lat + (to_node.lat - from_node.lat) * ratio
-                inter_lon = from_node.lon + (to_node.lon - from_node.lon) * ratio
-                
-                # Ara node ekle
-                inter_id = self.network.add_node(inter_lat, inter_lon)
-                self.node_map[(inter_lat, inter_lon)] = inter_id
+            for j, distance in enumerate(segment_distances[road_index]):
+                u, v = chain[j], chain[j + 1]
+                weight = distance * weight_per_km
+                estimated_time = (distance / edge.max_speed) * 60  # dakika
                 
-                # Edge'leri bağla
-                self.network.add_edge(prev_id, inter_id, edge.road_type, bidirectional=True)
-                
-                prev_id = inter_id
-                new_nodes_count += 1
-            
-            # Son edge'i ekle
-            self.network.add_edge(prev_id, to_id, edge.road_type, bidirectional=True)
+                new_edges[u].append(Edge(u, v, distance, edge.road_type, weight,
+                                         edge.max_speed, estimated_time, edge.bidirectional))
+                if edge.bidirectional:
+                    new_edges[v].append(Edge(v, u, distance, edge.road_type, weight,
+                                             edge.max_speed, estimated_time, False))
+        
+        self.network.edges = new_edges
+        self.network.invalidate_caches()
+        
+        log.info("Ara nodelar eklendi", density=density, roads=len(roads), added=len(new_ids),
+                 nodes=self.network.node_count(), edges=self.network.edge_count(),
+                 duration_ms=_elapsed_ms(densify_start))
+    
+    def _collect_roads(self) -> List[Edge]:
+        """
+        Fiziksel yolları topla - çift yönlü yolların ters kopyalarını atla
+        
+        add_edge(bidirectional=True) iki Edge üretir: ileri yön bidirectional=True,
+        ters yön bidirectional=False. Ters kopyalar, eşleşen ileri kenar sayısı
+        kadar atlanır; gerçek tek yönlü yollar korunur.
+        """
+        twins = Counter()
+        for edges in self.network.edges.values():
+            for edge in edges:
+                if edge.bidirectional:
+                    twins[(edge.to_node, edge.from_node, edge.road_type)] += 1
+        
+        roads = []
+        for edges in self.network.edges.values():
+            for edge in edges:
+                key = (edge.from_node, edge.to_node, edge.road_type)
+                if not edge.bidirectional and twins[key] > 0:
+                    twins[key] -= 1
+                    continue
+                roads.append(edge)
         
-        print(f"✅ {new_nodes_count} ara node eklendi")
-        print(f"📊 Yeni network: {self.network.node_count()} node, {self.network.edge_count()} edge")
+        return roads
+
 
+# İzmir-Manisa bounding box: min_lat, min_lon, max_lat, max_lon
+IZMIR_MANISA_BBOX = (38.0, 26.3, 39.1, 28.5)
 
-def build_izmir_manisa_network(use_osm: bool = False) -> RoadNetwork:
+
+def build_izmir_manisa_network(use_osm: bool = False, density: int = 0,
+                               fire_stations: Optional[Dict[str, Tuple[float, float]]] = None,
+                               use_cache: bool = True, cache_dir: Optional[str] = None,
+                               tiles: Optional[Tuple[int, int]] = None,
+                               workers: Optional[int] = None, compact: bool = False) -> RoadNetwork:
     """
     İzmir-Manisa bölgesi için network oluştur
     
+    Aynı girdilerle (bbox, istasyon listesi, use_osm, density, RoadType
+    ağırlıkları) daha önce oluşturulmuş network diskteki cache'ten yüklenir.
+    
     Args:
         use_osm: True ise OpenStreetMap'ten gerçek veri çeker (yavaş ama gerçekçi)
                  False ise itfaiye istasyonlarından basit network oluşturur (hızlı)
+        density: 1'den büyükse her edge bu kadar parçaya bölünür (add_intermediate_nodes)
+        fire_stations: İtfaiye istasyonları (None ise load_fire_stations())
+        use_cache: False ise cache atlanır ve network her seferinde oluşturulur
+        cache_dir: Cache dizini (varsayılan: GRAPH_CACHE_DIR veya .graph_cache)
+        tiles: (rows, cols) verilirse OSM verisi tile tile paralel çekilir
+        workers: Tile modunda process sayısı
+        compact: True ise dizi tabanlı CompactRoadNetwork döner (ve öyle saklanır)
     """
+    if fire_stations is None:
+        fire_stations = load_fire_stations()
+    
+    source = 'osm' if use_osm else 'fire_stations'
+    cache_params = {
+        'bbox': list(IZMIR_MANISA_BBOX) if use_osm else None,
+        'stations': sorted([name, lat, lon] for name, (lat, lon) in fire_stations.items()),
+        'use_osm': use_osm,
+        'density': density,
+    }
+    if compact:
+        cache_params['compact'] = True
+    
+    cache = GraphBuildCache(cache_dir) if use_cache else None
+    if cache is not None:
+        cache_key = build_cache_key(cache_params)
+        network = cache.load(cache_key)
+        if network is not None:
+            log.info("Network cache'ten yüklendi", path=cache.path_for(cache_key))
+            return network
+    
     builder = NetworkBuilder()
     
     if use_osm:
-        # İzmir-Manisa bounding box
-        # min_lat, min_lon, max_lat, max_lon
-        bbox = (38.0, 26.3, 39.1, 28.5)
-        
-        print("🗺️  OSM modunda network oluşturuluyor (bu uzun sürebilir)...")
-        network = builder.build_from_osm_data(bbox)
+        if tiles:
+            network = builder.build_from_osm_tiles(IZMIR_MANISA_BBOX, tiles, fire_stations, workers=workers)
+        else:
+            network = builder.build_from_osm_data(IZMIR_MANISA_BBOX, fire_stations)
     else:
-        print("⚡ Hızlı modda network oluşturuluyor...")
-        network = builder.build_from_fire_stations()
+        network = builder.build_from_fire_stations(fire_stations)
+    
+    if density > 1:
+        builder.add_intermediate_nodes(density)
+    
+    if compact:
+        from compact_network import CompactRoadNetwork
+        network = CompactRoadNetwork.from_network(network)
+    
+    # OSM başarısız olup fallback network döndüyse OSM anahtarıyla saklama
+    if cache is not None and builder.source == source:
+        cache.store(cache_key, network)
     
     return network
 
 
 # Test fonksiyonu
 if __name__ == "__main__":
+    import argparse
+    from profiling import add_profile_arguments, profile_from_args
+    from structured_logging import configure_logging
+    
+    parser = argparse.ArgumentParser(description="Network builder testi")
+    parser.add_argument('--density', type=int, default=0, help="Edge başına parça sayısı (ara nodelar)")
+    parser.add_argument('--no-cache', action='store_true', help="Build cache'ini atla (build'i profillemek için)")
+    add_profile_arguments(parser, default_output='network_builder_profile')
+    args = parser.parse_args()
+    
+    configure_logging('INFO', 'text')
+    
     print("🏗️  Network Builder Test Ediliyor...\n")
     
     # Hızlı mod ile test
     print("=" * 60)
     print("TEST 1: Hızlı Mod (İtfaiye İstasyonlarından)")
     print("=" * 60)
-    network = build_izmir_manisa_network(use_osm=False)
+    with profile_from_args(args):
+        network = build_izmir_manisa_network(use_osm=False, density=args.density, use_cache=not args.no_cache)
     
     print(f"\n📊 Network İstatistikleri:")
     print(f"   Node sayısı: {network.node_count()}")
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+📥 ÖNCELİK KUYRUKLARI 📥
+Yol bulma algoritmaları için takılabilir (pluggable) priority queue'lar
+
+Ortak arayüz:
+    push(node, priority)  -> Ekle; node zaten varsa sadece daha küçük öncelikle güncelle
+    pop()                 -> (priority, node) - en küçük öncelikli node (her node bir kez)
+    len(queue), bool(queue)
+
+Kuyruklar:
+1. LazyHeapQueue     - heapq + lazy deletion (mevcut davranış, float öncelik)
+2. IndexedBinaryHeap - Pozisyon indeksli binary heap, gerçek decrease-key
+                       (heap boyutu O(V) ile sınırlı, O(E) değil)
+3. RadixHeap         - Monoton tamsayı öncelikler; pop amortize O(log C)
+4. BucketQueue       - Dial algoritması; tamsayı (quantize edilmiş) ağırlıklar, O(E + D)
+
+Radix ve bucket kuyrukları sadece monoton (son çıkandan küçük olmayan)
+tamsayı önceliklerle çalışır; Dijkstra ağırlıkları weight_scale ile tamsayıya
+çevirerek kullanır.
+"""
+
+import heapq
+from typing import Dict, List, Tuple
+
+
+class LazyHeapQueue:
+    """heapq tabanlı kuyruk - güncellemede yeni kayıt eklenir, eskiler pop'ta atlanır"""
+
+    def __init__(self):
+        self._heap: List[Tuple[float, int]] = []
+        self._best: Dict[int, float] = {}
+
+    def push(self, node: int, priority: float) -> None:
+        current = self._best.get(node)
+        if current is not None and current <= priority:
+            return
+        self._best[node] = priority
+        heapq.heappush(self._heap, (priority, node))
+
+    def pop(self) -> Tuple[float, int]:
+        heap = self._heap
+        best = self._best
+        while heap:
+            priority, node = heapq.heappop(heap)
+            if best.get(node) == priority:
+                del best[node]
+                return priority, node
+        raise IndexError("pop from empty queue")
+
+    def __len__(self) -> int:
+        return len(self._best)
+
+
+class IndexedBinaryHeap:
+    """
+    Decrease-key destekli binary heap
+
+    Her node heap'te en fazla bir kez bulunur; pozisyonu sözlükte tutulur ve
+    öncelik düştüğünde yerinde yukarı kaydırılır (sift-up).
+    """
+
+    def __init__(self):
+        self._nodes: List[int] = []
+        self._priorities: List[float] = []
+        self._position: Dict[int, int] = {}
+
+    def push(self, node: int, priority: float) -> None:
+        index = self._position.get(node)
+        if index is None:
+            index = len(self._nodes)
+            self._nodes.append(node)
+            self._priorities.append(priority)
+            self._position[node] = index
+        elif priority < self._priorities[index]:
+            self._priorities[index] = priority
+        else:
+            return
+        self._sift_up(index)
+
+    def pop(self) -> Tuple[float, int]:
+        nodes = self._nodes
+        if not nodes:
+            raise IndexError("pop from empty queue")
+
+        priorities = self._priorities
+        top_node, top_priority = nodes[0], priorities[0]
+        del self._position[top_node]
+
+        last_node = nodes.pop()
+        last_priority = priorities.pop()
+        if nodes:
+            nodes[0] = last_node
+            priorities[0] = last_priority
+            self._position[last_node] = 0
+            self._sift_down(0)
+
+        return top_priority, top_node
+
+    def _sift_up(self, index: int) -> None:
+        nodes, priorities, position = self._nodes, self._priorities, self._position
+        node, priority = nodes[index], priorities[index]
+
+        while index > 0:
+            parent = (index - 1) >> 1
+            if priorities[parent] <= priority:
+                break
+            nodes[index] = nodes[parent]
+            priorities[index] = priorities[parent]
+            position[nodes[index]] = index
+            index = parent
+
+        nodes[index] = node
+        priorities[index] = priority
+        position[node] = index
+
+    def _sift_down(self, index: int) -> None:
+        nodes, priorities, position = self._nodes, self._priorities, self._position
+        size = len(nodes)
+        node, priority = nodes[index], priorities[index]
+
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            right = child + 1
+            if right < size and priorities[right] < priorities[child]:
+                child = right
+            if priorities[child] >= priority:
+                break
+            nodes[index] = nodes[child]
+            priorities[index] = priorities[child]
+            position[nodes[index]] = index
+            index = child
+
+        nodes[index] = node
+        priorities[index] = priority
+        position[node] = index
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+
+class RadixHeap:
+    """
+    Radix heap - monoton tamsayı öncelikler için
+
+    Kayıtlar, son çıkarılan anahtarla en yüksek farklı bitin konumuna göre
+    kovalara dağıtılır (kova i: xor'un bit uzunluğu i). Kova 0 boşaldığında ilk
+    dolu kova yeni minimuma göre yeniden dağıtılır; her kayıt en fazla
+    O(log C) kez taşınır.
+    """
+
+    def __init__(self):
+        self._buckets: List[List[Tuple[int, int]]] = [[] for _ in range(65)]
+        self._keys: Dict[int, int] = {}
+        self._last = 0
+
+    def push(self, node: int, priority: int) -> None:
+        if priority < self._last:
+            raise ValueError("RadixHeap monoton öncelik gerektirir")
+        current = self._keys.get(node)
+        if current is not None and current <= priority:
+            return
+        self._keys[node] = priority
+        self._buckets[(priority ^ self._last).bit_length()].append((priority, node))
+
+    def pop(self) -> Tuple[int, int]:
+        buckets, keys = self._buckets, self._keys
+
+        while True:
+            if not buckets[0]:
+                for index in range(1, len(buckets)):
+                    if buckets[index]:
+                        break
+                else:
+                    raise IndexError("pop from empty queue")
+
+                entries = buckets[index]
+                buckets[index] = []
+                live = [(key, node) for key, node in entries if keys.get(node) == key]
+                if not live:
+                    continue
+
+                self._last = last = min(key for key, _ in live)
+                for key, node in live:
+                    buckets[(key ^ last).bit_length()].append((key, node))
+
+            key, node = buckets[0].pop()
+            if keys.get(node) == key:
+                del keys[node]
+                return key, node
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class BucketQueue:
+    """
+    Dial bucket queue - küçük tamsayı ağırlıklar için
+
+    Her tamsayı öncelik için bir kova; imleç sadece ileri gider. Toplam maliyet
+    O(E + D) (D: en büyük mesafe, quantize edilmiş birimlerde).
+    """
+
+    def __init__(self):
+        self._buckets: Dict[int, List[int]] = {}
+        self._keys: Dict[int, int] = {}
+        self._cursor = 0
+
+    def push(self, node: int, priority: int) -> None:
+        if priority < self._cursor:
+            raise ValueError("BucketQueue monoton öncelik gerektirir")
+        current = self._keys.get(node)
+        if current is not None and current <= priority:
+            return
+        self._keys[node] = priority
+        bucket = self._buckets.get(priority)
+        if bucket is None:
+            self._buckets[priority] = [node]
+        else:
+            bucket.append(node)
+
+    def pop(self) -> Tuple[int, int]:
+        if not self._keys:
+            raise IndexError("pop from empty queue")
+
+        buckets, keys = self._buckets, self._keys
+        cursor = self._cursor
+        while True:
+            bucket = buckets.get(cursor)
+            while bucket:
+                node = bucket.pop()
+                if keys.get(node) == cursor:
+                    del keys[node]
+                    self._cursor = cursor
+                    return cursor, node
+            if bucket is not None:
+                del buckets[cursor]
+            cursor += 1
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+QUEUE_TYPES = {
+    'heap': LazyHeapQueue,
+    'indexed': IndexedBinaryHeap,
+    'radix': RadixHeap,
+    'bucket': BucketQueue,
+}
+
+# Tamsayı (monoton) öncelik gerektiren kuyruklar
+INTEGER_QUEUES = {'radix', 'bucket'}
+
+
+def make_queue(kind: str):
+    """İsme göre kuyruk oluştur"""
+    try:
+        return QUEUE_TYPES[kind]()
+    except KeyError:
+        raise ValueError(f"Bilinmeyen kuyruk tipi: {kind} (seçenekler: {', '.join(QUEUE_TYPES)})")
+
+
+# Benchmark
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import random
+    import time
+
+    from advanced_pathfinding import DijkstraPathfinder
+    from network_builder import build_izmir_manisa_network
+
+    print("📥 Priority Queue Benchmark\n")
+
+    # 1. Ham kuyruk işlemleri: Dijkstra benzeri monoton iş yükü
+    rng = random.Random(42)
+    operations = 200_000
+    print(f"{'Kuyruk':<10} {'push+pop (ms)':<15}")
+    print("-" * 30)
+    for kind in QUEUE_TYPES:
+        queue = make_queue(kind)
+        rng.seed(42)
+        start = time.perf_counter()
+        base = 0
+        for i in range(operations):
+            queue.push(i, base + rng.randint(0, 5000))
+            if i % 3 == 2:
+                base, _ = queue.pop()
+        while queue:
+            queue.pop()
+        print(f"{kind:<10} {(time.perf_counter() - start) * 1000:<15.1f}")
+
+    # 2. Yoğunlaştırılmış İzmir-Manisa ağında Dijkstra
+    with contextlib.redirect_stdout(io.StringIO()):
+        network = build_izmir_manisa_network(density=20)
+    pairs = [(rng.choice(network.fire_stations), rng.choice(network.fire_stations)) for _ in range(20)]
+
+    print(f"\nDijkstra ({network.node_count()} node, {len(pairs)} sorgu)")
+    print(f"{'Kuyruk':<10} {'Ort. (ms)':<12} {'Ağırlık farkı':<15}")
+    print("-" * 40)
+    reference = [DijkstraPathfinder(network).find_shortest_path(s, t) for s, t in pairs]
+    for kind in QUEUE_TYPES:
+        pathfinder = DijkstraPathfinder(network, queue=kind)
+        start = time.perf_counter()
+        results = [pathfinder.find_shortest_path(s, t) for s, t in pairs]
+        elapsed = (time.perf_counter() - start) * 1000 / len(pairs)
+        max_diff = max(abs(r['weight'] - ref['weight']) for r, ref in zip(results, reference))
+        print(f"{kind:<10} {elapsed:<12.3f} {max_diff:<15.6f}")
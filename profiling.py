@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+🔥 PROFİLLEME KANCALARI (cProfile / ÖRNEKLEYİCİ) 🔥
+CLI giriş noktaları için tek satırlık profil anahtarı: --profile cprofile|sample
+
+- cprofile: deterministik (her çağrı), ncalls/tottime/cumtime; .prof dosyası
+  (pstats, snakeviz) + çağıran grafiğinden türetilen collapsed stack'ler
+- sample: düşük maliyetli duvar saati örnekleyicisi - ayrı bir thread hedef
+  thread'in stack'ini sys._current_frames() ile her interval'da okur; gerçek
+  stack'ler, I/O beklemesi dahil. Örnekleyici GIL'i ancak hedef thread
+  bıraktığında alabildiğinden (aksi halde örnekler bloklayan çağrılara
+  kayar) örnekleme süresince GIL geçiş aralığı interval / 5'e indirilir
+- Çıktı: <prefix>.collapsed ("a;b;c ağırlık" satırları - speedscope.app,
+  flamegraph.pl, inferno ile flamegraph'a çevrilir) + top-N hotspot tablosu
+
+Kullanım:
+    add_profile_arguments(parser)
+    with profile_from_args(args):
+        run_workload()
+"""
+
+import argparse
+import contextlib
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+PROFILE_MODES = ('cprofile', 'sample')
+DEFAULT_INTERVAL = 0.005
+DEFAULT_TOP = 20
+MAX_STACK_DEPTH = 128
+
+
+def _frame_label(code) -> str:
+    return f"{os.path.basename(code.co_filename)}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+def _pstats_label(func: Tuple[str, int, str]) -> str:
+    filename, line, name = func
+    if filename == '~':  # builtin
+        return name
+    # pstats ile aynı biçim; aynı adlı metodlar (ör. find_shortest_path) ayrışır
+    return f"{os.path.basename(filename)}:{line}({name})"
+
+
+class SamplingProfiler:
+    """Hedef thread'in stack'ini periyodik olarak örnekleyen profiler"""
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, thread_id: Optional[int] = None):
+        self.interval = interval
+        self.thread_id = thread_id
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._switch_interval = sys.getswitchinterval()
+
+    def start(self) -> None:
+        if self.thread_id is None:
+            self.thread_id = threading.get_ident()
+        self._stop.clear()
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 5))
+        self._start_time = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.elapsed = time.perf_counter() - self._start_time
+        sys.setswitchinterval(self._switch_interval)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            if stack:
+                self.stacks[tuple(_frame_label(code) for code in reversed(stack))] += 1
+                self.samples += 1
+
+    def collapsed(self) -> Dict[str, float]:
+        return {';'.join(stack): count for stack, count in self.stacks.items()}
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> List[Dict]:
+        """Fonksiyon başına self (yaprak) ve toplam (stack'te bulunma) süresi"""
+        if not self.samples:
+            return []
+        per_sample = self.elapsed / self.samples
+        self_counts: Counter = Counter()
+        total_counts: Counter = Counter()
+        for stack, count in self.stacks.items():
+            self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+        rows = [{
+            'function': label,
+            'calls': None,
+            'self_s': self_counts[label] * per_sample,
+            'total_s': count * per_sample,
+        } for label, count in total_counts.items()]
+        rows.sort(key=lambda row: (row['self_s'], row['total_s']), reverse=True)
+        return rows[:top]
+
+
+class CProfileProfiler:
+    """cProfile sarmalayıcısı - pstats + türetilmiş collapsed stack'ler"""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.stats: Optional[pstats.Stats] = None
+        self.elapsed = 0.0
+
+    def start(self) -> None:
+        self._start_time = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+        self.elapsed = time.perf_counter() - self._start_time
+        self.stats = pstats.Stats(self.profile)
+
+    def dump(self, path: str) -> None:
+        self.stats.dump_stats(path)
+
+    def collapsed(self, min_fraction: float = 1e-4) -> Dict[str, float]:
+        """
+        Çağıran grafiğinden collapsed stack'ler (ağırlık: mikrosaniye)
+
+        cProfile yalnızca çağıran -> çağrılan kenarlarını tutar; bir fonksiyonun
+        süresi, her kenarın cumtime payı oranında çağıranların yollarına
+        dağıtılır (flameprof yaklaşımı). Özyinelemeli kenarlar ve toplamın
+        min_fraction'ından küçük dallar atlanır.
+        """
+        raw = self.stats.stats
+        callees: Dict = defaultdict(list)
+        for func, (_, _, _, _, callers) in raw.items():
+            for caller, edge in callers.items():
+                callees[caller].append((func, edge[3]))
+
+        total = sum(tt for _, _, tt, _, _ in raw.values()) or 1.0
+        min_time = total * min_fraction
+        lines: Counter = Counter()
+
+        def visit(func, path: Tuple[str, ...], on_path: frozenset, ratio: float) -> None:
+            _, _, tt, _, _ = raw[func]
+            path = path + (_pstats_label(func),)
+            if tt * ratio >= min_time:
+                lines[';'.join(path)] += tt * ratio * 1e6
+            if len(path) >= MAX_STACK_DEPTH:
+                return
+            for callee, edge_ct in callees.get(func, ()):
+                callee_ct = raw[callee][3]
+                if callee in on_path or callee_ct <= 0:
+                    continue
+                share = ratio * min(1.0, edge_ct / callee_ct)
+                if callee_ct * share >= min_time:
+                    visit(callee, path, on_path | {callee}, share)
+
+        for func, (_, _, _, _, callers) in raw.items():
+            if not callers:
+                visit(func, (), frozenset((func,)), 1.0)
+        return {stack: round(weight) for stack, weight in lines.items() if round(weight) > 0}
+
+    def hotspots(self, top: int = DEFAULT_TOP) -> List[Dict]:
+        rows = [{
+            'function': _pstats_label(func),
+            'calls': nc,
+            'self_s': tt,
+            'total_s': ct,
+        } for func, (_, nc, tt, ct, _) in self.stats.stats.items()]
+        rows.sort(key=lambda row: row['self_s'], reverse=True)
+        return rows[:top]
+
+
+def write_collapsed(collapsed: Dict[str, float], path: str) -> None:
+    with open(path, 'w', encoding='utf-8') as f:
+        for stack, weight in sorted(collapsed.items(), key=lambda item: item[1], reverse=True):
+            f.write(f"{stack} {int(round(weight))}\n")
+
+
+def print_hotspots(rows: List[Dict], elapsed: float, title: str) -> None:
+    print(f"\n🔥 {title} - en sıcak {len(rows)} fonksiyon (toplam {elapsed:.2f} s)")
+    print(f"{'self (s)':>10}{'self %':>8}{'toplam (s)':>12}{'çağrı':>10}  fonksiyon")
+    print("-" * 80)
+    for row in rows:
+        calls = '' if row['calls'] is None else str(row['calls'])
+        share = row['self_s'] / elapsed * 100 if elapsed else 0.0
+        print(f"{row['self_s']:>10.3f}{share:>7.1f}%{row['total_s']:>12.3f}{calls:>10}  {row['function']}")
+
+
+@contextlib.contextmanager
+def profiled(mode: str = 'sample', output: str = 'profile', top: int = DEFAULT_TOP,
+             interval: float = DEFAULT_INTERVAL):
+    """
+    with bloğunu profille; çıkışta <output>.collapsed (+ cprofile için
+    <output>.prof) yazılır ve hotspot tablosu basılır
+
+    Args:
+        mode: 'cprofile' veya 'sample'
+        output: Çıktı dosya öneki
+        top: Tabloda gösterilecek fonksiyon sayısı
+        interval: Örnekleme aralığı (saniye, yalnızca sample)
+    """
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Bilinmeyen profil modu: {mode} (seçenekler: {', '.join(PROFILE_MODES)})")
+    profiler = CProfileProfiler() if mode == 'cprofile' else SamplingProfiler(interval)
+
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        collapsed_path = f"{output}.collapsed"
+        write_collapsed(profiler.collapsed(), collapsed_path)
+        title = 'cProfile' if mode == 'cprofile' else f"Örnekleyici ({profiler.samples} örnek)"
+        print_hotspots(profiler.hotspots(top), profiler.elapsed, title)
+        print(f"\n💾 Collapsed stack'ler: {collapsed_path} (speedscope.app / flamegraph.pl ile flamegraph)")
+        if mode == 'cprofile':
+            profiler.dump(f"{output}.prof")
+            print(f"💾 pstats: {output}.prof (python -m pstats / snakeviz)")
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser, default_output: str = 'profile') -> None:
+    group = parser.add_argument_group('profilleme')
+    group.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                       help="İş yükünü cProfile veya örnekleyici altında çalıştır")
+    group.add_argument('--profile-output', default=default_output, metavar='PREFIX',
+                       help="Çıktı öneki: PREFIX.collapsed (+ PREFIX.prof)")
+    group.add_argument('--profile-top', type=int, default=DEFAULT_TOP, help="Hotspot tablosu satır sayısı")
+    group.add_argument('--profile-interval', type=float, default=DEFAULT_INTERVAL,
+                       help="Örnekleme aralığı (saniye)")
+
+
+def profile_from_args(args: argparse.Namespace):
+    """--profile verilmediyse hiçbir şey yapmayan context manager"""
+    if not getattr(args, 'profile', None):
+        return contextlib.nullcontext()
+    return profiled(args.profile, args.profile_output, args.profile_top, args.profile_interval)
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import tempfile
+
+    def _leaf(n: int) -> float:
+        return sum(i * i for i in range(n))
+
+    def _workload() -> None:
+        for _ in range(10):
+            _leaf(300_000)
+            time.sleep(0.01)
+
+    print("🔥 Profilleme Testi")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in PROFILE_MODES:
+            prefix = os.path.join(tmp, mode)
+            with profiled(mode, prefix, top=5):
+                _workload()
+            with open(f"{prefix}.collapsed", encoding='utf-8') as f:
+                stacks = f.read().splitlines()
+            assert any('_leaf' in line for line in stacks), stacks[:5]
+            print(f"   ✅ {mode}: {len(stacks)} collapsed stack satırı")
@@ -0,0 +1,489 @@
+#!/usr/bin/env python3
+"""
+🗂️ SORGU KAYDI VE TEKRAR OYNATMA (REPLAY) 🗂️
+Yavaş bir ihbarın girdilerini saklayıp aynı analizi çevrimdışı yeniden çalıştırır
+
+Kayıt (isteğe bağlı, append-only JSON-lines; yol .gz ile bitiyorsa gzip):
+    - yangın koordinatı, otomatik itfaiye araması kullanıldı mı, istasyon listesi özeti
+    - seçilen itfaiye, motor/profil, mesafe, hata, uçtan uca süre (duration_ms)
+    - ağırlık vektörü sürümü (RoadType + yol/hava/trafik çarpanları özeti;
+      graph cache formatından bağımsız, yalnızca WEIGHT_VECTOR_VERSION ile)
+    - tüm dış API yanıtları (OSRM, OpenWeather, TomTom): durum kodu, gövde, süre
+
+Kayıtlar bellekte biriktirilir ve flush_every kayıtta, flush_interval
+saniyede (bir sonraki kayıtta) veya kapanışta (atexit dahil) tek yazma ile
+diske aktarılır: olay döngüsünde analiz başına senkron yazma + flush yok,
+.gz çıktıda her flush bir Z_SYNC_FLUSH olduğundan sıkıştırma da korunur.
+
+Tekrar oynatma: her kayıt, kaydedilmiş yanıtlar ağ yerine sunularak güncel
+kodla yeniden çalıştırılır ve süre farkı raporlanır. latency='recorded'
+modunda her yanıt kaydedilmiş süresi kadar geciktirilir (uçtan uca kıyas),
+latency='none' modunda yalnızca hesaplama süresi ölçülür.
+
+Kullanım:
+    enable_query_log('queries.jsonl.gz')          # veya config.QUERY_LOG_PATH
+    python query_log.py queries.jsonl.gz --latency none --repeat 3
+"""
+
+import argparse
+import asyncio
+import atexit
+import contextlib
+import functools
+import gzip
+import hashlib
+import io
+import json
+import logging
+import statistics
+import sys
+import time
+from collections import defaultdict, deque
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, List, Optional
+
+import config
+from fire_stations import load_fire_stations
+from graph_cache import road_type_signature
+from tomtom_api import TomTomAPI
+
+QUERY_LOG_VERSION = 1
+
+# Ağırlık özetinin biçimi değiştiğinde artırılmalı (graph cache sürümünden bağımsız)
+WEIGHT_VECTOR_VERSION = 1
+
+# Tampon boşaltma: bu kadar kayıt veya bu kadar saniye
+FLUSH_EVERY = 64
+FLUSH_INTERVAL = 5.0
+
+# Kayıtta bulunmayan bir istek tekrar oynatılırken dönen durum kodu
+MISSING_STATUS = 599
+
+# Aktif analiz oturumu (_CaptureSession veya _ReplaySession) - asyncio görevleri
+# arasında contextvars ile taşınır, eşzamanlı analizler birbirine karışmaz
+_session: ContextVar[Optional['_CaptureSession']] = ContextVar('query_log_session', default=None)
+
+_query_log: Optional['QueryLog'] = None
+_atexit_registered = False
+
+
+def _digest(payload: Dict) -> str:
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()[:12]
+
+
+def weight_vector_version() -> str:
+    """Rota ağırlıklarını belirleyen tabloların kısa özeti - ağırlık değişirse sürüm değişir"""
+    return _digest({
+        'version': WEIGHT_VECTOR_VERSION,
+        'road_types': road_type_signature(),
+        'road_weights': config.ROAD_WEIGHTS,
+        'weather': config.WEATHER_MULTIPLIERS,
+        'traffic': config.TRAFFIC_MULTIPLIERS,
+        'road_conditions': config.ROAD_CONDITION_MULTIPLIERS,
+    })
+
+
+def stations_version(fire_stations: Optional[Dict]) -> Optional[str]:
+    if fire_stations is None:
+        return None
+    return _digest({
+        'stations': sorted([name, lat, lon] for name, (lat, lon) in fire_stations.items())
+    })
+
+
+class QueryLog:
+    """Append-only sorgu kaydı - analiz başına tek satır JSON (tamponlu)"""
+
+    def __init__(self, path: str, flush_every: int = FLUSH_EVERY, flush_interval: float = FLUSH_INTERVAL):
+        self.path = path
+        if path.endswith('.gz'):
+            # Her açılış yeni bir gzip üyesi ekler; okuyucu hepsini ardışık okur
+            self._file = gzip.open(path, 'at', encoding='utf-8')
+        else:
+            self._file = open(path, 'a', encoding='utf-8')
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._pending: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def append(self, record: Dict) -> None:
+        self._pending.append(json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=list) + '\n')
+        self.count += 1
+        if (len(self._pending) >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Biriken kayıtları tek yazma ile diske aktar"""
+        if self._pending:
+            self._file.write(''.join(self._pending))
+            self._pending.clear()
+        self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+
+
+def read_query_log(path: str) -> Iterator[Dict]:
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def enable_query_log(path: str) -> QueryLog:
+    """Bundan sonraki tüm analizleri path'e kaydet"""
+    global _query_log, _atexit_registered
+    disable_query_log()
+    _query_log = QueryLog(path)
+    if not _atexit_registered:
+        atexit.register(disable_query_log)  # tampondaki kayıtlar çıkışta kaybolmasın
+        _atexit_registered = True
+    return _query_log
+
+
+def disable_query_log() -> None:
+    global _query_log
+    if _query_log is not None:
+        _query_log.close()
+        _query_log = None
+
+
+def get_query_log() -> Optional[QueryLog]:
+    return _query_log
+
+
+class _CaptureSession:
+    """Bir analiz boyunca yapılan dış API çağrılarını toplar"""
+
+    __slots__ = ('responses',)
+
+    def __init__(self):
+        self.responses: List[Dict] = []
+
+    def record(self, api: str, key: str, status: Optional[int], body, elapsed_ms: float,
+               error: Optional[str] = None) -> None:
+        response = {'api': api, 'key': key, 'status': status,
+                    'elapsed_ms': round(elapsed_ms, 3), 'body': body}
+        if error is not None:
+            response['error'] = error
+        self.responses.append(response)
+
+
+class _ReplaySession:
+    """Kaydedilmiş yanıtları (api, key) sırasına göre geri sunar"""
+
+    __slots__ = ('by_key', 'by_api', 'apply_latency', 'missing', 'substituted')
+
+    def __init__(self, responses: List[Dict], apply_latency: bool):
+        self.by_key: Dict = defaultdict(deque)
+        self.by_api: Dict = defaultdict(deque)
+        for response in map(dict, responses):
+            self.by_key[(response['api'], response['key'])].append(response)
+            self.by_api[response['api']].append(response)
+        self.apply_latency = apply_latency
+        self.missing: List[str] = []
+        self.substituted = 0
+
+    def take(self, api: str, key: str) -> Optional[Dict]:
+        queue = self.by_key.get((api, key))
+        if queue:
+            response = queue.popleft()
+        else:
+            # Anahtar değiştiyse (ör. farklı örnek noktası) aynı API'nin sıradaki yanıtı
+            pending = [r for r in self.by_api.get(api, ()) if not r.get('_used')]
+            if not pending:
+                self.missing.append(f"{api}:{key}")
+                return None
+            response = pending[0]
+            self.by_key[(api, response['key'])].remove(response)
+            self.substituted += 1
+        response['_used'] = True
+        return response
+
+
+class RecordedResponse:
+    """Tekrar oynatmada aiohttp yanıtının yerine geçen nesne (status + json())"""
+
+    __slots__ = ('status', 'body')
+
+    def __init__(self, status: int, body):
+        self.status = status
+        self.body = body
+
+    async def json(self, **kwargs):
+        return self.body
+
+
+class _CapturingResponse:
+    """Gerçek yanıtı sarar; json() ile okunan gövde kayda eklenir"""
+
+    __slots__ = ('response', 'body')
+
+    def __init__(self, response):
+        self.response = response
+        self.body = None
+
+    @property
+    def status(self) -> int:
+        return self.response.status
+
+    async def json(self, **kwargs):
+        self.body = await self.response.json(**kwargs)
+        return self.body
+
+    def __getattr__(self, name):
+        return getattr(self.response, name)
+
+
+class logged_request:
+    """
+    Dış API isteğini kayıt/tekrar oynatmaya bağla:
+
+        async with logged_request('osrm', profile,
+                                  lambda: timed_request('osrm', session.get(...))) as response:
+
+    Oturum yoksa istek olduğu gibi yapılır; kayıt modunda yanıt ve süresi
+    saklanır; tekrar oynatmada istek hiç gönderilmez (request_factory çağrılmaz).
+    """
+
+    __slots__ = ('api', 'key', 'factory', 'session', 'request', 'wrapped', 'start')
+
+    def __init__(self, api: str, key: str, request_factory: Callable):
+        self.api = api
+        self.key = key
+        self.factory = request_factory
+        self.session = None
+        self.request = None
+        self.wrapped = None
+        self.start = 0.0
+
+    async def __aenter__(self):
+        self.session = _session.get()
+        if isinstance(self.session, _ReplaySession):
+            recorded = self.session.take(self.api, self.key)
+            if recorded is None:
+                return RecordedResponse(MISSING_STATUS, None)
+            if self.session.apply_latency:
+                await asyncio.sleep(recorded['elapsed_ms'] / 1000)
+            if 'error' in recorded:
+                raise ConnectionError(f"Kaydedilmiş bağlantı hatası: {recorded['error']}")
+            return RecordedResponse(recorded['status'], recorded['body'])
+
+        self.request = self.factory()
+        if self.session is None:
+            return await self.request.__aenter__()
+        self.start = time.perf_counter()
+        try:
+            response = await self.request.__aenter__()
+        except Exception as e:
+            self.session.record(self.api, self.key, None, None, (time.perf_counter() - self.start) * 1000,
+                                error=f"{type(e).__name__}: {e}")
+            self.request = None
+            raise
+        self.wrapped = _CapturingResponse(response)
+        return self.wrapped
+
+    async def __aexit__(self, *exc):
+        if self.request is None:
+            return False
+        try:
+            return await self.request.__aexit__(*exc)
+        finally:
+            if self.wrapped is not None:
+                self.session.record(self.api, self.key, self.wrapped.status, self.wrapped.body,
+                                    (time.perf_counter() - self.start) * 1000)
+
+
+def _summarize(result: Dict) -> Dict:
+    base_route = result.get('base_route') or {}
+    return {
+        'station': result.get('nearest_station'),
+        'station_coords': result.get('nearest_station_coords'),
+        'engine': 'osrm',
+        'profile': base_route.get('profile_used'),
+        'distance_km': base_route.get('distance'),
+        'duration_min': base_route.get('duration'),
+        'error': result.get('error'),
+    }
+
+
+def logged_query(func: Callable) -> Callable:
+    """
+    analyze_emergency_route(fire_location, fire_stations, tomtom_api) dekoratörü
+
+    Sorgu kaydı açıksa (ve tekrar oynatma yoksa) analizi yakalama oturumunda
+    çalıştırır ve sonucu tek satır olarak ekler. Kayıt kapalıyken maliyet tek
+    bir None kontrolüdür.
+    """
+    @functools.wraps(func)
+    async def wrapper(fire_location, fire_stations=None, tomtom_api=None):
+        query_log = _query_log
+        if query_log is None or _session.get() is not None:
+            return await func(fire_location, fire_stations, tomtom_api)
+
+        capture = _CaptureSession()
+        token = _session.set(capture)
+        start = time.perf_counter()
+        try:
+            result = await func(fire_location, fire_stations, tomtom_api)
+        finally:
+            _session.reset(token)
+        duration_ms = (time.perf_counter() - start) * 1000
+
+        query_log.append({
+            'version': QUERY_LOG_VERSION,
+            'ts': round(time.time(), 3),
+            'fire_location': list(fire_location),
+            'auto_search': tomtom_api is not None,
+            'stations_version': stations_version(fire_stations),
+            'weight_vector_version': weight_vector_version(),
+            **_summarize(result),
+            'duration_ms': round(duration_ms, 3),
+            'responses': capture.responses,
+        })
+        return result
+
+    return wrapper
+
+
+async def replay_record(record: Dict, fire_stations: Optional[Dict] = None,
+                        apply_latency: bool = True) -> Dict:
+    """Tek bir kaydı kaydedilmiş yanıtlarla yeniden çalıştır"""
+    import route_calculator  # döngüsel import: route_calculator bu modülü kullanır
+
+    replay = _ReplaySession(record['responses'], apply_latency)
+    token = _session.set(replay)
+    start = time.perf_counter()
+    try:
+        result = await route_calculator.analyze_emergency_route(
+            tuple(record['fire_location']), fire_stations,
+            TomTomAPI() if record['auto_search'] else None
+        )
+    finally:
+        _session.reset(token)
+    replay_ms = (time.perf_counter() - start) * 1000
+
+    summary = _summarize(result)
+    return {
+        'fire_location': record['fire_location'],
+        'recorded_ms': record['duration_ms'],
+        'replay_ms': replay_ms,
+        'station_match': summary['station'] == record['station'],
+        'profile_match': summary['profile'] == record['profile'],
+        'station': summary['station'],
+        'recorded_station': record['station'],
+        'missing': replay.missing,
+        'substituted': replay.substituted,
+        'weights_changed': record['weight_vector_version'] != weight_vector_version(),
+    }
+
+
+async def replay_query_log(path: str, apply_latency: bool = True, repeat: int = 1,
+                           limit: Optional[int] = None, quiet: bool = True) -> List[Dict]:
+    """
+    Kaydı baştan sona yeniden oynat
+
+    Args:
+        apply_latency: True ise kaydedilmiş API süreleri uygulanır
+        repeat: Kayıt başına tekrar sayısı (medyan replay süresi raporlanır)
+        limit: En fazla bu kadar kayıt
+        quiet: Sistem çıktısını ve loglarını bastır
+    """
+    default_stations = load_fire_stations()
+    results = []
+    for index, record in enumerate(read_query_log(path)):
+        if limit is not None and index >= limit:
+            break
+        # Kayıt yalnızca istasyon listesinin özetini tutar; güncel liste kullanılır
+        runs = []
+        for _ in range(repeat):
+            if quiet:
+                logging.disable(logging.CRITICAL)
+            try:
+                with contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext():
+                    runs.append(await replay_record(record, default_stations, apply_latency))
+            finally:
+                if quiet:
+                    logging.disable(logging.NOTSET)
+
+        result = runs[-1]
+        result['replay_ms'] = statistics.median(run['replay_ms'] for run in runs)
+        result['delta_ms'] = result['replay_ms'] - result['recorded_ms']
+        result['stations_changed'] = (record['stations_version'] is not None
+                                      and record['stations_version'] != stations_version(default_stations))
+        results.append(result)
+    return results
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def print_replay_report(results: List[Dict], top: int = 5) -> None:
+    if not results:
+        print("⚠️ Kayıtta sorgu yok")
+        return
+
+    recorded = [r['recorded_ms'] for r in results]
+    replayed = [r['replay_ms'] for r in results]
+
+    print(f"\n{'':<10}{'p50 (ms)':>12}{'p90 (ms)':>12}{'maks (ms)':>12}")
+    print("-" * 46)
+    for label, values in (('kayıt', recorded), ('replay', replayed)):
+        print(f"{label:<10}{_percentile(values, 0.5):>12.1f}{_percentile(values, 0.9):>12.1f}{max(values):>12.1f}")
+    deltas = [r['delta_ms'] for r in results]
+    print(f"{'fark':<10}{_percentile(deltas, 0.5):>+12.1f}{_percentile(deltas, 0.9):>+12.1f}{max(deltas):>+12.1f}")
+
+    mismatches = [r for r in results if not (r['station_match'] and r['profile_match'])]
+    missing = sum(len(r['missing']) for r in results)
+    substituted = sum(r['substituted'] for r in results)
+    print(f"\n🔁 {len(results)} sorgu yeniden oynatıldı: {len(mismatches)} farklı sonuç, "
+          f"{missing} eksik yanıt, {substituted} anahtar uyuşmazlığı")
+    if any(r['weights_changed'] for r in results):
+        print("⚖️  Ağırlık vektörü kayıttan bu yana değişti - rota farkları beklenebilir")
+    if any(r['stations_changed'] for r in results):
+        print("🚒 İstasyon listesi kayıttan bu yana değişti")
+
+    print(f"\n🐢 En büyük gerileme ({min(top, len(results))}):")
+    for r in sorted(results, key=lambda r: r['delta_ms'], reverse=True)[:top]:
+        lat, lon = r['fire_location']
+        note = '' if r['station_match'] else f"  (kayıt: {r['recorded_station']})"
+        print(f"   {lat:.5f}, {lon:.5f}  {r['recorded_ms']:8.1f} -> {r['replay_ms']:8.1f} ms "
+              f"({r['delta_ms']:+.1f})  {r['station']}{note}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sorgu kaydını çevrimdışı yeniden oynat ve süre farkını raporla")
+    parser.add_argument('path', help="Sorgu kaydı (.jsonl veya .jsonl.gz)")
+    parser.add_argument('--latency', choices=('recorded', 'none'), default='recorded',
+                        help="recorded: kaydedilmiş API sürelerini uygula, none: yalnızca hesaplama")
+    parser.add_argument('--repeat', type=int, default=1, help="Kayıt başına tekrar (medyan)")
+    parser.add_argument('--limit', type=int, default=None, help="En fazla bu kadar kayıt")
+    parser.add_argument('--top', type=int, default=5, help="Listelenecek en büyük gerileme sayısı")
+    parser.add_argument('--verbose', action='store_true', help="Sistem çıktısını bastırma")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    print(f"🗂️  Sorgu kaydı yeniden oynatılıyor: {args.path} (latency={args.latency}, repeat={args.repeat})")
+    results = asyncio.run(replay_query_log(args.path, apply_latency=args.latency == 'recorded',
+                                           repeat=args.repeat, limit=args.limit, quiet=not args.verbose))
+    print_replay_report(results, args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    # Çağrı noktaları 'query_log' modülünü import eder; oturum ContextVar'ı
+    # __main__ kopyasında değil o modülde kurulmalı
+    import query_log
+    sys.exit(query_log.main())
@@ -4,28 +4,29 @@
 Akıllı rota optimizasyonu ile entegre edilmiş
 """
 
+import asyncio
+import aiohttp
 import requests
 import json
-import math
+import logging
+import time
 from typing import Dict, Tuple, List, Optional
 from fire_stations import load_fire_stations
 from fire_station_finder import FireStationFinder
 from smart_route_optimizer import SmartRouteOptimizer
+from geodesy import haversine, nearest_indices
+from tracing import span, annotate, traced
+from metrics import ANALYSES_IN_PROGRESS, timed_request, track_in_progress
+from structured_logging import get_logger, lazy
+from query_log import logged_query, logged_request
 import config
 import polyline  # OSRM encoded polyline decode için
 
+log = get_logger(__name__)
+
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """İki nokta arasındaki mesafeyi hesapla (km)"""
-    R = 6371  # Dünya'nın yarıçapı (km)
-    
-    lat1, lon1, lat2, lon2 = map(math.radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    
-    return R * c
+    return haversine(lat1, lon1, lat2, lon2)
 
 async def find_nearest_fire_station(fire_location: Tuple[float, float], 
                                    fire_stations: Dict[str, Tuple[float, float]] = None,
@@ -35,7 +36,7 @@ async def find_nearest_fire_station(fire_location: Tuple[float, float],
     # Otomatik itfaiye bulma sistemi varsa kullan
     if tomtom_api:
         try:
-            print("🔍 Otomatik itfaiye arama sistemi kullanılıyor...")
+            log.debug("Otomatik itfaiye arama sistemi kullanılıyor")
             finder = FireStationFinder(tomtom_api)
             nearest_station_info = await finder.get_nearest_fire_station(fire_location)
             
@@ -44,41 +45,37 @@ async def find_nearest_fire_station(fire_location: Tuple[float, float],
                 station_coords = nearest_station_info['coords']
                 distance = nearest_station_info['distance']
                 
-                print(f"✅ Otomatik bulunan itfaiye: {station_name}")
-                print(f"   📍 Konum: {station_coords}")
-                print(f"   📏 Mesafe: {distance:.1f} km")
-                print(f"   🏠 Adres: {nearest_station_info.get('address', 'N/A')}")
+                log.info("Otomatik bulunan itfaiye", station=station_name, coords=station_coords,
+                         distance_km=distance, address=nearest_station_info.get('address', 'N/A'))
                 
                 return station_name, station_coords, distance
             else:
-                print("⚠️ Otomatik arama başarısız, manuel arama kullanılıyor...")
+                log.warning("Otomatik arama sonuçsuz, manuel arama kullanılıyor")
                 
         except Exception as e:
-            print(f"⚠️ Otomatik itfaiye arama hatası: {e}")
-            print("🔄 Manuel arama kullanılıyor...")
+            log.warning("Otomatik itfaiye arama hatası, manuel arama kullanılıyor", error=str(e))
     
     # Manuel arama (fallback)
     if fire_stations is None:
         fire_stations = load_fire_stations()
     
-    fire_lat, fire_lon = fire_location
-    nearest_station = None
-    nearest_coords = None
-    min_distance = float('inf')
+    if not fire_stations:
+        raise ValueError("Hiç itfaiye istasyonu bulunamadı!")
     
-    for name, coords in fire_stations.items():
-        distance = haversine_distance(fire_location[0], fire_location[1], coords[0], coords[1])
-        if distance < min_distance:
-            min_distance = distance
-            nearest_station = name
-            nearest_coords = coords
+    # Tüm istasyonlara mesafe tek bir vektörel işlemle
+    names = list(fire_stations)
+    coords = [fire_stations[name] for name in names]
+    indices, distances = nearest_indices(
+        fire_location[0], fire_location[1],
+        [c[0] for c in coords], [c[1] for c in coords], k=1
+    )
     
-    if nearest_station is None:
-        raise ValueError("Hiç itfaiye istasyonu bulunamadı!")
+    nearest_station = names[int(indices[0])]
+    nearest_coords = fire_stations[nearest_station]
+    min_distance = float(distances[0])
     
-    print(f"✅ Manuel bulunan itfaiye: {nearest_station}")
-    print(f"   📍 Konum: {nearest_coords}")
-    print(f"   📏 Mesafe: {min_distance:.1f} km")
+    log.info("Manuel bulunan itfaiye", station=nearest_station, coords=nearest_coords,
+             distance_km=min_distance)
     
     return nearest_station, nearest_coords, min_distance
 
@@ -114,7 +111,7 @@ def get_osrm_route(start_lat: float, start_lon: float, end_lat: float, end_lon:
         else:
             profile = "driving"  # Şehir için araç profili
         
-        url = f"http://router.project-osrm.org/route/v1/{profile}/{start_lon},{start_lat};{end_lon},{end_lat}"
+        url = f"{config.OSRM_BASE_URL}/route/v1/{profile}/{start_lon},{start_lat};{end_lon},{end_lat}"
         params = {
             'overview': 'full',
             'steps': 'true',
@@ -125,13 +122,32 @@ def get_osrm_route(start_lat: float, start_lon: float, end_lat: float, end_lon:
         if response.status_code == 200:
             return response.json()
         else:
-            print(f"⚠️ OSRM hatası: {response.status_code}")
+            log.warning("OSRM hatası", profile=profile, status=response.status_code)
             return None
             
     except Exception as e:
-        print(f"⚠️ OSRM bağlantı hatası: {e}")
+        log.warning("OSRM bağlantı hatası", error=str(e))
         return None
 
+async def fetch_osrm_profile(session: aiohttp.ClientSession, profile: str,
+                             start: Tuple[float, float], end: Tuple[float, float]) -> Optional[Dict]:
+    """Tek bir OSRM profilinden rota iste (hata durumunda None)"""
+    url = f"{config.OSRM_BASE_URL}/route/v1/{profile}/{start[1]},{start[0]};{end[1]},{end[0]}"
+    params = {'overview': 'full', 'steps': 'true', 'annotations': 'true'}
+    
+    with span('osrm.fetch', profile=profile) as trace_span:
+        try:
+            async with logged_request('osrm', profile, lambda: timed_request('osrm', session.get(
+                    url, params=params, timeout=aiohttp.ClientTimeout(total=10)))) as response:
+                trace_span.set(status=response.status)
+                if response.status == 200:
+                    return await response.json()
+                log.warning("OSRM hatası", profile=profile, status=response.status)
+        except Exception as e:
+            trace_span.set(error=str(e))
+            log.warning("OSRM bağlantı hatası", profile=profile, error=str(e))
+    return None
+
 def extract_road_types_from_steps(steps: List[Dict]) -> List[str]:
     """OSRM adımlarından yol tiplerini çıkar"""
     road_types = []
@@ -185,75 +201,66 @@ def classify_route_by_road_types(road_types: List[str]) -> str:
     else:
         return "Karma Yol"
 
+@logged_query
+@traced('route.analyze_emergency_route',
+        attrs=lambda fire_location, *args, **kwargs: {'lat': fire_location[0], 'lon': fire_location[1]})
+@track_in_progress(ANALYSES_IN_PROGRESS)
 async def analyze_emergency_route(fire_location: Tuple[float, float], fire_stations: Dict[str, Tuple[float, float]] = None, tomtom_api = None) -> Dict:
     """Acil durum rotasını analiz et - Akıllı optimizasyon ile"""
+    analysis_start = time.perf_counter()
     try:
-        print(f"🔥 Yangın noktası analiz ediliyor: {fire_location[0]}, {fire_location[1]}")
-        
         # Arazi türünü belirle
-        terrain_type = determine_terrain_type(fire_location[0], fire_location[1])
-        print(f"🗺️ Arazi türü: {terrain_type}")
-        
-        if terrain_type in ["mountain", "forest"]:
-            print("🌾 Kırsal yangın tespit edildi - Tali yollar tercih ediliyor!")
-        elif terrain_type == "rural":
-            print("🌾 Kırsal yangın tespit edildi - Tali yollar tercih ediliyor!")
-        else:
-            print("🏙️ Şehir yangını tespit edildi - Ana yollar tercih ediliyor!")
+        with span('route.terrain_detection'):
+            terrain_type = determine_terrain_type(fire_location[0], fire_location[1])
+        annotate(terrain_type=terrain_type)
+        log.debug("Yangın noktası analiz ediliyor", lat=fire_location[0], lon=fire_location[1],
+                  terrain_type=terrain_type)
         
         # İtfaiye istasyonlarını yükle (parametre yoksa varsayılan)
         if fire_stations is None:
             fire_stations = load_fire_stations()
         
         # En yakın itfaiye istasyonunu bul
-        nearest_station, nearest_coords, distance = await find_nearest_fire_station(fire_location, fire_stations, tomtom_api)
-        print(f"🚒 En yakın itfaiye: {nearest_station}")
-        print(f"📍 Mesafe: {distance:.1f} km")
+        with span('route.nearest_station') as trace_span:
+            nearest_station, nearest_coords, distance = await find_nearest_fire_station(fire_location, fire_stations, tomtom_api)
+            trace_span.set(station=nearest_station, distance_km=distance)
         
         # OSRM rota al
-        print("🔍 OSRM ile rota aranıyor...")
-        print(f"   📍 Başlangıç: {nearest_coords[0]:.6f}, {nearest_coords[1]:.6f}")
-        print(f"   📍 Hedef: {fire_location[0]:.6f}, {fire_location[1]:.6f}")
+        log.debug("OSRM ile rota aranıyor", start=nearest_coords, end=fire_location)
         
         # Farklı profilleri dene
         profiles = ["foot", "cycling", "driving"]
         best_route = None
         
-        for profile in profiles:
-            print(f"  📍 {profile.title()} - {profile.title()} profili deneniyor...")
-            
-            # OSRM endpoint'ini güncelle
-            url = f"http://router.project-osrm.org/route/v1/{profile}/{nearest_coords[1]},{nearest_coords[0]};{fire_location[1]},{fire_location[0]}"
-            params = {'overview': 'full', 'steps': 'true', 'annotations': 'true'}
-            
+        # Profilleri eşzamanlı iste - senkron istekler event loop'u bloklamasın
+        with span('route.osrm_profiles'):
+            async with aiohttp.ClientSession() as session:
+                responses = await asyncio.gather(*(
+                    fetch_osrm_profile(session, profile, nearest_coords, fire_location)
+                    for profile in profiles
+                ))
+        
+        for profile, route_data in zip(profiles, responses):
             try:
-                response = requests.get(url, params=params, timeout=10)
-                if response.status_code == 200:
-                    route_data = response.json()
+                if route_data is not None:
                     
-                    # Debug: API yanıtını kontrol et
-                    print(f"    🔍 API yanıtı: {type(route_data)}")
-                    if isinstance(route_data, dict):
-                        print(f"    📊 Ana anahtarlar: {list(route_data.keys())}")
-                        if 'routes' in route_data:
-                            print(f"    🛣️ Routes sayısı: {len(route_data['routes'])}")
+                    # Debug: API yanıtını kontrol et (alanlar yalnızca DEBUG açıksa hesaplanır)
+                    log.debug("OSRM yanıtı", profile=profile, keys=lazy(list, route_data))
                     
                     if 'routes' in route_data and route_data['routes']:
                         route = route_data['routes'][0]
                         
-                        # Route yapısını kontrol et
-                        print(f"    📋 Route anahtarları: {list(route.keys())}")
-                        
                         # Geometri kontrolü
                         if 'geometry' in route:
                             geometry = route['geometry']
-                            print(f"    🗺️ Geometry tipi: {type(geometry)}")
                             
                             if isinstance(geometry, str):
                                 # OSRM encoded polyline string'i decode et
                                 try:
-                                    decoded_coords = polyline.decode(geometry)
-                                    print(f"    ✅ Encoded polyline decode edildi: {len(decoded_coords)} nokta")
+                                    with span('route.polyline_decode', profile=profile):
+                                        decoded_coords = polyline.decode(geometry)
+                                    log.debug("Encoded polyline decode edildi", profile=profile,
+                                              points=len(decoded_coords))
                                     
                                     # Koordinatları [lat, lon] formatına çevir
                                     coordinates = [[lat, lon] for lat, lon in decoded_coords]
@@ -266,30 +273,29 @@ async def analyze_emergency_route(fire_location: Tuple[float, float], fire_stati
                                         best_profile = profile
                                         
                                 except Exception as decode_error:
-                                    print(f"    ❌ Polyline decode hatası: {decode_error}")
+                                    log.warning("Polyline decode hatası", profile=profile, error=str(decode_error))
                                     
                             elif isinstance(geometry, dict) and 'coordinates' in geometry:
-                                coords = geometry['coordinates']
-                                print(f"    ✅ Geometri bulundu: {len(coords)} nokta")
+                                log.debug("Geometri bulundu", profile=profile, points=len(geometry['coordinates']))
                                 
                                 if not best_route or route.get('distance', 0) < best_route.get('distance', float('inf')):
                                     best_route = route
                                     best_profile = profile
                             else:
-                                print(f"    ❌ Geometri koordinatları bulunamadı")
+                                log.warning("Geometri koordinatları bulunamadı", profile=profile)
                         else:
-                            print(f"    ❌ Geometri bulunamadı")
+                            log.warning("Geometri bulunamadı", profile=profile)
                     else:
-                        print(f"    ❌ Rota bulunamadı")
+                        log.warning("Rota bulunamadı", profile=profile)
                         
-            except Exception as e:
-                print(f"    ❌ {profile} profili hatası: {e}")
-                import traceback
-                print(f"    📋 Hata detayı: {traceback.format_exc()}")
+            except Exception:
+                # Traceback yalnızca WARNING açıksa formatlanır
+                log.exception("Profil yanıtı işlenemedi", level=logging.WARNING, profile=profile)
                 continue
         
         if not best_route:
-            print("❌ Hiçbir profilde rota bulunamadı!")
+            log.error("Hiçbir profilde rota bulunamadı", station=nearest_station, lat=fire_location[0],
+                      lon=fire_location[1], duration_ms=round((time.perf_counter() - analysis_start) * 1000, 3))
             return {
                 'error': 'OSRM rota bulunamadı',
                 'fire_location': fire_location,
@@ -297,14 +303,15 @@ async def analyze_emergency_route(fire_location: Tuple[float, float], fire_stati
                 'distance': distance
             }
         
-        print(f"✅ En iyi rota: {best_profile} profili")
+        log.debug("En iyi rota seçildi", profile=best_profile)
         
         # Yol tiplerini çıkar
         road_types = []
-        if 'legs' in best_route and best_route['legs']:
-            for leg in best_route['legs']:
-                if 'steps' in leg:
-                    road_types.extend(extract_road_types_from_steps(leg['steps']))
+        with span('route.road_type_extraction', profile=best_profile):
+            if 'legs' in best_route and best_route['legs']:
+                for leg in best_route['legs']:
+                    if 'steps' in leg:
+                        road_types.extend(extract_road_types_from_steps(leg['steps']))
         
         # Rotayı sınıflandır
         route_classification = classify_route_by_road_types(road_types)
@@ -326,8 +333,6 @@ async def analyze_emergency_route(fire_location: Tuple[float, float], fire_stati
         }
         
         # 🚀 AKILLI ROTA OPTİMİZASYONU
-        print("🧠 Akıllı rota optimizasyonu yapılıyor...")
-        
         # Optimizer'ı başlat
         config_dict = {
             'OPENWEATHER_API_KEY': config.OPENWEATHER_API_KEY,
@@ -362,11 +367,14 @@ async def analyze_emergency_route(fire_location: Tuple[float, float], fire_stati
             'recommendations': optimization_result.get('recommendations', [])
         }
         
-        print("✅ Akıllı rota analizi tamamlandı!")
+        log.info("Rota analizi tamamlandı", station=nearest_station, profile=best_profile,
+                 terrain_type=terrain_type, distance_km=base_route_info['distance'],
+                 duration_ms=round((time.perf_counter() - analysis_start) * 1000, 3))
         return final_result
         
     except Exception as e:
-        print(f"❌ Rota analizi hatası: {e}")
+        log.exception("Rota analizi hatası", lat=fire_location[0], lon=fire_location[1],
+                      duration_ms=round((time.perf_counter() - analysis_start) * 1000, 3))
         return {
             'error': str(e),
             'fire_location': fire_location
@@ -11,12 +11,13 @@ import time
 from typing import Dict, Tuple, List, Optional
 from dataclasses import dataclass
 from enum import Enum
-import logging
 import config
+from tracing import annotate, traced
+from metrics import record_cache, timed_request
+from structured_logging import get_logger
+from query_log import logged_request
 
-# Logging ayarları
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+log = get_logger(__name__)
 
 class WeatherCondition(Enum):
     """Hava durumu koşulları"""
@@ -80,6 +81,7 @@ class SmartRouteOptimizer:
         self._traffic_cache = {}
         self._road_cache = {}
         
+    @traced('optimizer.weather')
     async def get_weather_data(self, lat: float, lon: float) -> WeatherInfo:
         """OpenWeatherMap API'den hava durumu verisi al"""
         cache_key = f"{lat:.3f}_{lon:.3f}"
@@ -88,10 +90,13 @@ class SmartRouteOptimizer:
         if cache_key in self._weather_cache:
             cache_time, data = self._weather_cache[cache_key]
             if time.time() - cache_time < self.cache_duration:
+                annotate(cache='hit')
+                record_cache('weather', True)
                 return data
+        record_cache('weather', False)
         
         try:
-            url = f"http://api.openweathermap.org/data/2.5/weather"
+            url = f"{config.OPENWEATHER_BASE_URL}/data/2.5/weather"
             params = {
                 'lat': lat,
                 'lon': lon,
@@ -100,7 +105,8 @@ class SmartRouteOptimizer:
             }
             
             async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
+                async with logged_request('openweather', cache_key,
+                                          lambda: timed_request('openweather', session.get(url, params=params))) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -131,7 +137,8 @@ class SmartRouteOptimizer:
                         return weather_info
                         
         except Exception as e:
-            logger.error(f"Hava durumu verisi alınamadı: {e}")
+            log.warning("Hava durumu verisi alınamadı, varsayılan kullanılıyor",
+                        error=f"{type(e).__name__}: {e}")
             # Varsayılan değerler
             return WeatherInfo(
                 condition=WeatherCondition.CLEAR,
@@ -142,6 +149,7 @@ class SmartRouteOptimizer:
                 humidity=50.0
             )
     
+    @traced('optimizer.traffic')
     async def get_traffic_data(self, start_lat: float, start_lon: float, 
                               end_lat: float, end_lon: float) -> TrafficInfo:
         """TomTom Traffic API'den trafik verisi al"""
@@ -151,11 +159,14 @@ class SmartRouteOptimizer:
         if cache_key in self._traffic_cache:
             cache_time, data = self._traffic_cache[cache_key]
             if time.time() - cache_time < self.cache_duration:
+                annotate(cache='hit')
+                record_cache('traffic', True)
                 return data
+        record_cache('traffic', False)
         
         try:
             # TomTom Traffic API endpoint'i
-            url = f"https://api.tomtom.com/traffic/services/4/flowSegmentData/absolute/10/json"
+            url = f"{config.TOMTOM_BASE_URL}/traffic/services/4/flowSegmentData/absolute/10/json"
             params = {
                 'key': self.traffic_api_key,
                 'point': f"{start_lat},{start_lon}",
@@ -163,7 +174,8 @@ class SmartRouteOptimizer:
             }
             
             async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
+                async with logged_request('tomtom_traffic', cache_key,
+                                          lambda: timed_request('tomtom_traffic', session.get(url, params=params))) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -186,7 +198,8 @@ class SmartRouteOptimizer:
                         return traffic_info
                         
         except Exception as e:
-            logger.error(f"Trafik verisi alınamadı: {e}")
+            log.warning("Trafik verisi alınamadı, varsayılan kullanılıyor",
+                        error=f"{type(e).__name__}: {e}")
             # Varsayılan değerler
             return TrafficInfo(
                 level=TrafficLevel.FREE_FLOW,
@@ -195,6 +208,7 @@ class SmartRouteOptimizer:
                 average_speed=60.0
             )
     
+    @traced('optimizer.road_conditions')
     def get_road_conditions(self, route_coordinates: List[Tuple[float, float]]) -> List[RoadInfo]:
         """Yol durumu bilgilerini al (şimdilik simüle edilmiş)"""
         road_conditions = []
@@ -229,6 +243,7 @@ class SmartRouteOptimizer:
         
         return road_conditions
     
+    @traced('optimizer.dynamic_weights')
     def calculate_dynamic_weights(self, weather: WeatherInfo, traffic: TrafficInfo, 
                                  road_conditions: List[RoadInfo]) -> Dict[str, float]:
         """Dinamik yol ağırlıklarını hesapla"""
@@ -349,6 +364,8 @@ class SmartRouteOptimizer:
             'recommendations': recommendations
         }
     
+    @traced('optimizer.optimize_route',
+            attrs=lambda self, route_coordinates, base_route_info: {'points': len(route_coordinates)})
     async def optimize_route(self, route_coordinates: List[Tuple[float, float]], 
                            base_route_info: Dict) -> Dict:
         """Rota optimizasyonu yap"""
@@ -357,9 +374,11 @@ class SmartRouteOptimizer:
             start_lat, start_lon = route_coordinates[0]
             end_lat, end_lon = route_coordinates[-1]
             
-            # Hava durumu ve trafik verilerini al
-            weather = await self.get_weather_data(start_lat, start_lon)
-            traffic = await self.get_traffic_data(start_lat, start_lon, end_lat, end_lon)
+            # Hava durumu ve trafik verilerini al (birbirinden bağımsız - eşzamanlı)
+            weather, traffic = await asyncio.gather(
+                self.get_weather_data(start_lat, start_lon),
+                self.get_traffic_data(start_lat, start_lon, end_lat, end_lon)
+            )
             road_conditions = self.get_road_conditions(route_coordinates)
             
             # Dinamik ağırlıkları hesapla
@@ -402,7 +421,7 @@ class SmartRouteOptimizer:
             return optimization_result
             
         except Exception as e:
-            logger.error(f"Rota optimizasyonu hatası: {e}")
+            log.exception("Rota optimizasyonu hatası")
             return {
                 'error': str(e),
                 'original_route': base_route_info
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+📝 YAPILANDIRILMIŞ LOGLAMA 📝
+Seviyeli, tembel (lazy) formatlanan, JSON-lines çıktılı loglama (stdlib logging üzerinde)
+
+- log.info("OSRM yanıtı", profile='foot', status=200): olay metni sabit,
+  veriler alan (field) olarak taşınır; seviye kapalıysa kayıt hiç
+  oluşturulmaz, f-string / traceback formatlanmaz
+- Pahalı alanlar lazy(fonksiyon, *args) ile sarılırsa yalnızca kayıt
+  yazılırken hesaplanır
+- log.timed("Ağ oluşturuldu", nodes=...) bloğun süresini duration_ms alanı
+  olarak ekler; loglar aynı zamanda performans kaydıdır
+- Çıktı: JSON-lines (üretim, varsayılan) veya okunabilir metin (geliştirme)
+
+Ortam değişkenleri (configure_logging argüman verilmezse):
+    FIRE_LOG_LEVEL  = DEBUG | INFO | WARNING (varsayılan) | ERROR
+    FIRE_LOG_FORMAT = json (varsayılan) | text
+    FIRE_LOG_FILE   = yol (verilmezse stderr)
+"""
+
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, Optional, TextIO
+
+DEFAULT_LEVEL = "WARNING"
+DEFAULT_FORMAT = "json"
+
+# LogRecord'un standart öznitelikleri - dışındakiler alan olarak yazılır
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+class lazy:
+    """Yalnızca kayıt yazılırken hesaplanan alan değeri"""
+
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func: Callable, *args):
+        self.func = func
+        self.args = args
+
+    def __call__(self) -> Any:
+        return self.func(*self.args)
+
+
+def _record_fields(record: logging.LogRecord) -> Dict[str, Any]:
+    """Kayda eklenmiş alanlar (StructuredLogger veya stdlib extra=...)"""
+    fields = getattr(record, 'fields', None)
+    if fields is None:
+        fields = {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+    return {key: value() if isinstance(value, lazy) else value for key, value in fields.items()}
+
+
+class JSONLinesFormatter(logging.Formatter):
+    """Kayıt başına tek satır JSON: ts, level, logger, event + alanlar"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'event': record.getMessage(),
+        }
+        payload.update(_record_fields(record))
+        if record.exc_info:
+            payload['exc'] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Geliştirme için okunabilir satır: saat seviye logger olay alan=değer ..."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        clock = time.strftime('%H:%M:%S', time.localtime(record.created))
+        fields = ' '.join(f"{key}={_short(value)}" for key, value in _record_fields(record).items())
+        line = f"{clock}.{int(record.msecs):03d} {record.levelname:<7} {record.name}: {record.getMessage()}"
+        if fields:
+            line = f"{line}  {fields}"
+        if record.exc_info:
+            line = f"{line}\n{self.formatException(record.exc_info)}"
+        return line
+
+
+def _short(value: Any) -> str:
+    if isinstance(value, float):
+        return f"{value:.3f}".rstrip('0').rstrip('.')
+    return str(value)
+
+
+class _NoopTimer:
+    __slots__ = ()
+
+    def set(self, **fields) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopTimer':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+class _TimedEvent:
+    """with bloğu bitince olayı duration_ms alanıyla yazar"""
+
+    __slots__ = ('logger', 'level', 'event', 'fields', 'start')
+
+    def __init__(self, logger: 'StructuredLogger', level: int, event: str, fields: Dict):
+        self.logger = logger
+        self.level = level
+        self.event = event
+        self.fields = fields
+        self.start = 0.0
+
+    def set(self, **fields) -> None:
+        """Blok içinde hesaplanan alanları ekle (ör. oluşturulan node sayısı)"""
+        self.fields.update(fields)
+
+    def __enter__(self) -> '_TimedEvent':
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.fields['duration_ms'] = round((time.perf_counter() - self.start) * 1000, 3)
+        if exc_type is not None:
+            self.fields['error'] = f"{exc_type.__name__}: {exc}"
+        self.logger._log(self.level, self.event, self.fields)
+
+
+class StructuredLogger:
+    """
+    logging.Logger üzerinde alan tabanlı arayüz
+
+    Seviye kontrolü kayıt oluşturulmadan önce yapılır (stdlib isEnabledFor
+    sonucu önbelleğe alır); kapalı seviyedeki çağrının maliyeti bir metod
+    çağrısı + bir sözlük aramasıdır.
+    """
+
+    __slots__ = ('logger',)
+
+    def __init__(self, name: str):
+        self.logger = logging.getLogger(name)
+
+    def isEnabledFor(self, level: int) -> bool:
+        return self.logger.isEnabledFor(level)
+
+    def _log(self, level: int, event: str, fields: Dict, exc_info: bool = False) -> None:
+        self.logger.log(level, event, extra={'fields': fields}, exc_info=exc_info, stacklevel=3)
+
+    def debug(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self._log(logging.DEBUG, event, fields)
+
+    def info(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.INFO):
+            self._log(logging.INFO, event, fields)
+
+    def warning(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.WARNING):
+            self._log(logging.WARNING, event, fields)
+
+    def error(self, event: str, **fields) -> None:
+        if self.logger.isEnabledFor(logging.ERROR):
+            self._log(logging.ERROR, event, fields)
+
+    def exception(self, event: str, level: int = logging.ERROR, **fields) -> None:
+        """Aktif istisnayı traceback ile yaz (traceback yalnızca seviye açıksa formatlanır)"""
+        if self.logger.isEnabledFor(level):
+            self._log(level, event, fields, exc_info=True)
+
+    def timed(self, event: str, level: int = logging.INFO, **fields):
+        """Bloğun süresini duration_ms olarak ekleyip olayı yaz (seviye kapalıysa no-op)"""
+        if not self.logger.isEnabledFor(level):
+            return _NOOP_TIMER
+        return _TimedEvent(self, level, event, fields)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    return StructuredLogger(name)
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None,
+                      stream: Optional[TextIO] = None, path: Optional[str] = None) -> logging.Handler:
+    """
+    Kök logger'ı yapılandır (önceki handler'lar kaldırılır)
+
+    Args:
+        level: Seviye adı (varsayılan: FIRE_LOG_LEVEL veya WARNING)
+        fmt: 'json' veya 'text' (varsayılan: FIRE_LOG_FORMAT veya json)
+        stream: Çıktı akışı (varsayılan stderr)
+        path: Verilirse dosyaya ekleyerek yazılır (FIRE_LOG_FILE)
+    """
+    level = (level or os.environ.get('FIRE_LOG_LEVEL') or DEFAULT_LEVEL).upper()
+    fmt = (fmt or os.environ.get('FIRE_LOG_FORMAT') or DEFAULT_FORMAT).lower()
+    if fmt not in ('json', 'text'):
+        raise ValueError(f"Bilinmeyen log formatı: {fmt} (seçenekler: json, text)")
+    path = path or os.environ.get('FIRE_LOG_FILE')
+
+    if path:
+        handler: logging.Handler = logging.FileHandler(path, encoding='utf-8')
+    else:
+        handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(JSONLinesFormatter() if fmt == 'json' else TextFormatter())
+
+    root = logging.getLogger()
+    for old in list(root.handlers):
+        root.removeHandler(old)
+        old.close()
+    root.addHandler(handler)
+    root.setLevel(level)
+    return handler
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import io
+
+    print("📝 Yapılandırılmış Loglama Testi\n")
+
+    buffer = io.StringIO()
+    configure_logging('INFO', 'json', stream=buffer)
+    log = get_logger('demo')
+
+    calls = []
+    log.debug("görünmez", payload=lazy(calls.append, 'hesaplandı'))
+    log.info("rota bulundu", profile='foot', distance_km=12.5)
+    with log.timed("ağ oluşturuldu") as timer:
+        timer.set(nodes=1000)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        log.exception("beklenen hata", level=logging.WARNING, step='bölme')
+
+    lines = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    for line in lines:
+        print(f"   {json.dumps(line, ensure_ascii=False)[:110]}")
+    assert not calls, "DEBUG kapalıyken lazy alan hesaplanmamalı"
+    assert lines[1]['nodes'] == 1000 and 'duration_ms' in lines[1]
+    assert 'ZeroDivisionError' in lines[2]['exc']
+
+    # Kapalı seviyedeki çağrının maliyeti
+    configure_logging('WARNING', 'json', stream=io.StringIO())
+    start = time.perf_counter()
+    for index in range(200_000):
+        log.info("kapalı", index=index)
+    print(f"\n⚡ Kapalı seviye çağrısı: {(time.perf_counter() - start) / 200_000 * 1e9:.0f} ns")
+    print("✅ JSON-lines çıktı, lazy alanlar ve süre alanları doğrulandı")
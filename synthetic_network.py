@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+🧪 SENTETİK YOL AĞI ÜRETİCİ 🧪
+Benchmark için tekrarlanabilir (seed'li), gerçekçi yol ağları - 10³ … 10⁷ node
+
+Yapı:
+1. Bozulmuş grid: rows × cols kavşak, koordinatlara ±jitter × aralık gürültü
+2. Hiyerarşik yol tipleri (grid çizgisi indeksine göre):
+       her 32. çizgi TRUNK, 16. PRIMARY, 8. SECONDARY, 4. TERTIARY,
+       diğerleri RESIDENTIAL (bir kısmı UNCLASSIFIED)
+3. Otoyol katmanı: seyrek çizgiler boyunca kavşakları atlayan uzun
+   MOTORWAY edge'leri (her motorway_exit_every node'da bir bağlantı)
+4. Tek yönlü sokaklar: RESIDENTIAL satırların bir kısmı tek yönlüdür, yönü
+   satır paritesine göre değişir (doğu/batı). Dikey yollar ve ana yollar çift
+   yönlü kaldığından ağ her zaman güçlü bağlıdır.
+5. İtfaiye istasyonları: grid bloklara bölünür, seçilen her bloğa bir istasyon
+
+Tüm üretim NumPy ile vektörizedir; sonuç SyntheticRoadData dizileridir ve
+doğrudan RoadNetwork, CompactRoadNetwork veya CSRGraph'a dönüştürülür.
+10⁶ node üzerinde sözlük tabanlı RoadNetwork gigabaytlar tutar; büyük
+ağlar için output='compact' veya 'csr' kullanın.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from advanced_pathfinding import RoadNetwork, RoadType, Edge
+from compact_network import CompactRoadNetwork, ROAD_TYPES, ROAD_TYPE_INDEX
+from csr_graph import CSRGraph
+from geodesy import EARTH_RADIUS_KM, haversine_pairwise
+
+# Grid merkezi: İzmir Konak
+SYNTHETIC_CENTER = (38.4237, 27.1428)
+
+# Grid çizgisi hiyerarşisi: (her kaç çizgide bir, yol tipi) - büyükten küçüğe
+LINE_HIERARCHY = (
+    (32, RoadType.TRUNK),
+    (16, RoadType.PRIMARY),
+    (8, RoadType.SECONDARY),
+    (4, RoadType.TERTIARY),
+)
+
+OUTPUTS = ('network', 'compact', 'csr')
+
+_TYPE_WEIGHTS = np.array([road_type.weight for road_type in ROAD_TYPES])
+_TYPE_SPEEDS = np.array([road_type.max_speed for road_type in ROAD_TYPES], dtype=np.float64)
+
+
+@dataclass
+class SyntheticRoadData:
+    """Üretilmiş ağın dizileri (node id = dizi indeksi, yol başına bir kayıt)"""
+    rows: int
+    cols: int
+    lats: np.ndarray
+    lons: np.ndarray
+    road_from: np.ndarray      # int32
+    road_to: np.ndarray        # int32
+    road_types: np.ndarray     # uint8 - ROAD_TYPES indeksi
+    bidirectional: np.ndarray  # uint8
+    distances: np.ndarray      # km
+    weights: np.ndarray
+    stations: np.ndarray       # istasyon node id'leri
+
+    @property
+    def node_count(self) -> int:
+        return int(self.lats.size)
+
+    @property
+    def edge_count(self) -> int:
+        """Yönlü edge sayısı (çift yönlü yollar iki kez)"""
+        return int(self.road_from.size + self.bidirectional.sum())
+
+    def station_names(self) -> Dict[int, str]:
+        return {int(node_id): f"Sentetik İtfaiye {rank}"
+                for rank, node_id in enumerate(self.stations, 1)}
+
+    def type_mix(self) -> Dict[str, int]:
+        """Yol tipi -> yol sayısı"""
+        counts = np.bincount(self.road_types, minlength=len(ROAD_TYPES))
+        return {road_type.code: int(count) for road_type, count in zip(ROAD_TYPES, counts) if count}
+
+    def to_network(self) -> RoadNetwork:
+        """Sözlük tabanlı RoadNetwork (Edge nesneleri doğrudan oluşturulur)"""
+        network = RoadNetwork()
+        network.add_nodes_bulk(self.lats.tolist(), self.lons.tolist())
+        for node_id, name in self.station_names().items():
+            node = network.nodes[node_id]
+            node.name = name
+            node.is_fire_station = True
+            network.fire_stations.append(node_id)
+
+        edges = network.edges
+        for from_id, to_id, distance, weight, code, both in zip(
+                self.road_from.tolist(), self.road_to.tolist(), self.distances.tolist(),
+                self.weights.tolist(), self.road_types.tolist(), self.bidirectional.tolist()):
+            road_type = ROAD_TYPES[code]
+            estimated_time = (distance / road_type.max_speed) * 60
+            edges[from_id].append(Edge(from_id, to_id, distance, road_type, weight,
+                                       road_type.max_speed, estimated_time, bool(both)))
+            if both:
+                edges[to_id].append(Edge(to_id, from_id, distance, road_type, weight,
+                                         road_type.max_speed, estimated_time, False))
+        return network
+
+    def to_compact(self) -> CompactRoadNetwork:
+        """Dizi tabanlı CompactRoadNetwork (kopyalama dışında ek maliyet yok)"""
+        return CompactRoadNetwork.from_arrays(
+            self.lats, self.lons, self.road_from, self.road_to, self.distances, self.weights,
+            self.road_types, self.bidirectional, self.station_names(), self.stations.tolist())
+
+    def to_csr(self) -> CSRGraph:
+        """CSRGraph (indeks = node id)"""
+        back = np.flatnonzero(self.bidirectional)
+        sources = np.concatenate((self.road_from, self.road_to[back]))
+        targets = np.concatenate((self.road_to, self.road_from[back]))
+        weights = np.concatenate((self.weights, self.weights[back]))
+        distances = np.concatenate((self.distances, self.distances[back]))
+        times = distances / _TYPE_SPEEDS[np.concatenate((self.road_types, self.road_types[back]))] * 60
+        return CSRGraph.from_edges(np.arange(self.node_count, dtype=np.int64),
+                                   sources, targets, weights, distances, times)
+
+
+def _line_types(count: int) -> np.ndarray:
+    """Grid çizgisi indeksi -> yol tipi kodu (hiyerarşiye göre)"""
+    codes = np.full(count, ROAD_TYPE_INDEX[RoadType.RESIDENTIAL], dtype=np.uint8)
+    index = np.arange(count)
+    for every, road_type in reversed(LINE_HIERARCHY):
+        codes[index % every == 0] = ROAD_TYPE_INDEX[road_type]
+    return codes
+
+
+def _motorway_roads(rows: int, cols: int, every: int, exit_every: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Otoyol katmanı: seçili satır ve sütunlarda exit_every node'u atlayan edge'ler"""
+    sources, targets = [], []
+
+    for line_count, other_count, stride, step in ((rows, cols, cols, 1), (cols, rows, 1, cols)):
+        if other_count <= exit_every:
+            continue
+        offset = min(every // 2, line_count // 2)
+        exits = np.arange(0, other_count, exit_every)
+        for line in range(offset, line_count, every):
+            node_ids = line * stride + exits * step
+            sources.append(node_ids[:-1])
+            targets.append(node_ids[1:])
+
+    if not sources:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+    return np.concatenate(sources), np.concatenate(targets)
+
+
+def generate_road_arrays(node_count: int, seed: int = 42, spacing_km: float = 0.2,
+                         jitter: float = 0.3, oneway_ratio: float = 0.3,
+                         unclassified_ratio: float = 0.1, motorway_every: int = 64,
+                         motorway_exit_every: int = 8, station_count: Optional[int] = None,
+                         center: Tuple[float, float] = SYNTHETIC_CENTER) -> SyntheticRoadData:
+    """
+    Sentetik ağ dizilerini üret
+
+    Args:
+        node_count: Yaklaşık node sayısı (rows × cols ≥ node_count)
+        seed: Aynı parametre + seed her zaman aynı ağı üretir
+        spacing_km: Komşu kavşaklar arası mesafe
+        jitter: Koordinat gürültüsü (aralığın oranı, < 0.5)
+        oneway_ratio: Tek yönlü RESIDENTIAL satır oranı
+        unclassified_ratio: RESIDENTIAL yolların UNCLASSIFIED olma oranı
+        motorway_every: Otoyol çizgileri arası grid çizgisi sayısı
+        motorway_exit_every: Otoyol bağlantıları arası node sayısı
+        station_count: İstasyon sayısı (varsayılan: her 5000 node'a bir, en az 3)
+    """
+    if not 0 <= jitter < 0.5:
+        raise ValueError("jitter 0 ile 0.5 arasında olmalı")
+
+    rng = np.random.default_rng(seed)
+    rows = max(2, int(round(math.sqrt(node_count))))
+    cols = max(2, -(-node_count // rows))
+    size = rows * cols
+
+    # 1. Bozulmuş grid koordinatları
+    dlat = math.degrees(spacing_km / EARTH_RADIUS_KM)
+    dlon = dlat / math.cos(math.radians(center[0]))
+    row_of = np.repeat(np.arange(rows), cols)
+    col_of = np.tile(np.arange(cols), rows)
+    lats = center[0] + (row_of - (rows - 1) / 2 + rng.uniform(-jitter, jitter, size)) * dlat
+    lons = center[1] + (col_of - (cols - 1) / 2 + rng.uniform(-jitter, jitter, size)) * dlon
+
+    # 2. Grid yolları: yatay (satır tipi) ve dikey (sütun tipi)
+    grid = np.arange(size, dtype=np.int64).reshape(rows, cols)
+    row_types, col_types = _line_types(rows), _line_types(cols)
+
+    h_from, h_to = grid[:, :-1].ravel(), grid[:, 1:].ravel()
+    h_types = np.repeat(row_types, cols - 1)
+    v_from, v_to = grid[:-1, :].ravel(), grid[1:, :].ravel()
+    v_types = np.tile(col_types, rows - 1)
+
+    # 4. Tek yönlü RESIDENTIAL satırlar: çift satırlar doğuya, tekler batıya
+    residential = ROAD_TYPE_INDEX[RoadType.RESIDENTIAL]
+    oneway_rows = (row_types == residential) & (rng.random(rows) < oneway_ratio)
+    h_oneway = np.repeat(oneway_rows, cols - 1)
+    westward = h_oneway & np.repeat(np.arange(rows) % 2 == 1, cols - 1)
+    h_from, h_to = np.where(westward, h_to, h_from), np.where(westward, h_from, h_to)
+
+    # 3. Otoyol katmanı
+    m_from, m_to = _motorway_roads(rows, cols, motorway_every, motorway_exit_every)
+
+    road_from = np.concatenate((h_from, v_from, m_from)).astype(np.int32)
+    road_to = np.concatenate((h_to, v_to, m_to)).astype(np.int32)
+    road_types = np.concatenate((h_types, v_types,
+                                 np.full(m_from.size, ROAD_TYPE_INDEX[RoadType.MOTORWAY], np.uint8)))
+    bidirectional = np.concatenate((~h_oneway, np.ones(v_from.size + m_from.size, bool))).astype(np.uint8)
+
+    unclassified = (road_types == residential) & (rng.random(road_types.size) < unclassified_ratio)
+    road_types[unclassified] = ROAD_TYPE_INDEX[RoadType.UNCLASSIFIED]
+
+    distances = haversine_pairwise(lats[road_from], lons[road_from], lats[road_to], lons[road_to])
+    weights = distances * _TYPE_WEIGHTS[road_types]
+
+    # 5. İstasyonlar: blok başına bir, rastgele bloklarda
+    if station_count is None:
+        station_count = max(3, size // 5000)
+    station_count = min(station_count, size)
+    blocks = math.ceil(math.sqrt(station_count))
+    chosen = rng.choice(blocks * blocks, station_count, replace=False)
+    block_rows, block_cols = chosen // blocks, chosen % blocks
+    row_edges = np.linspace(0, rows, blocks + 1).astype(np.int64)
+    col_edges = np.linspace(0, cols, blocks + 1).astype(np.int64)
+    station_rows = rng.integers(row_edges[block_rows], np.maximum(row_edges[block_rows + 1], row_edges[block_rows] + 1))
+    station_cols = rng.integers(col_edges[block_cols], np.maximum(col_edges[block_cols + 1], col_edges[block_cols] + 1))
+    stations = np.unique(np.minimum(station_rows, rows - 1) * cols + np.minimum(station_cols, cols - 1))
+
+    return SyntheticRoadData(rows, cols, lats, lons, road_from, road_to, road_types,
+                             bidirectional, distances, weights, stations)
+
+
+def generate_synthetic_network(node_count: int, seed: int = 42, output: str = 'network', **options):
+    """
+    Sentetik ağ üret
+
+    Args:
+        output: 'network' (RoadNetwork), 'compact' (CompactRoadNetwork) veya 'csr' (CSRGraph)
+        options: generate_road_arrays parametreleri
+    """
+    if output not in OUTPUTS:
+        raise ValueError(f"Bilinmeyen çıktı: {output} (seçenekler: {', '.join(OUTPUTS)})")
+
+    data = generate_road_arrays(node_count, seed=seed, **options)
+    if output == 'compact':
+        return data.to_compact()
+    if output == 'csr':
+        return data.to_csr()
+    return data.to_network()
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import random
+    import time
+
+    from advanced_pathfinding import DijkstraPathfinder, AStarPathfinder
+
+    print("🧪 Sentetik Yol Ağı Testi\n")
+
+    for node_count in (10**3, 10**4, 10**5, 10**6):
+        start = time.perf_counter()
+        data = generate_road_arrays(node_count, seed=7)
+        generate_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        compact = data.to_compact()
+        compact_time = time.perf_counter() - start
+
+        print(f"📊 {data.node_count:>9,} node, {data.edge_count:>9,} edge, "
+              f"{data.stations.size:>4} istasyon  |  üretim {generate_time * 1000:7.1f} ms, "
+              f"compact {compact_time * 1000:7.1f} ms")
+    print(f"   Yol tipi dağılımı: {data.type_mix()}")
+
+    # Tekrarlanabilirlik
+    first, second = generate_road_arrays(5000, seed=3), generate_road_arrays(5000, seed=3)
+    assert np.array_equal(first.weights, second.weights) and np.array_equal(first.stations, second.stations)
+    print("\n✅ Aynı seed aynı ağı üretiyor")
+
+    # Üç gösterim aynı en kısa yolları vermeli
+    data = generate_road_arrays(20_000, seed=11)
+    network, compact, csr = data.to_network(), data.to_compact(), data.to_csr()
+    rng = random.Random(5)
+    for _ in range(10):
+        start_id, end_id = rng.sample(network.fire_stations, 2)
+        expected = DijkstraPathfinder(network, stats_level='off').find_shortest_path(start_id, end_id)
+        actual = AStarPathfinder(compact, stats_level='off').find_shortest_path(start_id, end_id)
+        assert expected is not None, "Ağ güçlü bağlı olmalı"
+        assert abs(expected['weight'] - actual['weight']) < 1e-9
+    assert csr.edge_count == network.edge_count()
+    print("✅ RoadNetwork, CompactRoadNetwork ve CSR tutarlı, tüm istasyon çiftleri erişilebilir")
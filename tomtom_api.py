@@ -9,6 +9,10 @@ import time
 import json
 from typing import Dict, List, Tuple, Optional
 import config
+from metrics import api_call, record_rate_limit_wait
+from structured_logging import get_logger
+
+log = get_logger(__name__)
 
 class TomTomAPI:
     """TomTom API entegrasyonu"""
@@ -16,7 +20,7 @@ class TomTomAPI:
     def __init__(self, api_key: str = None):
         """API'yi başlat"""
         self.api_key = api_key or config.TOMTOM_API_KEY
-        self.base_url = "https://api.tomtom.com"
+        self.base_url = config.TOMTOM_BASE_URL
         self.last_request_time = 0
         self.request_delay = 1.0 / config.MAX_REQUESTS_PER_MINUTE  # Saniye
     
@@ -27,6 +31,7 @@ class TomTomAPI:
         
         if time_since_last < self.request_delay:
             sleep_time = self.request_delay - time_since_last
+            record_rate_limit_wait('tomtom_api', sleep_time)
             time.sleep(sleep_time)
         
         self.last_request_time = time.time()
@@ -40,16 +45,19 @@ class TomTomAPI:
             params = params or {}
             params['key'] = self.api_key
             
-            response = requests.get(url, params=params, timeout=10)
+            with api_call('tomtom') as call:
+                response = requests.get(url, params=params, timeout=10)
+                call.status = response.status_code
             
             if response.status_code == 200:
                 return response.json()
             else:
-                print(f"⚠️ TomTom API hatası: {response.status_code} - {response.text}")
+                log.warning("TomTom API hatası", path=endpoint, status=response.status_code,
+                            body=response.text[:200])
                 return None
                 
         except Exception as e:
-            print(f"⚠️ TomTom API isteği hatası: {e}")
+            log.warning("TomTom API isteği hatası", path=endpoint, error=f"{type(e).__name__}: {e}")
             return None
     
     def search_places(self, query: str, country: str = "TR") -> Optional[List[Dict]]:
@@ -75,7 +83,7 @@ class TomTomAPI:
             return None
             
         except Exception as e:
-            print(f"⚠️ Koordinat alma hatası: {e}")
+            log.warning("Koordinat alma hatası", place=place_name, error=f"{type(e).__name__}: {e}")
             return None
     
     def get_route(self, start_lat: float, start_lon: float, 
@@ -101,16 +109,18 @@ class TomTomAPI:
         
         try:
             self._rate_limit()
-            response = requests.get(url, params=params, timeout=10)
+            with api_call('tomtom_routing') as call:
+                response = requests.get(url, params=params, timeout=10)
+                call.status = response.status_code
             
             if response.status_code == 200:
                 return response.json()
             else:
-                print(f"⚠️ Rota alma hatası: {response.status_code}")
+                log.warning("Rota alma hatası", path=endpoint, status=response.status_code)
                 return None
                 
         except Exception as e:
-            print(f"⚠️ Rota alma hatası: {e}")
+            log.warning("Rota alma hatası", path=endpoint, error=f"{type(e).__name__}: {e}")
             return None
     
     def get_road_network(self, bounds: Tuple[float, float, float, float]) -> Optional[Dict]:
@@ -156,7 +166,7 @@ class TomTomAPI:
             return None
             
         except Exception as e:
-            print(f"⚠️ Polyline çıkarma hatası: {e}")
+            log.warning("Polyline çıkarma hatası", error=f"{type(e).__name__}: {e}")
             return None
     
     def get_traffic_info(self, lat: float, lon: float, radius: int = 5000) -> Optional[Dict]:
@@ -177,5 +187,5 @@ class TomTomAPI:
             return result is not None and 'results' in result
             
         except Exception as e:
-            print(f"⚠️ API bağlantı testi hatası: {e}")
+            log.warning("API bağlantı testi hatası", error=f"{type(e).__name__}: {e}")
             return False
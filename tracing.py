@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+🔬 HAFİF İZLEME (TRACING) 🔬
+İç içe span'ler ile aşama bazında süre dökümü
+
+- Span: ad, monotonik başlangıç/bitiş (perf_counter_ns), öznitelikler,
+  trace_id / parent_id (iç içe yapı contextvars ile - asyncio görevleri
+  arasında da doğru ebeveyni bulur)
+- Tamamlanan span'ler sabit kapasiteli bir halka tamponda (ring buffer) tutulur
+- Dışa aktarma: JSON ve Chrome trace formatı (chrome://tracing, Perfetto)
+- İzleme kapalıyken span() paylaşılan bir no-op nesne döndürür; sıcak yoldaki
+  maliyet tek bir bayrak kontrolüdür
+
+Kullanım:
+    enable_tracing()
+    with span('osrm.fetch', profile='foot') as s:
+        ...
+        s.set(status=200)
+    print_breakdown(get_tracer(), get_tracer().slowest_traces(1)[0]['trace_id'])
+"""
+
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CAPACITY = 10_000
+
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+
+class Span:
+    """Tek bir zamanlanmış aşama - context manager olarak kullanılır"""
+
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id',
+                 'start_ns', 'end_ns', 'attrs', 'thread_id', '_token')
+
+    def __init__(self, tracer: 'Tracer', name: str, attrs: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+        self.span_id = next(tracer._ids)
+        self.parent_id = None
+        self.trace_id = self.span_id
+        self.start_ns = self.end_ns = 0
+        self.thread_id = 0
+        self._token = None
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> 'Span':
+        parent = _current_span.get()
+        if parent is not None:
+            self.parent_id = parent.span_id
+            self.trace_id = parent.trace_id
+        self._token = _current_span.set(self)
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.end_ns = time.perf_counter_ns()
+        _current_span.reset(self._token)
+        if exc_type is not None:
+            self.attrs['error'] = f"{exc_type.__name__}: {exc}"
+        self.tracer.spans.append(self)
+
+    def to_dict(self) -> Dict:
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start_ns': self.start_ns,
+            'end_ns': self.end_ns,
+            'duration_ms': self.duration_ms,
+            'thread_id': self.thread_id,
+            'attrs': self.attrs,
+        }
+
+
+class _NoopSpan:
+    """İzleme kapalıyken dönen, hiçbir şey yapmayan span"""
+
+    __slots__ = ()
+
+    def set(self, **attrs) -> None:
+        pass
+
+    def __enter__(self) -> '_NoopSpan':
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Span üretici ve halka tampon"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, enabled: bool = False):
+        self.enabled = enabled
+        self.spans: deque = deque(maxlen=capacity)
+        self.epoch_ns = time.perf_counter_ns()
+        self._ids = itertools.count(1)
+
+    def span(self, name: str, **attrs):
+        """Yeni bir span (with ile kullanılır); izleme kapalıysa NOOP_SPAN"""
+        if not self.enabled:
+            return NOOP_SPAN
+        return Span(self, name, attrs)
+
+    def clear(self) -> None:
+        self.spans.clear()
+        self.epoch_ns = time.perf_counter_ns()
+
+    def traces(self) -> Dict[int, List[Span]]:
+        """trace_id -> başlangıç zamanına göre sıralı span'ler"""
+        grouped: Dict[int, List[Span]] = {}
+        for item in self.spans:
+            grouped.setdefault(item.trace_id, []).append(item)
+        for items in grouped.values():
+            items.sort(key=lambda item: item.start_ns)
+        return grouped
+
+    def slowest_traces(self, count: int = 5, name: Optional[str] = None) -> List[Dict]:
+        """En uzun süren kök span'ler (yavaş olaylar); name verilirse yalnız o adlı kökler"""
+        roots = [item for item in self.spans
+                 if item.parent_id is None and (name is None or item.name == name)]
+        roots.sort(key=lambda item: item.end_ns - item.start_ns, reverse=True)
+        return [item.to_dict() for item in roots[:count]]
+
+    def breakdown(self, trace_id: int) -> List[Dict]:
+        """
+        Bir trace'in aşama dökümü (ağaç sırasında)
+
+        Returns:
+            [{'name', 'depth', 'duration_ms', 'self_ms', 'start_ms', 'attrs'}]
+            self_ms: alt span'lerde geçmeyen süre; start_ms: kökün başlangıcına göre
+        """
+        items = self.traces().get(trace_id, [])
+        if not items:
+            return []
+
+        children: Dict[Optional[int], List[Span]] = {}
+        known = {item.span_id for item in items}
+        for item in items:
+            # Ebeveyni halka tampondan düşmüşse kök gibi göster
+            parent = item.parent_id if item.parent_id in known else None
+            children.setdefault(parent, []).append(item)
+
+        origin = items[0].start_ns
+        rows: List[Dict] = []
+
+        def visit(item: Span, depth: int) -> None:
+            kids = children.get(item.span_id, [])
+            child_ns = _covered_ns([(kid.start_ns, kid.end_ns) for kid in kids])
+            rows.append({
+                'name': item.name,
+                'depth': depth,
+                'duration_ms': item.duration_ms,
+                'self_ms': max(0, item.end_ns - item.start_ns - child_ns) / 1e6,
+                'start_ms': (item.start_ns - origin) / 1e6,
+                'attrs': item.attrs,
+            })
+            for kid in kids:
+                visit(kid, depth + 1)
+
+        for root in children.get(None, []):
+            visit(root, 0)
+        return rows
+
+    def stage_totals(self) -> Dict[str, Dict]:
+        """Tüm span'ler için ad bazında toplam / ortalama / maksimum süre"""
+        totals: Dict[str, Dict] = {}
+        for item in self.spans:
+            entry = totals.setdefault(item.name, {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            duration = item.duration_ms
+            entry['count'] += 1
+            entry['total_ms'] += duration
+            entry['max_ms'] = max(entry['max_ms'], duration)
+        for entry in totals.values():
+            entry['mean_ms'] = entry['total_ms'] / entry['count']
+        return dict(sorted(totals.items(), key=lambda pair: pair[1]['total_ms'], reverse=True))
+
+    def export_json(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump([item.to_dict() for item in self.spans], f, ensure_ascii=False, indent=2, default=str)
+
+    def to_chrome_trace(self) -> Dict:
+        """
+        Chrome trace formatı ('X' tam olay, mikro saniye)
+
+        Eşzamanlı asyncio görevleri aynı thread'de çalıştığı için her trace
+        ayrı bir satırda (tid = trace_id) gösterilir.
+        """
+        pid = os.getpid()
+        events = [{
+            'name': item.name,
+            'cat': item.name.split('.')[0],
+            'ph': 'X',
+            'ts': (item.start_ns - self.epoch_ns) / 1000,
+            'dur': (item.end_ns - item.start_ns) / 1000,
+            'pid': pid,
+            'tid': item.trace_id,
+            'args': {key: _jsonable(value) for key, value in item.attrs.items()},
+        } for item in self.spans]
+        events.sort(key=lambda event: event['ts'])
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_chrome_trace(), f, ensure_ascii=False)
+
+
+def _covered_ns(intervals: List[tuple]) -> int:
+    """Aralıkların birleşiminin uzunluğu (eşzamanlı alt span'ler çift sayılmasın)"""
+    covered, current_start, current_end = 0, None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                covered += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        covered += current_end - current_start
+    return covered
+
+
+def _jsonable(value):
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+# Süreç genelinde paylaşılan tracer
+_TRACER = Tracer()
+
+
+def get_tracer() -> Tracer:
+    return _TRACER
+
+
+def enable_tracing(capacity: Optional[int] = None) -> Tracer:
+    """İzlemeyi aç (capacity verilirse halka tampon yeniden boyutlanır)"""
+    if capacity is not None and capacity != _TRACER.spans.maxlen:
+        _TRACER.spans = deque(_TRACER.spans, maxlen=capacity)
+    _TRACER.enabled = True
+    return _TRACER
+
+
+def disable_tracing() -> None:
+    _TRACER.enabled = False
+
+
+def span(name: str, **attrs):
+    """Paylaşılan tracer'da span (izleme kapalıysa NOOP_SPAN)"""
+    if not _TRACER.enabled:
+        return NOOP_SPAN
+    return Span(_TRACER, name, attrs)
+
+
+def annotate(**attrs) -> None:
+    """Aktif span'e öznitelik ekle (aktif span yoksa hiçbir şey yapmaz)"""
+    current = _current_span.get()
+    if current is not None:
+        current.attrs.update(attrs)
+
+
+def traced(name: Optional[str] = None, attrs: Optional[Callable[..., Dict]] = None):
+    """
+    Fonksiyonu (senkron veya async) bir span içinde çalıştıran dekoratör
+
+    Args:
+        name: Span adı (varsayılan: fonksiyonun qualname'i)
+        attrs: Çağrı argümanlarından öznitelik sözlüğü üreten fonksiyon;
+               yalnızca izleme açıkken çağrılır
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _TRACER.enabled:
+                    return await func(*args, **kwargs)
+                with Span(_TRACER, span_name, attrs(*args, **kwargs) if attrs else {}):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _TRACER.enabled:
+                return func(*args, **kwargs)
+            with Span(_TRACER, span_name, attrs(*args, **kwargs) if attrs else {}):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def print_breakdown(tracer: Tracer, trace_id: int) -> None:
+    """Bir trace'in aşama ağacını yazdır"""
+    rows = tracer.breakdown(trace_id)
+    if not rows:
+        print(f"⚠️ Trace {trace_id} bulunamadı (halka tampondan düşmüş olabilir)")
+        return
+
+    print(f"{'Aşama':<44} {'başlangıç':>10} {'süre (ms)':>10} {'kendi (ms)':>11}")
+    print("-" * 78)
+    for row in rows:
+        label = f"{'  ' * row['depth']}{row['name']}"
+        extra = ', '.join(f"{key}={value}" for key, value in row['attrs'].items())
+        print(f"{label:<44} {row['start_ms']:>10.1f} {row['duration_ms']:>10.2f} "
+              f"{row['self_ms']:>11.2f}  {extra[:60]}")
+
+
+def print_stage_totals(tracer: Tracer, limit: int = 15) -> None:
+    """Ad bazında toplam süre tablosu"""
+    print(f"{'Aşama':<36} {'adet':>7} {'toplam (ms)':>12} {'ort (ms)':>10} {'maks (ms)':>10}")
+    print("-" * 79)
+    for name, entry in list(tracer.stage_totals().items())[:limit]:
+        print(f"{name:<36} {entry['count']:>7} {entry['total_ms']:>12.1f} "
+              f"{entry['mean_ms']:>10.2f} {entry['max_ms']:>10.2f}")
+
+
+# Test fonksiyonu
+if __name__ == "__main__":
+    import asyncio
+
+    print("🔬 Tracing Testi\n")
+    tracer = enable_tracing()
+
+    async def stage(stage_name: str, delay: float) -> None:
+        with span(stage_name, delay_ms=delay * 1000):
+            await asyncio.sleep(delay)
+
+    async def incident(index: int) -> None:
+        with span('incident', index=index):
+            await stage('lookup', 0.01)
+            await asyncio.gather(stage('fetch.a', 0.02), stage('fetch.b', 0.03 * index))
+
+    async def run() -> None:
+        await asyncio.gather(*(incident(index) for index in range(1, 4)))
+
+    asyncio.run(run())
+
+    slowest = tracer.slowest_traces(1)[0]
+    print(f"🐢 En yavaş olay: index={slowest['attrs']['index']} ({slowest['duration_ms']:.1f} ms)\n")
+    print_breakdown(tracer, slowest['trace_id'])
+    assert {row['name'] for row in tracer.breakdown(slowest['trace_id'])} == {'incident', 'lookup', 'fetch.a', 'fetch.b'}
+
+    disable_tracing()
+    assert span('ignored') is NOOP_SPAN
+    print(f"\n✅ {len(tracer.spans)} span, Chrome trace olayları: {len(tracer.to_chrome_trace()['traceEvents'])}")